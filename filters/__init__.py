@@ -1,3 +1,7 @@
+# Doit rester identique à la version de pyproject.toml
+__version__ = "0.1.0"
+
+
 class Filters:
     def __init__(self):
         self.snk = None  # Définir snk comme `None` par défaut
@@ -0,0 +1,300 @@
+import argparse
+import inspect
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from . import __version__
+from .passives.band_pass import BandPassFilter
+from .passives.band_stop import BandStopFilter
+from .passives.high_pass import HighPassFilter
+from .passives.low_pass import LowPassFilter
+from .response import frequency_response
+from .snk.bessel import highpass, lowpass
+from .snk.butterworth import Butterworth_HighPass, Butterworth_LowPass
+from .snk.design import design_stages
+from .snk.tchebychev import TchebychevFilter
+
+# Suite de mesures de performance : python -m filters.bench
+#
+# Chaque mesure appelle une fonction en boucle jusqu'à durer au moins
+# min_time, répète l'opération `repeat` fois et garde le temps par appel le
+# plus court (le moins perturbé par le reste du système) ainsi que le temps
+# médian. Les résultats sont écrits en JSON ; --compare les confronte à une
+# référence enregistrée et signale les mesures plus lentes que
+# (1 + threshold) fois la référence.
+
+ORDERS = range(1, 9)
+CUTOFF = 1000.0
+RESPONSE_POINTS = (1_000, 100_000)
+
+# Modules chargés par la mesure du temps d'import (dans un nouveau processus)
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import filters.passives.band_pass, filters.passives.band_stop
+import filters.passives.high_pass, filters.passives.low_pass
+import filters.snk.bessel, filters.snk.butterworth, filters.snk.tchebychev
+print(time.perf_counter() - start)
+"""
+
+
+def fixed_components(family, filter_type, order):
+    """Composants imposés valides pour chaque famille, type et ordre."""
+    pairs = order // 2
+    if family == "bessel":
+        # Emplacements par paires, y compris pour l'étage du premier ordre
+        values = [1000.0] if filter_type == "lowpass" else [1e-8]
+        key = "r_vals" if filter_type == "lowpass" else "c_vals"
+        return {key: values * 2 * ((order + 1) // 2)}
+    if family == "butterworth":
+        if filter_type == "lowpass":
+            return {"r_vals": [1000.0] * (order % 2) + [1000.0, 10000.0] * pairs}
+        return {"c_vals": [1e-8] * order}
+    if filter_type == "lowpass":
+        return {"c_vals": [1e-8] * (order % 2) + [1e-8, 1e-9] * pairs}
+    return {"c_vals": [1e-8] * order}
+
+
+def _snk_benchmarks():
+    designers = {
+        ("bessel", "lowpass"): lowpass(),
+        ("bessel", "highpass"): highpass(),
+        ("butterworth", "lowpass"): Butterworth_LowPass(),
+        ("butterworth", "highpass"): Butterworth_HighPass(),
+    }
+    tchebychev = TchebychevFilter()
+    benchmarks = {}
+    for order in ORDERS:
+        for (family, filter_type), designer in designers.items():
+            values = fixed_components(family, filter_type, order)
+            if family == "butterworth":
+                kwargs = {
+                    "res_values": values.get("r_vals"),
+                    "condo_values": values.get("c_vals"),
+                }
+            else:
+                kwargs = values
+            name = f"{family}.{filter_type}.components[{order}]"
+            benchmarks[name] = (designer.components, (order, CUTOFF), kwargs)
+        for filter_type in ("lowpass", "highpass"):
+            kwargs = dict(fixed_components("tchebychev", filter_type, order))
+            kwargs["filter_type"] = filter_type
+            name = f"tchebychev.{filter_type}.design_filter[{order}]"
+            benchmarks[name] = (tchebychev.design_filter, (order, CUTOFF), kwargs)
+    return benchmarks
+
+
+def _passive_benchmarks():
+    benchmarks = {}
+    for cls in (LowPassFilter, HighPassFilter, BandPassFilter, BandStopFilter):
+        for name, func in vars(cls).items():
+            if not name.endswith(("_rc", "_rl", "_rlc")):
+                continue
+            func = getattr(cls, name)
+            parameters = inspect.signature(func).parameters
+            args = [CUTOFF]
+            if "quality_factor" in parameters:
+                args.append(0.707)
+            elif "bandwidth" in parameters:
+                args.append(100.0)
+            benchmarks[f"passives.{name}"] = (func, tuple(args), {"resistance": 1e3})
+    return benchmarks
+
+
+def _response_benchmarks():
+    stages = design_stages(
+        "butterworth",
+        "lowpass",
+        8,
+        CUTOFF,
+        **fixed_components("butterworth", "lowpass", 8),
+    )
+    benchmarks = {}
+    for points in RESPONSE_POINTS:
+        freqs = np.logspace(1, 5, points)
+        name = f"response.frequency_response[{points}]"
+        benchmarks[name] = (frequency_response, (stages, freqs), {})
+    return benchmarks
+
+
+def benchmarks():
+    """Toutes les mesures disponibles : {nom: (fonction, args, kwargs)}."""
+    result = {}
+    result.update(_snk_benchmarks())
+    result.update(_passive_benchmarks())
+    result.update(_response_benchmarks())
+    return result
+
+
+def time_call(func, args=(), kwargs=None, repeat=5, min_time=0.05):
+    """
+    Mesure le temps par appel de func(*args, **kwargs).
+
+    Retourne {"min_s", "median_s", "loops", "repeat"}.
+    """
+    kwargs = kwargs or {}
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(*args, **kwargs)
+        timings.append((time.perf_counter() - start) / loops)
+    return {
+        "min_s": min(timings),
+        "median_s": float(np.median(timings)),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def time_import(repeat=5):
+    """Temps d'import de la librairie, mesuré dans un nouveau processus."""
+    timings = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", IMPORT_SCRIPT],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    return {
+        "min_s": min(timings),
+        "median_s": float(np.median(timings)),
+        "loops": 1,
+        "repeat": repeat,
+    }
+
+
+def run(select=None, repeat=5, min_time=0.05, include_import=True, progress=None):
+    """
+    Exécute les mesures dont le nom contient `select` (toutes si None).
+
+    Retourne le rapport {"meta": {...}, "results": {nom: mesure}}.
+    """
+    results = {}
+    for name, (func, args, kwargs) in benchmarks().items():
+        if select is None or select in name:
+            results[name] = time_call(func, args, kwargs, repeat, min_time)
+            if progress:
+                progress(name, results[name])
+    if include_import and (select is None or select in "import"):
+        results["import"] = time_import(repeat)
+        if progress:
+            progress("import", results["import"])
+    return {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Compare deux rapports de run().
+
+    Retourne la liste des mesures communes {"name", "baseline_s",
+    "current_s", "ratio", "regression"}, en comparant les temps minimaux ;
+    une mesure régresse si ratio > 1 + threshold.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = result["min_s"] / reference["min_s"]
+        rows.append(
+            {
+                "name": name,
+                "baseline_s": reference["min_s"],
+                "current_s": result["min_s"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m filters.bench",
+        description="Mesures de performance de la librairie filters.",
+    )
+    parser.add_argument("-o", "--output", help="fichier JSON des résultats")
+    parser.add_argument("-k", "--select", help="ne mesurer que les noms contenant")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--compare", help="rapport JSON de référence")
+    parser.add_argument(
+        "--input", help="rapport JSON à comparer au lieu d'exécuter les mesures"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="ralentissement relatif toléré (0.2 : 20 %%)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.input:
+        with open(args.input) as f:
+            report = json.load(f)
+    else:
+
+        def progress(name, result):
+            print(f"{name:50s} {_format_time(result['min_s'])}", file=sys.stderr)
+
+        report = run(args.select, args.repeat, args.min_time, progress=progress)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if not args.compare:
+        if not args.output:
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows = compare(baseline, report, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:50s} {_format_time(row['baseline_s'])} "
+            f"{_format_time(row['current_s'])} {row['ratio']:6.2f}x {flag}"
+        )
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{len(rows)} mesures comparées, {regressions} régression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
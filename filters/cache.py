@@ -0,0 +1,193 @@
+import copy
+import inspect
+import math
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from types import MappingProxyType
+
+import numpy as np
+
+# Mémoïsation LRU des calculs de conception (components(), design_filter()...).
+#
+# Les arguments sont ramenés à une clé canonique et hachable : listes et
+# tableaux deviennent des tuples, dicts des tuples triés, et les nombres sont
+# arrondis à une tolérance relative (1000, 1000.0 et 1000.0000000001 donnent
+# la même clé). Les résultats sont figés avant d'être mis en cache : dicts en
+# MappingProxyType, listes en tuples, tableaux NumPy en lecture seule. Les
+# objets qui ne peuvent être figés (TransferFunction) sont copiés à chaque
+# lecture, si bien qu'un appelant ne peut jamais modifier l'objet en cache.
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
+def canonical_key(value, rel_tol=1e-9):
+    """
+    Clé hachable d'une valeur, les nombres étant arrondis à rel_tol près.
+
+    L'arrondi se fait en chiffres significatifs : deux nombres qui ne
+    diffèrent que de quelques rel_tol donnent en général la même clé.
+    """
+    if isinstance(value, (bool, str, bytes)) or value is None:
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        value = float(value)
+        if value == 0 or not math.isfinite(value):
+            return value
+        digits = max(1, round(-math.log10(rel_tol)))
+        return float(f"{value:.{digits}g}")
+    if isinstance(value, dict):
+        return tuple(
+            sorted((key, canonical_key(item, rel_tol)) for key, item in value.items())
+        )
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(canonical_key(item, rel_tol) for item in value)
+    raise TypeError(f"Type d'argument non pris en charge par le cache : {type(value)}")
+
+
+def _freeze(value):
+    """Retourne (valeur figée, True si elle contient des objets à copier)."""
+    if isinstance(value, dict):
+        items = {key: _freeze(item) for key, item in value.items()}
+        return (
+            MappingProxyType({key: item for key, (item, _) in items.items()}),
+            any(opaque for _, opaque in items.values()),
+        )
+    if isinstance(value, (list, tuple)):
+        items = [_freeze(item) for item in value]
+        return (
+            tuple(item for item, _ in items),
+            any(opaque for _, opaque in items),
+        )
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+        return value, False
+    if isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        return value, False
+    if value is None:
+        return value, False
+    return value, True
+
+
+def _thaw(value):
+    """Copie les objets non figeables d'une valeur en cache."""
+    if isinstance(value, MappingProxyType):
+        return MappingProxyType({key: _thaw(item) for key, item in value.items()})
+    if isinstance(value, tuple):
+        return tuple(_thaw(item) for item in value)
+    if isinstance(value, (np.ndarray, np.generic, bool, int, float, complex, str)):
+        return value
+    if value is None:
+        return value
+    return copy.deepcopy(value)
+
+
+class DesignCache:
+    """
+    Cache LRU borné pour les fonctions de conception.
+
+    - maxsize : nombre maximal de résultats conservés
+    - rel_tol : tolérance relative d'arrondi des nombres dans les clés
+
+    Utilisation :
+        cache = DesignCache(maxsize=4096)
+        components = cache.wrap(Butterworth_LowPass().components)
+        components(4, 1000, res_values=[1000, 5000, 1000, 5000])
+    """
+
+    def __init__(self, maxsize=1024, rel_tol=1e-9):
+        if maxsize < 1:
+            raise ValueError("maxsize doit être supérieur ou égal à 1.")
+        self.maxsize = maxsize
+        self.rel_tol = rel_tol
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, func, args, kwargs, signature=None):
+        """
+        Clé canonique d'un appel.
+
+        Les arguments sont liés à la signature de func (valeurs par défaut
+        comprises) : un même appel écrit en positionnel ou par mot-clé donne
+        la même clé. L'état du concepteur (méthode liée) en fait partie.
+        """
+        if signature is None:
+            signature = inspect.signature(func)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        owner = getattr(func, "__self__", None)
+        state = None
+        if owner is not None:
+            state = (type(owner).__qualname__, canonical_key(vars(owner), self.rel_tol))
+        return (
+            func.__module__,
+            func.__qualname__,
+            state,
+            canonical_key(bound.arguments, self.rel_tol),
+        )
+
+    def get_or_compute(self, key, compute):
+        """Retourne la valeur figée associée à key, calculée par compute() si absente."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is None:
+            # Calcul hors verrou : les exceptions ne sont pas mises en cache
+            entry = _freeze(compute())
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        value, opaque = entry
+        return _thaw(value) if opaque else value
+
+    def put(self, key, value):
+        """
+        Insère value sous key sans compter d'accès (préchargement) ; une
+        entrée déjà présente est conservée.
+        """
+        entry = _freeze(value)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def wrap(self, func):
+        """Version mémoïsée de func (fonction ou méthode liée)."""
+
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def cached(*args, **kwargs):
+            return self.get_or_compute(
+                self.key(func, args, kwargs, signature), lambda: func(*args, **kwargs)
+            )
+
+        cached.cache = self
+        return cached
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, self.maxsize, len(self._entries)
+            )
+
+    def cache_clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,258 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from .snk.design import design_stages
+
+# Commande `filters` : conception en lot d'une liste de filtres actifs.
+#
+# Le fichier de spécifications (YAML ou CSV) décrit une conception par
+# ligne ; les résultats sont écrits au format JSON Lines, une ligne par
+# conception et dans l'ordre du fichier. Les conceptions sont regroupées en
+# lots calculés par un pool de processus ; le nombre de lots en cours est
+# borné, si bien que la mémoire utilisée ne dépend pas du nombre de lignes.
+#
+# Colonnes (CSV) ou clés (YAML) :
+#     family, filter_type, order, cutoff_frequency,
+#     r_vals, c_vals (listes ; en CSV, valeurs séparées par des ';'),
+#     ripple_db (tchebychev), normalization (bessel), id (facultatif)
+
+BATCH_SIZE = 256
+
+# Conversion des champs lus en CSV (toujours des chaînes)
+_FIELDS = {
+    "family": str,
+    "filter_type": str,
+    "order": int,
+    "cutoff_frequency": float,
+    "r_vals": lambda text: [float(v) for v in text.split(";")],
+    "c_vals": lambda text: [float(v) for v in text.split(";")],
+    "ripple_db": float,
+    "normalization": str,
+}
+
+
+def _parse_row(row):
+    """
+    Convertit une ligne CSV en arguments de design_stages() (+ 'id').
+
+    Une valeur invalide, ou une ligne dont le nombre de champs diffère de
+    celui de l'en-tête, n'interrompt pas la lecture : la ligne est alors
+    retournée telle quelle (champs non vides), avec le message dans 'error'
+    (voir run_design).
+    """
+    design = {}
+    fields = {}
+    error = None
+    for name, text in row.items():
+        # csv.DictReader range les champs en trop dans une liste sous la clé
+        # None et complète une ligne trop courte par des None
+        if name is None:
+            error = error or f"ValueError: {len(text)} champ(s) en trop"
+            continue
+        if not isinstance(text, str):
+            error = error or f"ValueError: {name}: champ manquant"
+            continue
+        text = text.strip()
+        if not text:
+            continue
+        fields[name] = text
+        if error is not None:
+            continue
+        try:
+            if name == "id":
+                design["id"] = text
+            elif name in _FIELDS:
+                design[name] = _FIELDS[name](text)
+            else:
+                raise ValueError(f"Colonne inconnue : {name}")
+        except ValueError as exc:
+            error = f"{type(exc).__name__}: {name}: {exc}"
+    if error is not None:
+        fields["error"] = error
+        return fields
+    return design
+
+
+def read_specs(path, spec_format=None):
+    """
+    Itère sur les conceptions décrites dans un fichier YAML ou CSV.
+
+    Le format est déduit de l'extension si spec_format est None. Le CSV est
+    lu ligne par ligne ; le YAML (liste de conceptions, à la racine ou sous
+    la clé 'designs') nécessite PyYAML. Une ligne CSV illisible donne une
+    conception portant son message dans 'error' (voir _parse_row).
+    """
+    if spec_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        spec_format = "csv" if extension == ".csv" else "yaml"
+    if spec_format == "csv":
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                yield _parse_row(row)
+    elif spec_format == "yaml":
+        try:
+            import yaml
+        except ImportError as exc:
+            raise ImportError(
+                "La lecture des fichiers YAML nécessite PyYAML (pip install pyyaml)."
+            ) from exc
+        with open(path) as f:
+            content = yaml.safe_load(f) or []
+        if isinstance(content, dict):
+            content = content.get("designs", [])
+        yield from content
+    else:
+        raise ValueError("spec_format doit être 'yaml' ou 'csv'.")
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Type non sérialisable : {type(value)}")
+
+
+def run_design(design):
+    """
+    Calcule une conception et retourne son résultat sérialisable.
+
+    Les erreurs de lecture (champ 'error' de la conception, voir read_specs)
+    et de conception sont retournées dans le champ 'error' : une ligne
+    invalide n'interrompt pas le traitement du fichier.
+    """
+    if not isinstance(design, dict):
+        return {
+            "design": design,
+            "error": "TypeError: une conception doit être un dictionnaire",
+        }
+    design = dict(design)
+    result = {}
+    if "id" in design:
+        result["id"] = design.pop("id")
+    error = design.pop("error", None)
+    result["design"] = design
+    if error is not None:
+        result["error"] = error
+        return result
+    try:
+        stages = design_stages(**design)
+    except (ValueError, TypeError, KeyError) as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        return result
+    result["stages"] = [
+        {"params": stage["params"], "sos": stage["sos"]} for stage in stages
+    ]
+    return result
+
+
+def _run_batch(batch):
+    """
+    Calcule un lot de (numéro de ligne, conception) ; retourne les couples
+    (ligne JSON, True si la conception est en erreur).
+    """
+    lines = []
+    for row, design in batch:
+        result = {"row": row}
+        result.update(run_design(design))
+        lines.append((json.dumps(result, default=_json_default), "error" in result))
+    return lines
+
+
+def run_specs(designs, workers=None, batch_size=BATCH_SIZE):
+    """
+    Calcule une suite de conceptions et itère sur les lignes JSON résultantes.
+
+    - designs : itérable de dicts (voir read_specs), consommé au fil de l'eau
+    - workers : nombre de processus (None : nombre de coeurs, 1 : aucun
+                processus supplémentaire)
+    - batch_size : nombre de conceptions par lot
+
+    Les lignes sont produites dans l'ordre des conceptions ; au plus
+    2 x workers lots sont en attente à un instant donné.
+    """
+    for line, _ in _run_specs(designs, workers, batch_size):
+        yield line
+
+
+def _run_specs(designs, workers, batch_size):
+    """Comme run_specs(), en produisant les couples de _run_batch()."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    numbered = enumerate(designs, start=1)
+    batches = iter(lambda: list(islice(numbered, batch_size)), [])
+    if workers == 1:
+        for batch in batches:
+            yield from _run_batch(batch)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(_run_batch, batch))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _write_lines(lines, output):
+    """Écrit les couples de _run_specs() ; retourne (conceptions, erreurs)."""
+    count = errors = 0
+    for line, failed in lines:
+        output.write(line + "\n")
+        count += 1
+        errors += failed
+    return count, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="filters",
+        description="Conception en lot de filtres actifs (sortie JSON Lines).",
+    )
+    parser.add_argument("spec", help="fichier de spécifications (.yml, .yaml, .csv)")
+    parser.add_argument(
+        "-o", "--output", help="fichier de sortie (sortie standard par défaut)"
+    )
+    parser.add_argument(
+        "-f", "--format", choices=["yaml", "csv"], help="format du fichier spec"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, help="nombre de processus (nombre de coeurs)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=BATCH_SIZE, help="conceptions par lot"
+    )
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers doit être supérieur ou égal à 1.")
+    if args.batch_size < 1:
+        parser.error("--batch-size doit être supérieur ou égal à 1.")
+
+    start = time.perf_counter()
+    lines = _run_specs(
+        read_specs(args.spec, args.format), args.workers, args.batch_size
+    )
+    if args.output:
+        with open(args.output, "w") as output:
+            count, errors = _write_lines(lines, output)
+    else:
+        try:
+            count, errors = _write_lines(lines, sys.stdout)
+        finally:
+            sys.stdout.flush()
+    print(
+        f"{count} conceptions ({errors} en erreur) en "
+        f"{time.perf_counter() - start:.2f} s",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from . import __version__
+from .cache import DesignCache, canonical_key
+from .snk.design import design_stages
+
+# Cache persistant (SQLite) des conceptions de filtres actifs, partagé entre
+# processus. Optionnel : rien dans la librairie ne l'utilise implicitement.
+#
+# - clé : empreinte SHA-256 de la demande canonique (voir canonical_key) et
+#   de la version de la librairie, stable d'un processus à l'autre ;
+# - valeur : paramètres des étages et coefficients SOS encodés en JSON
+#   (les flottants y sont écrits sans perte) ;
+# - mode WAL : les lecteurs ne bloquent pas l'écrivain ;
+# - taille bornée : les entrées les moins récemment utilisées sont évincées
+#   d'après le nombre réel d'entrées, à l'ouverture de la base, dans
+#   warm_up() et toutes les EVICTION_INTERVAL insertions d'un processus ;
+# - les lectures ne sont pas des transactions d'écriture : les dates
+#   d'utilisation (last_used) des entrées lues sont écrites par lots de
+#   TOUCH_BATCH, avec une insertion, avant une éviction ou à la fermeture ;
+# - warm_up() précharge les entrées les plus récentes dans un DesignCache
+#   en mémoire, pour qu'un nouveau processus démarre avec un cache chaud.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS designs (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    value TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS designs_last_used ON designs (last_used);
+CREATE INDEX IF NOT EXISTS designs_version ON designs (version);
+"""
+
+# Nombre d'insertions d'un processus entre deux contrôles de la taille de la
+# base (en plus du contrôle à l'ouverture)
+EVICTION_INTERVAL = 64
+
+# Nombre de lectures dont les dates d'utilisation sont écrites ensemble
+TOUCH_BATCH = 64
+
+
+def request_key(request, version=__version__, rel_tol=1e-9):
+    """Empreinte stable d'une demande de conception (dict d'arguments)."""
+    payload = json.dumps(
+        [version, canonical_key(request, rel_tol)], separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _encode(stages):
+    encoded = []
+    for stage in stages:
+        item = {
+            "params": {name: float(v) for name, v in stage["params"].items()},
+            "sos": np.asarray(stage["sos"], dtype=float).tolist(),
+        }
+        # Montage des étages qui ne suivent pas celui du type de filtre
+        if "damping" in stage:
+            item["damping"] = stage["damping"]
+        encoded.append(item)
+    return json.dumps(encoded)
+
+
+def _decode(value):
+    stages = json.loads(value)
+    for stage in stages:
+        stage["sos"] = np.array(stage["sos"])
+    return np.vstack([stage["sos"] for stage in stages]), stages
+
+
+class SQLiteDesignCache:
+    """
+    Cache SQLite des résultats de filters.snk.design.design_stages().
+
+    - path : fichier de la base, partagé par tous les processus
+    - max_entries : nombre maximal d'entrées conservées sur disque
+    - memory_size : taille du cache en mémoire placé devant la base
+    - rel_tol : tolérance relative d'arrondi des clés (voir DesignCache)
+
+    Utilisation :
+        cache = SQLiteDesignCache("designs.sqlite")
+        cache.warm_up()
+        sos, stages = cache.design("bessel", "lowpass", 4, 1000, r_vals=[...])
+    """
+
+    def __init__(self, path, max_entries=100_000, memory_size=1024, rel_tol=1e-9):
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.rel_tol = rel_tol
+        self.memory = DesignCache(maxsize=memory_size, rel_tol=rel_tol)
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self._inserts = 0
+        self._touched = {}
+        self._connection = None
+        self._pid = None
+
+    @property
+    def connection(self):
+        # Une connexion par processus : une connexion SQLite ne doit pas
+        # traverser un fork
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+            # Lectures en attente d'un processus parent : non transmises
+            self._touched = {}
+            # Les processus de courte durée n'atteignent jamais
+            # EVICTION_INTERVAL insertions : la taille est contrôlée ici
+            self.evict()
+        return self._connection
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self.flush()
+            self._connection.close()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def design(
+        self,
+        family,
+        filter_type,
+        order,
+        cutoff_frequency,
+        r_vals=None,
+        c_vals=None,
+        **options,
+    ):
+        """
+        Mêmes arguments que design_stages() ; retourne (sos, stages).
+
+        Les résultats sont figés (voir filters.cache) : sos est en lecture
+        seule et stages est un tuple de mappings.
+        """
+        request = {
+            "family": family,
+            "filter_type": filter_type,
+            "order": order,
+            "cutoff_frequency": cutoff_frequency,
+            "r_vals": r_vals,
+            "c_vals": c_vals,
+            **options,
+        }
+        key = request_key(request, rel_tol=self.rel_tol)
+        return self.memory.get_or_compute(key, lambda: self._load(key, request))
+
+    def _load(self, key, request):
+        connection = self.connection
+        row = connection.execute(
+            "SELECT value FROM designs WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self.disk_hits += 1
+            # Lecture seule : la date d'utilisation est écrite plus tard
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH:
+                self.flush()
+            return _decode(row[0])
+
+        self.disk_misses += 1
+        value = _encode(design_stages(**request))
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO designs VALUES (?, ?, ?, ?)",
+                (key, __version__, value, time.time()),
+            )
+            self._write_touched(connection)
+        self._inserts += 1
+        if self._inserts % EVICTION_INTERVAL == 0:
+            self.evict()
+        return _decode(value)
+
+    def _write_touched(self, connection):
+        if self._touched:
+            connection.executemany(
+                "UPDATE designs SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched = {}
+
+    def flush(self):
+        """Écrit en une transaction les dates d'utilisation des lectures en attente."""
+        if self._touched:
+            connection = self.connection
+            with connection:
+                self._write_touched(connection)
+
+    def evict(self):
+        """
+        Supprime les entrées d'autres versions puis les moins récentes en trop,
+        d'après le nombre réel d'entrées de la base. N'écrit rien (aucune
+        transaction) si la base respecte déjà max_entries.
+
+        Retourne le nombre d'entrées supprimées.
+        """
+        connection = self.connection
+        stale = connection.execute(
+            "SELECT 1 FROM designs WHERE version != ? LIMIT 1", (__version__,)
+        ).fetchone()
+        (count,) = connection.execute("SELECT COUNT(*) FROM designs").fetchone()
+        if stale is None and count <= self.max_entries:
+            return 0
+        with connection:
+            # Dates d'utilisation à jour avant de choisir les entrées évincées
+            self._write_touched(connection)
+            removed = connection.execute(
+                "DELETE FROM designs WHERE version != ?", (__version__,)
+            ).rowcount
+            (count,) = connection.execute("SELECT COUNT(*) FROM designs").fetchone()
+            if count > self.max_entries:
+                removed += connection.execute(
+                    "DELETE FROM designs WHERE key IN "
+                    "(SELECT key FROM designs ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+        return removed
+
+    def warm_up(self, limit=None):
+        """
+        Précharge en mémoire les entrées les plus récemment utilisées.
+
+        La base est d'abord ramenée à max_entries (voir evict). Les entrées
+        sont insérées directement dans le cache en mémoire : elles ne comptent
+        ni comme succès ni comme échecs. Retourne le nombre d'entrées chargées
+        (au plus memory_size).
+        """
+        if limit is None:
+            limit = self.memory.maxsize
+        limit = min(limit, self.memory.maxsize)
+        self.evict()
+        rows = self.connection.execute(
+            "SELECT key, value FROM designs WHERE version = ? "
+            "ORDER BY last_used DESC LIMIT ?",
+            (__version__, limit),
+        ).fetchall()
+        # Du plus ancien au plus récent, pour respecter l'ordre LRU
+        for key, value in reversed(rows):
+            self.memory.put(key, _decode(value))
+        return len(rows)
+
+    def __len__(self):
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM designs").fetchone()
+        return count
+
+    def clear(self):
+        """Vide la base et le cache en mémoire."""
+        with self.connection:
+            self.connection.execute("DELETE FROM designs")
+        self._touched = {}
+        self.memory.cache_clear()
@@ -0,0 +1,293 @@
+from functools import cache
+
+import numpy as np
+
+from .response import cutoff_error
+from .snk.sos import section_parameters, stage_damping, stage_section
+
+# Valeurs normalisées (IEC 60063) d'une décade, de 1 à 10 exclu.
+E12 = (1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2)
+
+E24 = (
+    1.0, 1.1, 1.2, 1.3, 1.5, 1.6, 1.8, 2.0, 2.2, 2.4, 2.7, 3.0,
+    3.3, 3.6, 3.9, 4.3, 4.7, 5.1, 5.6, 6.2, 6.8, 7.5, 8.2, 9.1,
+)  # fmt: skip
+
+E96 = (
+    1.00, 1.02, 1.05, 1.07, 1.10, 1.13, 1.15, 1.18, 1.21, 1.24, 1.27, 1.30,
+    1.33, 1.37, 1.40, 1.43, 1.47, 1.50, 1.54, 1.58, 1.62, 1.65, 1.69, 1.74,
+    1.78, 1.82, 1.87, 1.91, 1.96, 2.00, 2.05, 2.10, 2.15, 2.21, 2.26, 2.32,
+    2.37, 2.43, 2.49, 2.55, 2.61, 2.67, 2.74, 2.80, 2.87, 2.94, 3.01, 3.09,
+    3.16, 3.24, 3.32, 3.40, 3.48, 3.57, 3.65, 3.74, 3.83, 3.92, 4.02, 4.12,
+    4.22, 4.32, 4.42, 4.53, 4.64, 4.75, 4.87, 4.99, 5.11, 5.23, 5.36, 5.49,
+    5.62, 5.76, 5.90, 6.04, 6.19, 6.34, 6.49, 6.65, 6.81, 6.98, 7.15, 7.32,
+    7.50, 7.68, 7.87, 8.06, 8.25, 8.45, 8.66, 8.87, 9.09, 9.31, 9.53, 9.76,
+)  # fmt: skip
+
+E_SERIES = {"E12": E12, "E24": E24, "E96": E96}
+
+# Décades couvertes : du femtofarad (1e-15) au gigaohm (1e9)
+DECADES = range(-15, 10)
+
+
+@cache
+def preferred_values(series="E24"):
+    """
+    Tableau trié (lecture seule) des valeurs normalisées sur toutes les décades.
+
+    Calculé une seule fois par série puis réutilisé par snap().
+    """
+    if series not in E_SERIES:
+        raise ValueError(f"series doit être l'une de {sorted(E_SERIES)}.")
+    # Construit depuis le texte pour obtenir 4.7e-09 et non 4.7000000000000002e-09
+    values = np.array([float(f"{v}e{d}") for d in DECADES for v in E_SERIES[series]])
+    values.flags.writeable = False
+    return values
+
+
+def snap(values, series="E24"):
+    """
+    Remplace chaque valeur par la valeur normalisée la plus proche.
+
+    La proximité est mesurée en rapport (échelle logarithmique), ce qui
+    correspond à l'erreur relative sur le composant. values peut être un
+    scalaire ou un tableau de forme quelconque (lot de conceptions) ; la
+    recherche est une dichotomie vectorisée dans preferred_values(series).
+    """
+    table = preferred_values(series)
+    values = np.asarray(values, dtype=float)
+    if np.any(~(values >= table[0])) or np.any(values > table[-1]):
+        raise ValueError(
+            f"Les valeurs doivent être comprises entre {table[0]} et {table[-1]}."
+        )
+    # table[idx - 1] < valeur <= table[idx]
+    idx = np.clip(np.searchsorted(table, values), 1, table.size - 1)
+    lower, upper = table[idx - 1], table[idx]
+    # Point milieu géométrique entre les deux valeurs voisines
+    snapped = np.where(values * values < lower * upper, lower, upper)
+    if snapped.ndim == 0:
+        return float(snapped)
+    return snapped
+
+
+def snap_stages(stages, filter_type, cutoff_frequency, series="E24"):
+    """
+    Normalise tous les composants R/C d'une conception et évalue l'écart.
+
+    - stages : étages {"params": {...}, ...} retournés par bessel,
+               tchebychev ou butterworth ; pour un lot, chaque paramètre est
+               un tableau (n,) (voir Butterworth_LowPass.stages_batch)
+    - filter_type : 'lowpass' ou 'highpass'
+    - cutoff_frequency : fréquence de coupure visée (Hz), scalaire ou (n,)
+    - series : 'E12', 'E24' ou 'E96'
+
+    Les sections idéale et normalisée sont recalculées à partir des
+    composants, avec le montage de chaque étage (stage["damping"]), si bien
+    que l'écart ne provient que de la normalisation.
+
+    Retourne un dict :
+    - "stages" : étages avec composants normalisés, section "sos" et
+                 montage "damping" de l'étage d'origine
+    - "omega0_error", "q_error" : erreurs relatives par étage (..., n_stages),
+                                  q_error vaut 0 pour une cellule du 1er ordre
+    - "cutoff_error" : erreur relative sur la coupure (voir cutoff_error)
+    """
+    realized = [
+        {name: snap(value, series) for name, value in stage["params"].items()}
+        for stage in stages
+    ]
+    return _compare(stages, realized, filter_type, cutoff_frequency)
+
+
+def _compare(stages, realized, filter_type, cutoff_frequency):
+    """Étages réalisés avec les composants realized et écarts à la conception."""
+    realized_stages = []
+    ideal_sections = []
+    for stage, params in zip(stages, realized):
+        # Même montage (stage["damping"]) pour la conception et la réalisation
+        ideal_sections.append(stage_section(filter_type, stage))
+        realized_stage = {
+            "params": params,
+            "sos": stage_section(filter_type, stage, params),
+        }
+        if "damping" in stage:
+            realized_stage["damping"] = stage["damping"]
+        realized_stages.append(realized_stage)
+    ideal_sos = np.stack(ideal_sections, axis=-2)
+    realized_sos = np.stack([stage["sos"] for stage in realized_stages], axis=-2)
+
+    omega0, q = section_parameters(ideal_sos)
+    realized_omega0, realized_q = section_parameters(realized_sos)
+    q_error = np.divide(realized_q, q, out=np.ones_like(q), where=q != 0) - 1
+    return {
+        "stages": realized_stages,
+        "omega0_error": realized_omega0 / omega0 - 1,
+        "q_error": q_error,
+        "cutoff_error": cutoff_error(ideal_sos, realized_sos, cutoff_frequency),
+    }
+
+
+# Recherche combinée des composants d'un étage (optimize_stages).
+#
+# L'erreur d'un étage est e = ln(omega0 / omega0_visé)^2 + ln(Q / Q_visé)^2.
+# Avec g(y) = 1 / (sqrt(y) + 1 / sqrt(y)), une cellule Sallen-Key s'écrit :
+#     omega0 = 1 / sqrt(y1 y2 x1 x2)
+#     Q = sqrt(x1 / x2) * g(y1 / y2)
+# avec (y1, y2) = (R1, R2) et (x1, x2) = (C1, C2) pour le montage "sum_r"
+# (passe-bas par défaut), (y1, y2) = (C1, C2) et (x1, x2) = (R2, R1) pour le
+# montage "sum_c" (passe-haut, passe-bas de tchebychev ; voir filters.snk.sos).
+# Pour une paire (y1, y2) donnée, omega0 et Q visés fixent ln x1 et ln x2 ;
+# l'erreur vaut alors (d1^2 + d2^2) / 2, où d1, d2 sont les écarts
+# logarithmiques de x1, x2 à leur valeur normalisée la plus proche. La
+# meilleure paire (x1, x2) est donc obtenue par deux lectures dans un index
+# précalculé de la table, et seules
+# les paires (y1, y2) sont énumérées (tableau 2D vectorisé) au lieu de toutes
+# les combinaisons des 4 composants.
+# Les paires qui demanderaient (x1, x2) hors de la fenêtre sont écartées.
+
+
+@cache
+def _log_values(series):
+    """
+    ln des valeurs normalisées et index de recherche précalculé.
+
+    L'intervalle [ln min, ln max] est découpé en cases plus étroites que le
+    plus petit écart entre deux valeurs : une case contient au plus une
+    valeur, si bien que searchsorted se réduit à une lecture dans guesses
+    suivie d'une comparaison (voir _nearest).
+    """
+    values = np.log(preferred_values(series))
+    width = np.diff(values).min() / 2
+    edges = values[0] + width * np.arange(int((values[-1] - values[0]) / width) + 2)
+    guesses = np.searchsorted(values, edges)
+    for array in (values, guesses):
+        array.flags.writeable = False
+    return values, width, guesses
+
+
+def _window(log_table, value, spread):
+    """Bornes [début, fin[ des valeurs de log_table à un facteur spread de value."""
+    # Marge pour garder une valeur située exactement à un facteur spread
+    half_width = np.log(spread) + 1e-9
+    center = np.log(value)
+    return np.searchsorted(log_table, [center - half_width, center + half_width])
+
+
+def _nearest(series, x):
+    """Indice de la valeur normalisée la plus proche de exp(x) et écart en ln."""
+    log_table, width, guesses = _log_values(series)
+    clipped = np.clip(x, log_table[0], log_table[-1])
+    guess = guesses[((clipped - log_table[0]) / width).astype(int)]
+    # Premier indice tel que log_table[idx] >= x (équivaut à searchsorted)
+    idx = guess + (log_table[np.minimum(guess, log_table.size - 1)] < clipped)
+    idx = np.clip(idx, 1, log_table.size - 1)
+    idx = idx - (x - log_table[idx - 1] < log_table[idx] - x)
+    return idx, x - log_table[idx]
+
+
+def _check_window(error):
+    if not np.isfinite(error).any():
+        raise ValueError("Aucune combinaison de valeurs normalisées dans la fenêtre.")
+
+
+def _best(error, distance):
+    """Indice de l'erreur minimale ; à égalité, le plus proche de la conception."""
+    best = error.min()
+    ties = error <= best + 1e-12 * max(best, 1e-12)
+    return np.unravel_index(np.argmin(np.where(ties, distance, np.inf)), error.shape)
+
+
+def _optimize_first_order(params, series, omega0, spread):
+    log_table, _, _ = _log_values(series)
+    lo, hi = _window(log_table, params["R"], spread)
+    log_r = log_table[lo:hi]
+    c_idx, d_c = _nearest(series, -np.log(omega0) - log_r)
+    c_lo, c_hi = _window(log_table, params["C"], spread)
+    error = np.where((c_idx >= c_lo) & (c_idx < c_hi), d_c**2, np.inf)
+    _check_window(error)
+    (i,) = _best(error, np.abs(log_r - np.log(params["R"])))
+    table = preferred_values(series)
+    return {"R": float(table[lo + i]), "C": float(table[c_idx[i]])}
+
+
+def _optimize_sallen_key(params, damping, series, omega0, q, spread):
+    log_table, _, _ = _log_values(series)
+    if damping == "sum_r":
+        y_names, x_names = ("R1", "R2"), ("C1", "C2")
+    else:
+        y_names, x_names = ("C1", "C2"), ("R2", "R1")
+    (lo1, hi1), (lo2, hi2) = (_window(log_table, params[n], spread) for n in y_names)
+    y1 = log_table[lo1:hi1, np.newaxis]
+    y2 = log_table[np.newaxis, lo2:hi2]
+    # ln g(y1 / y2) = -ln(2 cosh((ln y1 - ln y2) / 2))
+    log_g = -np.log(2 * np.cosh((y1 - y2) / 2))
+    total = -2 * np.log(omega0) - (y1 + y2)  # ln x1 + ln x2
+    difference = 2 * (np.log(q) - log_g)  # ln x1 - ln x2
+    x = ((total + difference) / 2, (total - difference) / 2)
+    # Élagage : paires dont (x1, x2) tombe hors de la fenêtre
+    # (avec la marge d'un écart : la valeur la plus proche peut y rester)
+    half_width = np.log(spread) + np.diff(log_table).max()
+    keep = np.ones(total.shape, dtype=bool)
+    for name, value in zip(x_names, x):
+        keep &= np.abs(value - np.log(params[name])) <= half_width
+    keep = np.flatnonzero(keep)
+    error = np.zeros(keep.size)
+    x_idx = []
+    for name, value in zip(x_names, x):
+        idx, d = _nearest(series, value.ravel()[keep])
+        lo, hi = _window(log_table, params[name], spread)
+        error += np.where((idx >= lo) & (idx < hi), d**2, np.inf)
+        x_idx.append(idx)
+    _check_window(error)
+    distance = (y1 - np.log(params[y_names[0]])) ** 2 + (
+        y2 - np.log(params[y_names[1]])
+    ) ** 2
+    (k,) = _best(error, distance.ravel()[keep])
+    i, j = np.unravel_index(keep[k], total.shape)
+    indices = {
+        y_names[0]: lo1 + i,
+        y_names[1]: lo2 + j,
+        x_names[0]: x_idx[0][k],
+        x_names[1]: x_idx[1][k],
+    }
+    table = preferred_values(series)
+    return {name: float(table[indices[name]]) for name in ("R1", "R2", "C1", "C2")}
+
+
+def optimize_stages(stages, filter_type, cutoff_frequency, series="E24", spread=3.0):
+    """
+    Choisit ensemble les composants normalisés de chaque étage.
+
+    Contrairement à snap_stages(), qui arrondit chaque composant séparément,
+    les composants d'un étage sont cherchés conjointement pour minimiser
+    ln(omega0 / omega0_visé)^2 + ln(Q / Q_visé)^2, chacun restant à un facteur
+    spread de sa valeur calculée.
+
+    - stages : étages {"params": {...}, ...} d'une conception (valeurs
+               scalaires) retournés par bessel, tchebychev ou butterworth
+    - filter_type : 'lowpass' ou 'highpass'
+    - cutoff_frequency : fréquence de coupure visée (Hz)
+    - series : 'E12', 'E24' ou 'E96'
+    - spread : facteur maximal entre un composant choisi et sa valeur calculée
+
+    Retourne un dict de même format que snap_stages().
+    """
+    if spread <= 1:
+        raise ValueError("spread doit être strictement supérieur à 1.")
+    realized = []
+    for stage in stages:
+        params = stage["params"]
+        if any(np.ndim(value) for value in params.values()):
+            raise ValueError("optimize_stages() traite une seule conception.")
+        # Cibles calculées avec le montage de l'étage (stage["damping"])
+        (omega0,), (q,) = section_parameters(
+            stage_section(filter_type, stage)[np.newaxis]
+        )
+        if "R" in params:
+            realized.append(_optimize_first_order(params, series, omega0, spread))
+        else:
+            damping = stage_damping(filter_type, stage)
+            realized.append(
+                _optimize_sallen_key(params, damping, series, omega0, q, spread)
+            )
+    return _compare(stages, realized, filter_type, cutoff_frequency)
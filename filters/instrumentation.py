@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+# Mesure optionnelle du temps passé dans chaque phase des concepteurs snk.
+#
+# Les concepteurs balisent leurs phases (validation, étages, construction des
+# TransferFunction, np.polymul...) avec phase() ou @timed. Sans
+# enregistreur actif, phase() retourne un contexte vide partagé : le coût se
+# limite à la lecture d'une ContextVar. Dans un bloc `with instrument()`,
+# chaque phase est chronométrée et cumulée sous un nom hiérarchique qui
+# reprend l'imbrication des phases, par exemple :
+#     bessel.lowpass.components/stage[2]/transfer_function
+#
+# L'enregistreur actif est porté par une ContextVar : des requêtes traitées
+# en parallèle (threads, asyncio) ont chacune le leur.
+
+# (enregistreur, nom de la phase englobante) ou None si désactivé
+_current = ContextVar("filters_instrumentation", default=None)
+_DISABLED = nullcontext()
+
+
+class Recorder:
+    """
+    Cumule le nombre d'appels et les durées de chaque phase.
+
+    Un même enregistreur peut être réutilisé par plusieurs blocs
+    `with instrument(recorder)` (ou threads) pour agréger des requêtes.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        """Ajoute une mesure de durée à la phase name."""
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                self._stats[name] = [1, seconds, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = min(entry[2], seconds)
+                entry[3] = max(entry[3], seconds)
+
+    def as_dict(self):
+        """
+        Résumé {phase: {"calls", "total_s", "mean_s", "min_s", "max_s"}},
+        trié par nom : chaque phase précède ses sous-phases.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "calls": calls,
+                    "total_s": total,
+                    "mean_s": total / calls,
+                    "min_s": low,
+                    "max_s": high,
+                }
+                for name, (calls, total, low, high) in sorted(self._stats.items())
+            }
+
+    def to_json(self, **kwargs):
+        """Résumé as_dict() encodé en JSON (kwargs transmis à json.dumps)."""
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class _Phase:
+    __slots__ = ("_start", "_token", "name", "recorder")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self._token = _current.set((self.recorder, self.name))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self._start
+        _current.reset(self._token)
+        self.recorder.add(self.name, elapsed)
+        return False
+
+
+def phase(name):
+    """Contexte chronométrant une phase (sans effet hors de instrument())."""
+    state = _current.get()
+    if state is None:
+        return _DISABLED
+    recorder, parent = state
+    return _Phase(recorder, f"{parent}/{name}" if parent else name)
+
+
+def timed(name):
+    """Décorateur : chaque appel de la fonction est une phase nommée name."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def instrument(recorder=None):
+    """
+    Active la mesure des phases dans le bloc et retourne l'enregistreur.
+
+        with instrument() as recorder:
+            lowpass().components(4, 1000, r_vals=[1000] * 4)
+        print(recorder.to_json(indent=2))
+    """
+    if recorder is None:
+        recorder = Recorder()
+    token = _current.set((recorder, ""))
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
@@ -0,0 +1,165 @@
+import numpy as np
+
+from .plotting import log_frequencies
+from .response import cutoff_error, magnitude_response
+from .snk.sos import section_parameters, stage_section
+
+# Analyse de tolérance Monte-Carlo d'une cascade Sallen-Key.
+#
+# Les N jeux de composants perturbés sont tirés en une seule fois dans un
+# tableau (N, nbr_composants) ; les sections, omega0/Q et réponses de tous
+# les tirages sont ensuite calculés par diffusion NumPy, sans boucle Python
+# sur les tirages ni rappel de components().
+
+DISTRIBUTIONS = ("uniform", "normal")
+
+# Nombre de tirages évalués ensemble pour la réponse en fréquence, afin de
+# borner la mémoire des tableaux intermédiaires (tirages x étages x fréquences)
+CHUNK_SIZE = 4096
+
+
+def _part_tolerances(names, tolerance):
+    """Tolérance relative de chaque composant ("R1", "C2"...)."""
+    if isinstance(tolerance, dict):
+        # Tolérance par nature de composant ("R", "C") ou par nom exact
+        return np.array(
+            [tolerance.get(name, tolerance.get(name[0], 0.0)) for name in names]
+        )
+    return np.full(len(names), float(tolerance))
+
+
+def perturb(values, tolerance, n_samples, distribution="uniform", seed=None):
+    """
+    Tire n_samples jeux de valeurs perturbées.
+
+    - values : valeurs nominales (n_parts,)
+    - tolerance : tolérance relative de chaque composant, scalaire ou (n_parts,)
+    - distribution : 'uniform' (valeur +/- tolérance) ou 'normal' (la
+                     tolérance correspond à 3 écarts-types)
+    - seed : graine, SeedSequence ou Generator NumPy
+
+    Retourne un tableau (n_samples, n_parts).
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"distribution doit être l'une de {DISTRIBUTIONS}.")
+    rng = np.random.default_rng(seed)
+    values = np.asarray(values, dtype=float)
+    tolerance = np.asarray(tolerance, dtype=float)
+    shape = (n_samples,) + values.shape
+    if distribution == "uniform":
+        deviation = rng.uniform(-1.0, 1.0, size=shape)
+    else:
+        deviation = rng.standard_normal(size=shape) / 3
+    return values * (1 + tolerance * deviation)
+
+
+def sample_responses(
+    stages,
+    filter_type,
+    cutoff_frequency,
+    n_samples,
+    tolerance=0.01,
+    distribution="uniform",
+    freqs=None,
+    seed=None,
+):
+    """
+    Tire n_samples réalisations d'une conception et calcule leurs réponses.
+
+    Mêmes paramètres que monte_carlo() ; retourne les tableaux par tirage
+    {"freqs", "omega0", "q", "magnitude_db", "cutoff"} sans statistiques,
+    pour pouvoir fusionner plusieurs lots de tirages (voir filters.yield_analysis).
+    """
+    names = [(i, name) for i, stage in enumerate(stages) for name in stage["params"]]
+    nominal = [stages[i]["params"][name] for i, name in names]
+    tolerances = _part_tolerances([name for _, name in names], tolerance)
+    samples = perturb(nominal, tolerances, n_samples, distribution, seed)
+
+    # Composants tirés regroupés par étage : chaque valeur est un tableau (N,)
+    params = [{} for _ in stages]
+    for column, (i, name) in enumerate(names):
+        params[i][name] = samples[:, column]
+    # Sections recalculées avec le montage de chaque étage (stage["damping"])
+    sos = np.stack(
+        [stage_section(filter_type, stage, p) for stage, p in zip(stages, params)],
+        axis=-2,
+    )  # (N, n_stages, 6)
+    ideal_sos = np.stack([stage_section(filter_type, stage) for stage in stages])
+    omega0, q = section_parameters(sos)
+
+    if freqs is None:
+        freqs = log_frequencies(cutoff_frequency, 1, 200)
+    freqs = np.asarray(freqs, dtype=float)
+    magnitude_db = np.empty((n_samples, freqs.size))
+    cutoff = np.empty(n_samples)
+    for start in range(0, n_samples, CHUNK_SIZE):
+        chunk = slice(start, start + CHUNK_SIZE)
+        magnitude_db[chunk] = magnitude_response(sos[chunk], freqs)
+        cutoff[chunk] = cutoff_frequency * (
+            1 + cutoff_error(ideal_sos, sos[chunk], cutoff_frequency)
+        )
+    return {
+        "freqs": freqs,
+        "omega0": omega0,
+        "q": q,
+        "magnitude_db": magnitude_db,
+        "cutoff": cutoff,
+    }
+
+
+def monte_carlo(
+    stages,
+    filter_type,
+    cutoff_frequency,
+    n_samples,
+    tolerance=0.01,
+    distribution="uniform",
+    freqs=None,
+    percentiles=(5, 50, 95),
+    seed=None,
+):
+    """
+    Analyse de tolérance d'une conception par tirages de Monte-Carlo.
+
+    - stages : étages {"params": {...}, ...}, par ex. le second élément de
+               lowpass().components() (bessel) ou Butterworth_LowPass().stages() ;
+               le montage "damping" d'un étage est conservé par les tirages
+    - filter_type : 'lowpass' ou 'highpass'
+    - cutoff_frequency : fréquence de coupure visée (Hz)
+    - n_samples : nombre de tirages
+    - tolerance : tolérance relative, commune (0.01 pour 1 %) ou par
+                  composant : {"R": 0.01, "C": 0.05} ou {"C1": 0.1, ...}
+    - distribution : 'uniform' ou 'normal' (voir perturb)
+    - freqs : fréquences d'évaluation (Hz), par défaut +/- 1 décade
+    - percentiles : centiles des enveloppes retournées
+
+    Retourne un dict :
+    - "freqs" : fréquences (n_freqs,)
+    - "omega0", "q" : pulsation propre et Q de chaque tirage (N, n_stages)
+    - "magnitude_db" : gain de chaque tirage (N, n_freqs)
+    - "cutoff" : fréquence de coupure de chaque tirage (N,)
+    - "gain_envelope" : {centile: gain (n_freqs,)}
+    - "cutoff_percentiles" : {centile: fréquence de coupure}
+    """
+    result = sample_responses(
+        stages,
+        filter_type,
+        cutoff_frequency,
+        n_samples,
+        tolerance,
+        distribution,
+        freqs,
+        seed,
+    )
+    result.update(envelopes(result["magnitude_db"], result["cutoff"], percentiles))
+    return result
+
+
+def envelopes(magnitude_db, cutoff, percentiles=(5, 50, 95)):
+    """Enveloppes de gain et centiles de coupure d'un ensemble de tirages."""
+    gain_envelope = np.percentile(magnitude_db, percentiles, axis=0)
+    cutoff_percentiles = np.nanpercentile(cutoff, percentiles)
+    return {
+        "gain_envelope": dict(zip(percentiles, gain_envelope)),
+        "cutoff_percentiles": dict(zip(percentiles, cutoff_percentiles.tolist())),
+    }
@@ -1,6 +1,8 @@
 import math
 import numpy as np
-import matplotlib.pyplot as plt
+
+from ..plotting import render_bode
+
 
 class BandPassFilter:
     @staticmethod
@@ -104,16 +106,22 @@ class BandPassFilter:
         return {"R1": R1, "R2": R2, "C1": C1, "C2": C2}
 
     @staticmethod
-    def bode_plot(resonant_frequency, quality_factor, resistance):
+    def bode_response(resonant_frequency, quality_factor, resistance, frequencies=None):
         """
-        Plot the Bode diagram (gain and phase) for band-pass filter.
+        Compute the Bode diagram (gain and phase) for band-pass filter.
 
         Parameters:
         resonant_frequency (float): Resonant frequency in Hz
         quality_factor (float): Quality factor (Q)
         resistance (float): Resistance in ohms
+        frequencies (array, optional): Frequencies in Hz (default: 10 Hz to 1 MHz)
+
+        Return:
+        tuple: (frequencies in Hz, gain in dB, phase in degrees)
         """
-        frequencies = np.logspace(1, 6, 500)  # Fréquences de 10 Hz à 1 MHz
+        if frequencies is None:
+            frequencies = np.logspace(1, 6, 500)  # Fréquences de 10 Hz à 1 MHz
+        frequencies = np.asarray(frequencies, dtype=float)
         omega = 2 * np.pi * frequencies
         omega_0 = 2 * np.pi * resonant_frequency
 
@@ -128,34 +136,33 @@ class BandPassFilter:
         )
         phase = -np.arctan((omega * L - 1 / (omega * C)) / resistance) * (180 / np.pi)
 
-        # Plot the amplitude response
-        plt.figure(figsize=(10, 8))
-        plt.subplot(2, 1, 1)
-        plt.semilogx(frequencies, 20 * np.log10(gain))
-        plt.axvline(
-            resonant_frequency,
-            color="red",
-            linestyle="--",
-            label="Fréquence de résonance",
+        return frequencies, 20 * np.log10(gain), phase
+
+    @staticmethod
+    def bode_plot(resonant_frequency, quality_factor, resistance, path=None):
+        """
+        Plot the Bode diagram (gain and phase) for band-pass filter.
+
+        Parameters:
+        resonant_frequency (float): Resonant frequency in Hz
+        quality_factor (float): Quality factor (Q)
+        resistance (float): Resistance in ohms
+        path (str, optional): Output file; if given, the plot is rendered
+            off-screen to this file instead of being shown
+
+        Return:
+        str or None: path of the written file
+        """
+        frequencies, gain_db, phase = BandPassFilter.bode_response(
+            resonant_frequency, quality_factor, resistance
         )
-        plt.title("Diagramme de Bode - Filtre Passe-Bande")
-        plt.xlabel("Fréquence (Hz)")
-        plt.ylabel("Gain (dB)")
-        plt.grid(which="both", linestyle="--", linewidth=0.5)
-        plt.legend()
-
-        # Plot the phase response
-        plt.subplot(2, 1, 2)
-        plt.semilogx(frequencies, phase, color="orange", label="Phase")
-        plt.axvline(
-            resonant_frequency,
-            color="red",
-            linestyle="--",
-            label="Fréquence de résonance",
+        return render_bode(
+            frequencies,
+            gain_db,
+            phase,
+            path=path,
+            title="Filtre Passe-Bande",
+            marker_frequency=resonant_frequency,
+            marker_label="Fréquence de résonance",
+            figsize=(10, 8),
         )
-        plt.xlabel("Fréquence (Hz)")
-        plt.ylabel("Phase (degrés)")
-        plt.grid(which="both", linestyle="--", linewidth=0.5)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
@@ -1,6 +1,7 @@
 import math
 import numpy as np
-import matplotlib.pyplot as plt
+
+from ..plotting import render_bode
 
 
 class BandStopFilter:
@@ -28,17 +29,22 @@ class BandStopFilter:
         return {"R": resistance, "L": L, "C": C}
 
     @staticmethod
-    def bode_plot(resonant_frequency, resistance, inductance, capacitance):
+    def bode_response(resistance, inductance, capacitance, frequencies=None):
         """
-        Plot the Bode diagram for a band-stop filter.
+        Compute the Bode diagram (gain and phase) for a band-stop filter.
 
         Parameters:
-        resonant_frequency (float): Resonant frequency in Hz
         resistance (float): Resistance in ohms
         inductance (float): Inductance in henries
         capacitance (float): Capacitance in farads
+        frequencies (array, optional): Frequencies in Hz (default: 10 Hz to 1 MHz)
+
+        Return:
+        tuple: (frequencies in Hz, gain in dB, phase in degrees)
         """
-        frequencies = np.logspace(1, 6, 500)  # Fréquences de 10 Hz à 1 MHz
+        if frequencies is None:
+            frequencies = np.logspace(1, 6, 500)  # Fréquences de 10 Hz à 1 MHz
+        frequencies = np.asarray(frequencies, dtype=float)
         omega = 2 * np.pi * frequencies
         gain = np.sqrt(1 + (omega**2 * inductance * capacitance) ** 2) / np.sqrt(
             (1 + omega**2 * inductance * capacitance) ** 2
@@ -49,34 +55,34 @@ class BandStopFilter:
             1 - omega**2 * inductance * capacitance,
         ) * (180 / np.pi)
 
-        # Plot the amplitude response
-        plt.figure(figsize=(10, 8))
-        plt.subplot(2, 1, 1)
-        plt.semilogx(frequencies, 20 * np.log10(gain))
-        plt.axvline(
-            resonant_frequency,
-            color="red",
-            linestyle="--",
-            label="Fréquence de résonance",
-        )
-        plt.title("Diagramme de Bode - Filtre Coupe-Bande")
-        plt.xlabel("Fréquence (Hz)")
-        plt.ylabel("Gain (dB)")
-        plt.grid(which="both", linestyle="--", linewidth=0.5)
-        plt.legend()
+        return frequencies, 20 * np.log10(gain), phase
+
+    @staticmethod
+    def bode_plot(resonant_frequency, resistance, inductance, capacitance, path=None):
+        """
+        Plot the Bode diagram for a band-stop filter.
 
-        # Plot the phase response
-        plt.subplot(2, 1, 2)
-        plt.semilogx(frequencies, phase, color="orange", label="Phase")
-        plt.axvline(
-            resonant_frequency,
-            color="red",
-            linestyle="--",
-            label="Fréquence de résonance",
+        Parameters:
+        resonant_frequency (float): Resonant frequency in Hz
+        resistance (float): Resistance in ohms
+        inductance (float): Inductance in henries
+        capacitance (float): Capacitance in farads
+        path (str, optional): Output file; if given, the plot is rendered
+            off-screen to this file instead of being shown
+
+        Return:
+        str or None: path of the written file
+        """
+        frequencies, gain_db, phase = BandStopFilter.bode_response(
+            resistance, inductance, capacitance
+        )
+        return render_bode(
+            frequencies,
+            gain_db,
+            phase,
+            path=path,
+            title="Filtre Coupe-Bande",
+            marker_frequency=resonant_frequency,
+            marker_label="Fréquence de résonance",
+            figsize=(10, 8),
         )
-        plt.xlabel("Fréquence (Hz)")
-        plt.ylabel("Phase (degrés)")
-        plt.grid(which="both", linestyle="--", linewidth=0.5)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
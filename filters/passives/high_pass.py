@@ -1,6 +1,7 @@
 import math
 import numpy as np
-import matplotlib.pyplot as plt
+
+from ..plotting import render_bode
 
 
 class HighPassFilter:
@@ -74,24 +75,29 @@ class HighPassFilter:
         return {"R": resistance, "L": L, "C": C}
 
     @staticmethod
-    def bode_plot(
-        cutoff_frequency,
+    def bode_response(
         resistance,
         inductance=None,
         capacitance=None,
         filter_type="RC",
+        frequencies=None,
     ):
         """
-        Plot the Bode diagram (gain and phase) for high-pass RC, RL, and RLC filters.
+        Compute the Bode diagram (gain and phase) for high-pass RC, RL, and RLC filters.
 
         Parameters:
-        cutoff_frequency (float): Desired cutoff frequency in Hz
         resistance (float): Resistance in ohms
         inductance (float, optional): Inductance in henries (for RL or RLC filters)
         capacitance (float, optional): Capacitance in farads (for RC or RLC filters)
         filter_type (str): Type of the filter ("RC", "RL", "RLC")
+        frequencies (array, optional): Frequencies in Hz (default: 10 Hz to 1 MHz)
+
+        Return:
+        tuple: (frequencies in Hz, gain in dB, phase in degrees)
         """
-        frequencies = np.logspace(1, 6, 500)  # Frequency range: 10 Hz to 1 MHz
+        if frequencies is None:
+            frequencies = np.logspace(1, 6, 500)  # Frequency range: 10 Hz to 1 MHz
+        frequencies = np.asarray(frequencies, dtype=float)
         omega = 2 * np.pi * frequencies
 
         if filter_type == "RC":
@@ -103,7 +109,6 @@ class HighPassFilter:
             phase = np.arctan(
                 1 / (omega * resistance * capacitance)
             )  # Phase in radians
-            title = "Filtre Passe-Haut RC"
 
         elif filter_type == "RL":
             if inductance is None:
@@ -112,7 +117,6 @@ class HighPassFilter:
                 1 + (omega * inductance / resistance) ** 2
             )
             phase = np.arctan(resistance / (omega * inductance))  # Phase in radians
-            title = "Filtre Passe-Haut RL"
 
         elif filter_type == "RLC":
             if inductance is None or capacitance is None:
@@ -132,33 +136,44 @@ class HighPassFilter:
                 (omega * resistance * capacitance)
                 / (1 - omega**2 * inductance * capacitance)
             )  # Phase in radians
-            title = "Filtre Passe-Haut RLC"
 
         else:
             raise ValueError("Invalid filter type. Choose 'RC', 'RL', or 'RLC'.")
 
-        # Plot the amplitude response
-        plt.figure(figsize=(10, 6))
-        plt.subplot(2, 1, 1)
-        plt.semilogx(frequencies, 20 * np.log10(gain), label="Gain")
-        plt.axvline(
-            cutoff_frequency, color="red", linestyle="--", label="Fréquence de coupure"
+        return frequencies, 20 * np.log10(gain), np.degrees(phase)
+
+    @staticmethod
+    def bode_plot(
+        cutoff_frequency,
+        resistance,
+        inductance=None,
+        capacitance=None,
+        filter_type="RC",
+        path=None,
+    ):
+        """
+        Plot the Bode diagram (gain and phase) for high-pass RC, RL, and RLC filters.
+
+        Parameters:
+        cutoff_frequency (float): Desired cutoff frequency in Hz
+        resistance (float): Resistance in ohms
+        inductance (float, optional): Inductance in henries (for RL or RLC filters)
+        capacitance (float, optional): Capacitance in farads (for RC or RLC filters)
+        filter_type (str): Type of the filter ("RC", "RL", "RLC")
+        path (str, optional): Output file; if given, the plot is rendered
+            off-screen to this file instead of being shown
+
+        Return:
+        str or None: path of the written file
+        """
+        frequencies, gain_db, phase_deg = HighPassFilter.bode_response(
+            resistance, inductance, capacitance, filter_type
         )
-        plt.title(f"Diagramme de Bode - {title}")
-        plt.xlabel("Fréquence (Hz)")
-        plt.ylabel("Gain (dB)")
-        plt.grid(which="both", linestyle="--", linewidth=0.5)
-        plt.legend()
-
-        # Plot the phase response
-        plt.subplot(2, 1, 2)
-        plt.semilogx(frequencies, np.degrees(phase), label="Phase", color="orange")
-        plt.axvline(
-            cutoff_frequency, color="red", linestyle="--", label="Fréquence de coupure"
+        return render_bode(
+            frequencies,
+            gain_db,
+            phase_deg,
+            path=path,
+            title=f"Filtre Passe-Haut {filter_type}",
+            marker_frequency=cutoff_frequency,
         )
-        plt.xlabel("Fréquence (Hz)")
-        plt.ylabel("Phase (degrés)")
-        plt.grid(which="both", linestyle="--", linewidth=0.5)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
@@ -1,6 +1,7 @@
 import math
 import numpy as np
-import matplotlib.pyplot as plt
+
+from ..plotting import render_bode
 
 
 class LowPassFilter:
@@ -99,24 +100,29 @@ class LowPassFilter:
         return {"R1": R1, "R2": R2, "C1": C1, "C2": C2}
 
     @staticmethod
-    def bode_plot(
-        cutoff_frequency,
+    def bode_response(
         resistance,
         inductance=None,
         capacitance=None,
         filter_type="RC",
+        frequencies=None,
     ):
         """
-        Plot the Bode diagram (gain and phase) for low-pass RC, RL, and RLC filters.
+        Compute the Bode diagram (gain and phase) for low-pass RC, RL, and RLC filters.
 
         Parameters:
-        cutoff_frequency (float): Desired cutoff frequency in Hz
         resistance (float): Resistance in ohms
         inductance (float, optional): Inductance in henries (for RL or RLC filters)
         capacitance (float, optional): Capacitance in farads (for RC or RLC filters)
         filter_type (str): Type of the filter ("RC", "RL", "RLC")
+        frequencies (array, optional): Frequencies in Hz (default: 10 Hz to 1 MHz)
+
+        Return:
+        tuple: (frequencies in Hz, gain in dB, phase in degrees)
         """
-        frequencies = np.logspace(1, 6, 500)  # Frequency range: 10 Hz to 1 MHz
+        if frequencies is None:
+            frequencies = np.logspace(1, 6, 500)  # Frequency range: 10 Hz to 1 MHz
+        frequencies = np.asarray(frequencies, dtype=float)
         omega = 2 * np.pi * frequencies
 
         if filter_type == "RC":
@@ -124,14 +130,12 @@ class LowPassFilter:
                 raise ValueError("Capacitance must be provided for RC filter.")
             gain = 1 / np.sqrt(1 + (omega * resistance * capacitance) ** 2)
             phase = -np.arctan(omega * resistance * capacitance)  # Phase in radians
-            title = "Filtre Passe-Bas RC"
 
         elif filter_type == "RL":
             if inductance is None:
                 raise ValueError("Inductance must be provided for RL filter.")
             gain = 1 / np.sqrt(1 + ((omega * inductance) / resistance) ** 2)
             phase = -np.arctan((omega * inductance) / resistance)  # Phase in radians
-            title = "Filtre Passe-Bas RL"
 
         elif filter_type == "RLC":
             if inductance is None or capacitance is None:
@@ -147,33 +151,44 @@ class LowPassFilter:
                 (resistance * capacitance * omega)
                 / (1 - omega**2 * inductance * capacitance)
             )
-            title = "Filtre Passe-Bas RLC"
 
         else:
             raise ValueError("Invalid filter type. Choose 'RC', 'RL', or 'RLC'.")
 
-        # Plot the amplitude response
-        plt.figure(figsize=(10, 6))
-        plt.subplot(2, 1, 1)  # Gain plot
-        plt.semilogx(frequencies, 20 * np.log10(gain), label="Gain")
-        plt.axvline(
-            cutoff_frequency, color="red", linestyle="--", label="Fréquence de coupure"
+        return frequencies, 20 * np.log10(gain), np.degrees(phase)
+
+    @staticmethod
+    def bode_plot(
+        cutoff_frequency,
+        resistance,
+        inductance=None,
+        capacitance=None,
+        filter_type="RC",
+        path=None,
+    ):
+        """
+        Plot the Bode diagram (gain and phase) for low-pass RC, RL, and RLC filters.
+
+        Parameters:
+        cutoff_frequency (float): Desired cutoff frequency in Hz
+        resistance (float): Resistance in ohms
+        inductance (float, optional): Inductance in henries (for RL or RLC filters)
+        capacitance (float, optional): Capacitance in farads (for RC or RLC filters)
+        filter_type (str): Type of the filter ("RC", "RL", "RLC")
+        path (str, optional): Output file; if given, the plot is rendered
+            off-screen to this file instead of being shown
+
+        Return:
+        str or None: path of the written file
+        """
+        frequencies, gain_db, phase_deg = LowPassFilter.bode_response(
+            resistance, inductance, capacitance, filter_type
         )
-        plt.title(f"Diagramme de Bode - {title}")
-        plt.xlabel("Fréquence (Hz)")
-        plt.ylabel("Gain (dB)")
-        plt.grid(which="both", linestyle="--", linewidth=0.5)
-        plt.legend()
-
-        # Plot the phase response
-        plt.subplot(2, 1, 2)
-        plt.semilogx(frequencies, np.degrees(phase), label="Phase", color="orange")
-        plt.axvline(
-            cutoff_frequency, color="red", linestyle="--", label="Fréquence de coupure"
+        return render_bode(
+            frequencies,
+            gain_db,
+            phase_deg,
+            path=path,
+            title=f"Filtre Passe-Bas {filter_type}",
+            marker_frequency=cutoff_frequency,
         )
-        plt.xlabel("Fréquence (Hz)")
-        plt.ylabel("Phase (degrés)")
-        plt.grid(which="both", linestyle="--", linewidth=0.5)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
@@ -0,0 +1,80 @@
+import numpy as np
+
+# Rendu des diagrammes de Bode, séparé du calcul de la réponse.
+#
+# Les méthodes bode_response() / response() des filtres retournent les
+# tableaux (freq, magnitude_db, phase_deg) ; render_bode() se charge
+# uniquement de l'affichage. Avec un chemin de fichier, la figure est
+# construite sans pyplot (moteur Agg, non interactif) : aucun affichage
+# n'est requis et rien n'est conservé en mémoire entre deux appels, ce qui
+# permet de générer des milliers de graphes dans des processus de calcul.
+
+
+def render_bode(
+    freq,
+    magnitude_db,
+    phase_deg,
+    path=None,
+    title=None,
+    marker_frequency=None,
+    marker_label="Fréquence de coupure",
+    figsize=(10, 6),
+):
+    """
+    Trace le diagramme de Bode (gain et phase) à partir de tableaux calculés.
+
+    - freq : fréquences (Hz)
+    - magnitude_db, phase_deg : réponse aux fréquences freq
+    - path : fichier de sortie (png, svg, pdf...). Si None, la figure est
+             affichée avec pyplot (bloquant) comme auparavant.
+    - marker_frequency : fréquence marquée d'une ligne verticale (optionnel)
+
+    Retourne path si la figure a été écrite dans un fichier, sinon None.
+    """
+    if path is None:
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=figsize)
+    else:
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=figsize)
+
+    ax_mag, ax_phase = fig.subplots(2, 1, sharex=True)
+
+    # Tracer le gain
+    ax_mag.semilogx(freq, magnitude_db, "b", label="Gain")
+    ax_mag.set_ylabel("Gain (dB)")
+    if title is not None:
+        ax_mag.set_title(f"Diagramme de Bode - {title}")
+
+    # Tracer la phase
+    ax_phase.semilogx(freq, phase_deg, color="orange", label="Phase")
+    ax_phase.set_xlabel("Fréquence (Hz)")
+    ax_phase.set_ylabel("Phase (degrés)")
+
+    for ax in (ax_mag, ax_phase):
+        if marker_frequency is not None:
+            ax.axvline(
+                marker_frequency, color="red", linestyle="--", label=marker_label
+            )
+        ax.grid(which="both", linestyle="--", linewidth=0.5)
+        ax.legend()
+
+    # Ajuster la disposition pour éviter le chevauchement
+    fig.tight_layout()
+
+    if path is None:
+        plt.show()
+        return None
+    fig.savefig(path)
+    return path
+
+
+def log_frequencies(cutoff_frequency, decades, points=500):
+    """Grille logarithmique de +/- decades décades autour de cutoff_frequency (Hz)."""
+    return np.logspace(
+        np.log10(cutoff_frequency) - decades,
+        np.log10(cutoff_frequency) + decades,
+        points,
+    )
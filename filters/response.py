@@ -0,0 +1,148 @@
+import numpy as np
+
+from .snk.sos import stages_to_sos
+
+
+def _as_sos(stages):
+    """Accepte un tableau SOS (..., n_stages, 6) ou une liste d'étages {"sos": ...}."""
+    if isinstance(stages, (list, tuple)) and stages and isinstance(stages[0], dict):
+        stages = stages_to_sos(stages)
+    sos = np.asarray(stages, dtype=float)
+    if sos.ndim == 1:
+        sos = sos[np.newaxis, :]
+    if sos.shape[-1] != 6:
+        raise ValueError("Chaque section doit contenir 6 coefficients.")
+    return sos
+
+
+def _section_parts(sos, freqs):
+    """
+    Parties réelles et imaginaires des numérateurs et dénominateurs en s = jw.
+
+    Retourne 4 tableaux de forme (..., n_stages, n_freqs).
+    """
+    w = 2 * np.pi * np.asarray(freqs, dtype=float)[..., np.newaxis, :]
+    w2 = w * w
+    b2, b1, b0, a2, a1, a0 = (sos[..., k, np.newaxis] for k in range(6))
+    return b0 - b2 * w2, b1 * w, a0 - a2 * w2, a1 * w
+
+
+def _magnitude_db(num_re, num_im, den_re, den_im):
+    return 10 * np.log10((num_re**2 + num_im**2) / (den_re**2 + den_im**2)).sum(axis=-2)
+
+
+def magnitude_response(stages, freqs):
+    """
+    Gain (dB) seul, mêmes entrées que frequency_response().
+
+    Évite le calcul et le déroulement de la phase lorsque seul le gain est
+    utile (recherche de coupure sur de grands lots de conceptions).
+    """
+    sos = _as_sos(stages)
+    return _magnitude_db(*_section_parts(sos, freqs))
+
+
+def frequency_response(stages, freqs):
+    """
+    Calcule le gain (dB) et la phase (degrés) d'une ou plusieurs cascades.
+
+    - stages : tableau SOS (n_stages x 6), lot de conceptions
+               (n_designs x n_stages x 6) ou liste d'étages {"sos": ...}
+    - freqs : fréquences d'évaluation (Hz), grille commune (n_freqs,) ou
+              propre à chaque conception (..., n_freqs)
+
+    Chaque section est évaluée directement à partir de ses coefficients,
+    avec diffusion sur toutes les conceptions et toutes les fréquences.
+    La phase de chaque section est continue sur la grille ; les phases sont
+    ensuite additionnées, ce qui donne la phase déroulée de la cascade
+    (par ex. -360° au-delà de la coupure pour un passe-bas d'ordre 4).
+
+    Retourne (magnitude_db, phase_deg) de forme (..., n_freqs).
+    """
+    sos = _as_sos(stages)
+    num_re, num_im, den_re, den_im = _section_parts(sos, freqs)
+    magnitude_db = _magnitude_db(num_re, num_im, den_re, den_im)
+
+    phase = np.arctan2(num_im, num_re) - np.arctan2(den_im, den_re)
+    if phase.shape[-1] > 1:
+        phase = np.unwrap(phase, axis=-1)
+    phase_deg = np.degrees(phase.sum(axis=-2))
+    return magnitude_db, phase_deg
+
+
+def group_delay(stages, freqs):
+    """
+    Temps de propagation de groupe (s) d'une ou plusieurs cascades.
+
+    Mêmes entrées que frequency_response(). Le retard est calculé exactement
+    à partir des coefficients : pour P(jw) = p0 - p2 w^2 + j p1 w,
+        d arg P / dw = p1 (p0 + p2 w^2) / |P(jw)|^2
+    et le retard d'une section vaut d arg D / dw - d arg N / dw. Les retards
+    des sections s'additionnent, sans dérivation numérique de la phase.
+    Un numérateur nul (passe-haut en w = 0) ne contribue pas.
+
+    Retourne un tableau (..., n_freqs).
+    """
+    sos = _as_sos(stages)
+    w2 = (2 * np.pi * np.asarray(freqs, dtype=float)[..., np.newaxis, :]) ** 2
+    b2, b1, b0, a2, a1, a0 = (sos[..., k, np.newaxis] for k in range(6))
+    den_re = a0 - a2 * w2
+    delay = a1 * (a0 + a2 * w2)
+    delay /= den_re * den_re + a1 * a1 * w2
+    # Numérateurs des cellules du projet (1, s RC, s^2 R1R2C1C2) : phase
+    # constante, terme nul que l'on ne calcule que pour une section quelconque
+    if np.any((b1 != 0) & ((b0 != 0) | (b2 != 0))):
+        num_re = b0 - b2 * w2
+        num_power = num_re * num_re + b1 * b1 * w2
+        num_slope = b1 * (b0 + b2 * w2)
+        delay -= np.divide(
+            num_slope, num_power, out=np.zeros(delay.shape), where=num_power != 0
+        )
+    return delay.sum(axis=-2)
+
+
+def _secant(x0, d0, x1, d1):
+    """Zéro de la droite passant par (x0, d0) et (x1, d1), x0 si d0 == d1."""
+    step = d0 - d1
+    t = np.divide(d0, step, out=np.zeros_like(step), where=step != 0)
+    return x0 + t * (x1 - x0)
+
+
+def cutoff_error(ideal_sos, actual_sos, cutoff_frequency, span=0.5, points=201):
+    """
+    Erreur relative sur la fréquence de coupure d'une réalisation.
+
+    La coupure réelle est la fréquence, la plus proche de cutoff_frequency
+    et à +/- span décade, où actual_sos atteint le gain qu'a ideal_sos à
+    cutoff_frequency (-3 dB pour Butterworth, -ondulation pour Tchebychev).
+    Les cascades peuvent être des lots (n, n_stages, 6) avec une coupure par
+    conception. NaN si le gain n'est pas atteint dans l'intervalle.
+    """
+    cutoff = np.asarray(cutoff_frequency, dtype=float)[..., np.newaxis]
+    level = magnitude_response(ideal_sos, cutoff)
+    freqs = cutoff * np.logspace(-span, span, points)
+    mag = magnitude_response(actual_sos, freqs)
+
+    # Passages par le niveau de référence, interpolés en log(f)
+    diff = mag - level
+    log_f = np.broadcast_to(np.log(freqs), diff.shape)
+    x0, x1 = log_f[..., :-1], log_f[..., 1:]
+    d0, d1 = diff[..., :-1], diff[..., 1:]
+    log_cross = _secant(x0, d0, x1, d1)
+    distance = np.where(d0 * d1 <= 0, np.abs(log_cross - np.log(cutoff)), np.inf)
+
+    # Intervalle retenu, affiné par fausse position sur la réponse exacte
+    nearest = np.argmin(distance, axis=-1)[..., np.newaxis]
+    found = np.isfinite(np.take_along_axis(distance, nearest, axis=-1))
+    x0, d0, x1, d1 = (np.take_along_axis(a, nearest, axis=-1) for a in (x0, d0, x1, d1))
+    for _ in range(2):
+        xm = _secant(x0, d0, x1, d1)
+        dm = magnitude_response(actual_sos, np.exp(xm)) - level
+        left = d0 * dm <= 0
+        x0, d0 = np.where(left, x0, xm), np.where(left, d0, dm)
+        x1, d1 = np.where(left, xm, x1), np.where(left, dm, d1)
+    log_cut = _secant(x0, d0, x1, d1)
+    error = np.where(found, np.exp(log_cut - np.log(cutoff)) - 1, np.nan)[..., 0]
+    if error.ndim == 0:
+        return float(error)
+    return error
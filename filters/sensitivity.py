@@ -0,0 +1,110 @@
+import numpy as np
+
+from .snk.cascade import COMPONENTS
+from .snk.sos import section_parameters, stage_damping, stage_section
+
+# Sensibilités analytiques d'une cascade Sallen-Key à gain unitaire.
+#
+# La sensibilité de y à x est S = d ln(y) / d ln(x) : variation relative de y
+# pour une variation relative unitaire de x. Avec omega0 = 1 / sqrt(R1R2C1C2) :
+#   - S(omega0, x) = -1/2 pour les quatre composants (-1 pour R et C d'une
+#     cellule du premier ordre)
+#   - montage "sum_r" (passe-bas par défaut), Q = sqrt(R1R2C1C2) / ((R1 + R2) C2) :
+#       S(Q, R1) = -S(Q, R2) = (R2 - R1) / (2 (R1 + R2))
+#       S(Q, C1) = -S(Q, C2) = 1/2
+#   - montage "sum_c" (passe-haut, passe-bas de tchebychev),
+#     Q = sqrt(R1R2C1C2) / (R1 (C1 + C2)) :
+#       S(Q, C1) = -S(Q, C2) = (C2 - C1) / (2 (C1 + C2))
+#       S(Q, R2) = -S(Q, R1) = 1/2
+# Le montage de chaque étage est stage["damping"] (voir filters.snk.sos).
+#
+# Les résultats sont rangés selon COMPONENTS = (R1, R2, C1, C2) ; R et C d'une
+# cellule du premier ordre occupent les colonnes R1 et C1 (comme dans le
+# moteur de cascade), R2 et C2 ont alors une sensibilité nulle.
+
+
+def _stage_sensitivities(filter_type, stage, shape):
+    """Sensibilités (omega0, Q) d'un étage, deux tableaux shape + (4,)."""
+    params = stage["params"]
+    zero = np.zeros(shape)
+    if "R" in params:
+        return np.stack([zero - 1, zero, zero - 1, zero], -1), np.zeros(shape + (4,))
+    R1, R2, C1, C2 = (np.asarray(params[name], dtype=float) for name in COMPONENTS)
+    half = zero + 0.5
+    if stage_damping(filter_type, stage) == "sum_r":
+        r = zero + (R2 - R1) / (2 * (R1 + R2))
+        q = [r, -r, half, -half]
+    else:
+        c = zero + (C2 - C1) / (2 * (C1 + C2))
+        q = [-half, half, c, -c]
+    return np.stack([-half] * 4, -1), np.stack(q, -1)
+
+
+def component_sensitivities(stages, filter_type):
+    """
+    Sensibilités de omega0 et Q de chaque étage à chacun de ses composants.
+
+    - stages : étages {"params": {...}, ...} retournés par bessel, tchebychev
+               ou butterworth (par ex. lowpass().sallen_key_lowpass(...)) ;
+               les valeurs peuvent être des tableaux (lot de conceptions),
+               stage["damping"] donne le montage de l'étage s'il diffère de
+               celui de filter_type
+    - filter_type : 'lowpass' ou 'highpass'
+
+    Retourne {"omega0": S, "q": S}, deux tableaux (..., n_stages, 4) dont la
+    dernière dimension suit COMPONENTS (R1, R2, C1, C2).
+    """
+    if filter_type not in ["lowpass", "highpass"]:
+        raise ValueError("filter_type doit être 'lowpass' ou 'highpass'.")
+    # Forme commune du lot de conceptions
+    shape = np.broadcast_shapes(
+        *(np.shape(value) for stage in stages for value in stage["params"].values())
+    )
+    omega0, q = zip(
+        *(_stage_sensitivities(filter_type, stage, shape) for stage in stages)
+    )
+    return {"omega0": np.stack(omega0, axis=-2), "q": np.stack(q, axis=-2)}
+
+
+def magnitude_sensitivities(stages, filter_type, freqs):
+    """
+    Sensibilités du gain de la cascade à chaque composant, aux fréquences freqs.
+
+    Pour chaque étage, |H| ne dépend que de u = w / omega0 et de Q :
+        passe-bas : |H|^-2 = D = (1 - u^2)^2 + u^2 / Q^2  (1 + u^2 au 1er ordre)
+        passe-haut : |H| = u^k / sqrt(D), k = ordre de l'étage
+    d'où S(|H|, omega0) = (u dD/du) / (2 D) - k (k = 0 en passe-bas) et
+    S(|H|, Q) = u^2 / (Q^2 D), combinées avec component_sensitivities().
+    Un composant n'appartenant qu'à un étage, S(|H_cascade|, x) = S(|H_étage|, x).
+
+    - stages, filter_type : voir component_sensitivities()
+    - freqs : fréquences d'évaluation (Hz)
+
+    Retourne un dict :
+    - "freqs" : fréquences (n_freqs,)
+    - "magnitude" : d ln|H| / d ln x, tableau (..., n_stages, 4, n_freqs) ;
+                    multiplier par 20 / ln(10) pour des dB par unité relative
+    - "total" : sqrt(somme des carrés sur tous les composants), (..., n_freqs),
+                écart-type relatif de |H| pour des tolérances indépendantes
+                d'écart-type relatif unitaire
+    """
+    components = component_sensitivities(stages, filter_type)
+    sos = np.stack([stage_section(filter_type, stage) for stage in stages], axis=-2)
+    omega0, q = section_parameters(sos)
+    freqs = np.asarray(freqs, dtype=float)
+    u2 = (2 * np.pi * freqs / omega0[..., np.newaxis]) ** 2  # (..., n_stages, F)
+    first = (q == 0)[..., np.newaxis]
+    inv_q2 = np.divide(1.0, q**2, out=np.zeros_like(q), where=q != 0)[..., np.newaxis]
+    d = np.where(first, 1 + u2, (1 - u2) ** 2 + u2 * inv_q2)
+    u_dd = np.where(first, 2 * u2, -4 * u2 * (1 - u2) + 2 * u2 * inv_q2)
+    by_omega0 = u_dd / (2 * d)
+    if filter_type == "highpass":
+        by_omega0 -= np.where(first, 1.0, 2.0)
+    by_q = u2 * inv_q2 / d
+
+    magnitude = (
+        by_omega0[..., np.newaxis, :] * components["omega0"][..., np.newaxis]
+        + by_q[..., np.newaxis, :] * components["q"][..., np.newaxis]
+    )
+    total = np.sqrt((magnitude**2).sum(axis=(-3, -2)))
+    return {"freqs": freqs, "magnitude": magnitude, "total": total}
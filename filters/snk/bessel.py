@@ -1,41 +1,73 @@
+from functools import lru_cache
+
 import numpy as np
-from scipy.signal import TransferFunction, bode
-import matplotlib.pyplot as plt
+
+from ..instrumentation import phase, timed
+from ..plotting import render_bode
+from ..response import frequency_response
+from .cascade import cascade_output, cascade_stages, design_cascade, split_pairs
+from .coefficients import stage_coefficients
+from .sos import transfer_function
+
+# Normalisations acceptées pour les pôles de Bessel (voir scipy.signal.besselap) :
+#  - "mag"   : gain de -3 dB à la pulsation normalisée 1 (valeurs du tableau)
+#  - "delay" : temps de propagation de groupe unitaire en continu
+#  - "phase" : asymptotes de phase identiques à celles de Butterworth
+BESSEL_NORMALIZATIONS = ("mag", "delay", "phase")
+
+
+def bessel_poles(order, normalization="mag"):
+    """
+    Calcule les couples (omega0_norm, q0) d'un filtre de Bessel d'ordre quelconque.
+
+    Les pôles sont les racines du polynôme de Bessel inverse, normalisées selon
+    `normalization`. Chaque paire de pôles complexes conjugués p donne une
+    cellule d'ordre 2 avec omega0 = |p| et Q = |p| / (2 * |Re(p)|) ; le pôle
+    réel d'un ordre impair donne la cellule d'ordre 1 (q0 = 0.0).
+
+    Le résultat est conservé dans un cache LRU indexé par (ordre, normalisation),
+    partagé par les classes lowpass et highpass.
+
+    Format de sortie --> ((omega0_norm, q0), ...) trié par Q croissant.
+    """
+    integer = isinstance(order, (int, np.integer)) and not isinstance(order, bool)
+    if not integer or order < 1:
+        raise ValueError(f"L'ordre {order} n'est pas supporté.")
+    if normalization not in BESSEL_NORMALIZATIONS:
+        raise ValueError(
+            f"La normalisation doit être parmi {', '.join(BESSEL_NORMALIZATIONS)}."
+        )
+    return _bessel_poles(int(order), normalization)
+
+
+@lru_cache(maxsize=128)
+def _bessel_poles(order, normalization):
+    # Racines du polynôme de Bessel inverse (méthode d'Aberth de scipy, stable
+    # aux ordres élevés contrairement à np.roots sur la forme développée)
+    from scipy.signal import besselap
+
+    _, poles, _ = besselap(order, norm=normalization)
+
+    stages = []
+    for pole in poles:
+        if pole.imag < 0:
+            continue  # La paire est traitée via son conjugué
+        omega0_norm = float(abs(pole))
+        if pole.imag == 0:
+            stages.append((omega0_norm, 0.0))
+        else:
+            stages.append((omega0_norm, float(omega0_norm / (-2 * pole.real))))
+    return tuple(sorted(stages, key=lambda stage: stage[1]))
 
 
 class lowpass:
-    # Initialisation de la classe Lowpass avec les pôles de Bessel.
-    def __init__(self):
-        self.BESSEL_TABLE = {
-            1: [(1.0, 0.0)],
-            2: [(1.2723, 0.577)],
-            3: [(1.3225, 0.0), (1.4474, 0.691)],
-            4: [(1.431, 0.5219), (1.6043, 0.8055)],
-            5: [(1.5015, 0.0000), (1.5555, 0.5635), (1.7545, 0.9165)],
-            6: [(1.6030, 0.5103), (1.6882, 0.6112), (1.9037, 1.0233)],
-            7: [(1.6840, 0.0000), (1.7160, 0.5324), (1.8221, 0.6608), (2.0491, 1.0233)],
-            8: [(1.7772, 0.5060), (1.8308, 0.5596), (1.9518, 0.7109), (2.1872, 1.2257)],
-            9: [
-                (1.8570, 0.0000),
-                (1.8788, 0.5197),
-                (1.9483, 0.5895),
-                (2.0808, 0.7606),
-                (2.3228, 1.3219),
-            ],
-            10: [
-                (1.9412, 0.5039),
-                (1.9790, 0.5376),
-                (2.0606, 0.6205),
-                (2.2021, 0.8098),
-                (2.4487, 1.4153),
-            ],
-        }
+    # Initialisation de la classe avec la normalisation des pôles de Bessel.
+    def __init__(self, normalization="mag"):
+        self.normalization = normalization
 
     # Retourne les valeurs de pulsation normalisée et de facteur de qualité pour un ordre donné.
     def bessel_q0_omega0(self, order):
-        if order not in self.BESSEL_TABLE:
-            raise ValueError(f"L'ordre {order} n'est pas supporté.")
-        return self.BESSEL_TABLE[order]
+        return bessel_poles(order, self.normalization)
 
     # Calcule un filtre passe-bas de premier ordre.
     def first_order_lowpass(self, cutoff_freq, r=None, c=None, omega0_norm=None):
@@ -53,7 +85,7 @@ class lowpass:
 
         num = [1.0]
         den = [r * c, 1.0]
-        return TransferFunction(num, den), {"R": r, "C": c}
+        return transfer_function(num, den), {"R": r, "C": c}
 
     # Calcule un filtre passe-bas de second ordre avec la cellule Sallen-Key.
     def sallen_key_lowpass(
@@ -95,7 +127,7 @@ class lowpass:
             den = [r11 * r21 * c1 * c2, (r11 + r21) * c2, 1.0]
             # den2 = [r12 * r22 * c1 * c2,(r12 + r22) * c2,1.0]
 
-            tf = TransferFunction(num, den)
+            tf = transfer_function(num, den)
             #  tf2 = TransferFunction(num, den2)
 
             return [
@@ -113,131 +145,80 @@ class lowpass:
             num = [1.0]
             den = [r1 * r2 * c1 * c2, (r1 + r2) * c2, 1.0]
 
-            tf = TransferFunction(num, den)
+            tf = transfer_function(num, den)
             return [{"tf": tf, "params": {"R1": r1, "R2": r2, "C1": c1, "C2": c2}}]
         else:
             raise ValueError("Veuillez fournir soit (C1, C2), soit (R1, R2).")
 
     # Calcule un filtre passe-bas de n'importe quel ordre en utilisant des cellules en cascade.
     # Permet de choisir entre spécifier les résistances ou les condensateurs.
-    def components(self, order, cutoff_freq, r_vals=None, c_vals=None):
-        if order not in self.BESSEL_TABLE:
-            raise ValueError(f"L'ordre {order} n'est pas supporté.")
-
-        poles = self.bessel_q0_omega0(order)
-        stages = []
-        num_combined, den_combined = [1], [1]
-
-        # Calculer le nombre d'éléments nécessaires
-        num_stages = order // 2 + (order % 2)
-        num_elements = 2 * num_stages
-
-        if r_vals is None and c_vals is None:
-            raise ValueError(
-                "Veuillez fournir soit les résistances (r_vals), soit les condensateurs (c_vals)."
+    # Avec output="sos", retourne le tableau des sections (n_stages x 6) à la
+    # place de la fonction de transfert combinée.
+    @timed("bessel.lowpass.components")
+    def components(self, order, cutoff_freq, r_vals=None, c_vals=None, output="tf"):
+        with phase("validation"):
+            if output not in ["tf", "sos"]:
+                raise ValueError("output doit être 'tf' ou 'sos'.")
+            # Étages lus dans la table partagée (filters.snk.coefficients)
+            omega0, q = stage_coefficients(
+                "bessel", order, normalization=self.normalization
             )
-
-        if r_vals is None:
-            r_vals = [None] * num_elements
-        if c_vals is None:
-            c_vals = [None] * num_elements
-
-        # Vérification de la longueur des listes
-        if len(r_vals) < num_elements:
-            r_vals.extend([None] * (num_elements - len(r_vals)))
-        if len(c_vals) < num_elements:
-            c_vals.extend([None] * (num_elements - len(c_vals)))
-
-        # Parcourir les pôles pour construire les étapes
-        for i, (omega0_norm, q0) in enumerate(poles):
-            if q0 == 0.0:  # Premier ordre
-                tf, params = self.first_order_lowpass(
-                    cutoff_freq, r=r_vals[i], c=c_vals[i], omega0_norm=omega0_norm
-                )
-            else:  # Deuxième ordre
-                idx = 2 * i
-                tf_data = self.sallen_key_lowpass(
-                    order=2,
-                    cutoff_freq=cutoff_freq,
-                    r1=r_vals[idx],
-                    r2=r_vals[idx + 1],
-                    c1=c_vals[idx],
-                    c2=c_vals[idx + 1],
-                    omega0_norm=omega0_norm,
-                    q0=q0,
+            poles = np.column_stack([omega0, q])
+            if r_vals is None and c_vals is None:
+                raise ValueError(
+                    "Veuillez fournir soit les résistances (r_vals), soit les condensateurs (c_vals)."
                 )
-                tf = tf_data[0]["tf"]
-                params = tf_data[0]["params"]
-
-            # Mise à jour de la fonction de transfert combinée
-            num_combined = np.polymul(num_combined, tf.num)
-            den_combined = np.polymul(den_combined, tf.den)
 
-            # Ajouter les informations de l'étape
-            stages.append({"tf": tf, "params": params})
-
-        # Fonction de transfert combinée
-        combined_tf = TransferFunction(num_combined, den_combined)
-        return combined_tf, stages
+        # Deux emplacements de composants par étage (le second est ignoré
+        # pour la cellule du premier ordre)
+        R1, R2 = split_pairs(r_vals, q, layout="paired")
+        C1, C2 = split_pairs(c_vals, q, layout="paired")
+        # Les condensateurs imposés sont prioritaires (étages du second ordre)
+        components, sos = design_cascade(
+            poles, "lowpass", cutoff_freq, R1, R2, C1, C2, prefer="C"
+        )
+        return cascade_output(sos, cascade_stages(q, components, sos), output)
         # Affiche le diagramme de Bode pour un filtre donné.
 
-    def graphs(self, order, cutoff_freq, r_vals=None, c_vals=None):
-        combined_tf, _ = self.components(order, cutoff_freq, r_vals, c_vals)
-        w = np.logspace(2, 5, 400)
-        w, mag, phase = bode(combined_tf, w=w)
-        freq_hz = w / (2 * np.pi)
-
-        fig_lp, (ax_mag_lp, ax_phase_lp) = plt.subplots(
-            2, 1, figsize=(8, 6), sharex=True
+    def response(self, order, cutoff_freq, r_vals=None, c_vals=None, freqs=None):
+        """
+        Calcule le diagramme de Bode sans rien afficher.
+
+        freqs : fréquences d'évaluation (Hz), par défaut 10^2 à 10^5 rad/s
+        Retourne (freq, magnitude_db, phase_deg).
+        """
+        sos, _ = self.components(order, cutoff_freq, r_vals, c_vals, output="sos")
+        if freqs is None:
+            freqs = np.logspace(2, 5, 400) / (2 * np.pi)
+        freqs = np.asarray(freqs, dtype=float)
+        mag, phase = frequency_response(sos, freqs)
+        return freqs, mag, phase
+
+    def graphs(self, order, cutoff_freq, r_vals=None, c_vals=None, path=None):
+        """
+        Affiche le diagramme de Bode, ou l'écrit dans le fichier path sans
+        affichage (moteur non interactif) si path est donné.
+        """
+        freq_hz, mag, phase = self.response(order, cutoff_freq, r_vals, c_vals)
+        return render_bode(
+            freq_hz,
+            mag,
+            phase,
+            path=path,
+            title=f"Bessel Passe-Bas ordre {order}",
+            marker_frequency=cutoff_freq,
         )
-        ax_mag_lp.semilogx(freq_hz, mag, "b")
-        ax_mag_lp.set_ylabel("Magnitude (dB)")
-
-        ax_phase_lp.semilogx(freq_hz, phase, "r")
-        ax_phase_lp.set_xlabel("Frequency (Hz)")
-        ax_phase_lp.set_ylabel("Phase (deg)")
-        ax_phase_lp.grid(True)
-        ax_mag_lp.grid(True)
-
-        plt.tight_layout()
-        plt.show()
 
 
 class highpass:
-    # Initialisation de la classe Lowpass avec les pôles de Bessel.
-    def __init__(self):
-
-        self.BESSEL_TABLE = {
-            1: [(1.0, 0.0)],
-            2: [(1.2723, 0.577)],
-            3: [(1.3225, 0.0), (1.4474, 0.691)],
-            4: [(1.431, 0.5219), (1.6043, 0.8055)],
-            5: [(1.5015, 0.0000), (1.5555, 0.5635), (1.7545, 0.9165)],
-            6: [(1.6030, 0.5103), (1.6882, 0.6112), (1.9037, 1.0233)],
-            7: [(1.6840, 0.0000), (1.7160, 0.5324), (1.8221, 0.6608), (2.0491, 1.0233)],
-            8: [(1.7772, 0.5060), (1.8308, 0.5596), (1.9518, 0.7109), (2.1872, 1.2257)],
-            9: [
-                (1.8570, 0.0000),
-                (1.8788, 0.5197),
-                (1.9483, 0.5895),
-                (2.0808, 0.7606),
-                (2.3228, 1.3219),
-            ],
-            10: [
-                (1.9412, 0.5039),
-                (1.9790, 0.5376),
-                (2.0606, 0.6205),
-                (2.2021, 0.8098),
-                (2.4487, 1.4153),
-            ],
-        }
+    # Initialisation de la classe avec la normalisation des pôles de Bessel.
+    def __init__(self, normalization="mag"):
+        self.normalization = normalization
 
     # Retourne les valeurs de pulsation normalisée et de facteur de qualité pour un ordre donné.
     def bessel_q0_omega0(self, order):
 
-        if order not in self.BESSEL_TABLE:
-            raise ValueError(f"L'ordre {order} n'est pas supporté.")
-        return self.BESSEL_TABLE[order]  # Retourne tous les pôles
+        return bessel_poles(order, self.normalization)  # Retourne tous les pôles
 
     def first_order_highpass(self, cutoff_freq, r=None, c=None, omega0_norm=None):
         # Calcule un filtre du premier ordre.
@@ -253,7 +234,7 @@ class highpass:
         num = [r * c, 0]
         den = [r * c, 1.0]
 
-        return TransferFunction(num, den), {"R": r, "C": c}
+        return transfer_function(num, den), {"R": r, "C": c}
 
     # Calcule la fonction de transfert Sallen-Key pour un filtre passe-haut Bessel.
     def sallen_key_highpass(
@@ -295,8 +276,8 @@ class highpass:
             den1 = [r1 * r2 * c11 * c21, (r1 * c11 + r1 * c21), 1.0]
             den2 = [r1 * r2 * c12 * c22, (r1 * c12 + r1 * c22), 1.0]
 
-            tf1 = TransferFunction(num1, den1)
-            tf2 = TransferFunction(num2, den2)
+            tf1 = transfer_function(num1, den1)
+            tf2 = transfer_function(num2, den2)
 
             return [
                 {"tf": tf1, "params": {"R1": r1, "R2": r2, "C1": c11, "C2": c21}},
@@ -310,7 +291,7 @@ class highpass:
             num = [r1 * r2 * c1 * c2, 0, 0]
             den = [r1 * r2 * c1 * c2, (r1 * c1 + r1 * c2), 1.0]
 
-            tf = TransferFunction(num, den)
+            tf = transfer_function(num, den)
             return [
                 {"tf": tf, "params": {"R1": r1, "R2": r2, "C1": c1, "C2": c2}},
             ]
@@ -319,73 +300,54 @@ class highpass:
             raise ValueError("Veuillez fournir soit (R1, R2), soit (C1, C2).")
 
     # Calcule un filtre passe-haut de n'importe quel ordre en utilisant des cellules en cascade.
-    def components(self, order, cutoff_freq, r_vals=None, c_vals=None):
-
-        if order not in self.BESSEL_TABLE:
-            raise ValueError(f"L'ordre {order} n'est pas supporté.")
-
-        poles = self.bessel_q0_omega0(order)
-        stages = []
-        num_combined, den_combined = [1], [1]
-
-        num_stages = order // 2 + (order % 2)
-        num_elements = 2 * num_stages
-
-        if r_vals is None:
-            r_vals = [None] * num_elements
-        if c_vals is None:
-            c_vals = [None] * num_elements
-
-        if len(r_vals) < num_elements:
-            r_vals.extend([None] * (num_elements - len(r_vals)))
-        if len(c_vals) < num_elements:
-            c_vals.extend([None] * (num_elements - len(c_vals)))
-
-        for i, (omega0_norm, q0) in enumerate(poles):
-            if q0 == 0.0:
-                tf, params = self.first_order_highpass(
-                    cutoff_freq, r=r_vals[i], c=c_vals[i], omega0_norm=omega0_norm
-                )
-            else:
-                idx = 2 * i
-                tf_data = self.sallen_key_highpass(
-                    order=2,
-                    cutoff_freq=cutoff_freq,
-                    r1=r_vals[idx],
-                    r2=r_vals[idx + 1],
-                    c1=c_vals[idx],
-                    c2=c_vals[idx + 1],
-                    omega0_norm=omega0_norm,
-                    q0=q0,
-                )
-                tf = tf_data[0]["tf"]
-                params = tf_data[0]["params"]
-                print(tf)
-
-            num_combined = np.polymul(num_combined, tf.num)
-            den_combined = np.polymul(den_combined, tf.den)
-            stages.append({"tf": tf, "params": params})
-
-        combined_tf = TransferFunction(num_combined, den_combined)
-        print(combined_tf)
-        return combined_tf, stages
-
-    def graphs(self, order, cutoff_freq, r_vals=None, c_vals=None):
-        combined_tf, _ = self.components(order, cutoff_freq, r_vals, c_vals)
-        w2 = np.logspace(2, 6, 500)
-        w2, mag2, phase2 = bode(combined_tf, w=w2)
-        freq_hz2 = w2 / (2 * np.pi)
-
-        fig_hp, (ax_mag_hp, ax_phase_hp) = plt.subplots(
-            2, 1, figsize=(8, 6), sharex=True
+    # Avec output="sos", retourne le tableau des sections (n_stages x 6) à la
+    # place de la fonction de transfert combinée.
+    @timed("bessel.highpass.components")
+    def components(self, order, cutoff_freq, r_vals=None, c_vals=None, output="tf"):
+        with phase("validation"):
+            if output not in ["tf", "sos"]:
+                raise ValueError("output doit être 'tf' ou 'sos'.")
+            # Étages lus dans la table partagée (filters.snk.coefficients)
+            omega0, q = stage_coefficients(
+                "bessel", order, normalization=self.normalization
+            )
+            poles = np.column_stack([omega0, q])
+
+        # Deux emplacements de composants par étage (le second est ignoré
+        # pour la cellule du premier ordre)
+        R1, R2 = split_pairs(r_vals, q, layout="paired")
+        C1, C2 = split_pairs(c_vals, q, layout="paired")
+        # Les résistances imposées sont prioritaires
+        components, sos = design_cascade(
+            poles, "highpass", cutoff_freq, R1, R2, C1, C2, prefer="R"
+        )
+        return cascade_output(sos, cascade_stages(q, components, sos), output)
+
+    def response(self, order, cutoff_freq, r_vals=None, c_vals=None, freqs=None):
+        """
+        Calcule le diagramme de Bode sans rien afficher.
+
+        freqs : fréquences d'évaluation (Hz), par défaut 10^2 à 10^6 rad/s
+        Retourne (freq, magnitude_db, phase_deg).
+        """
+        sos, _ = self.components(order, cutoff_freq, r_vals, c_vals, output="sos")
+        if freqs is None:
+            freqs = np.logspace(2, 6, 500) / (2 * np.pi)
+        freqs = np.asarray(freqs, dtype=float)
+        mag, phase = frequency_response(sos, freqs)
+        return freqs, mag, phase
+
+    def graphs(self, order, cutoff_freq, r_vals=None, c_vals=None, path=None):
+        """
+        Affiche le diagramme de Bode, ou l'écrit dans le fichier path sans
+        affichage (moteur non interactif) si path est donné.
+        """
+        freq_hz, mag, phase = self.response(order, cutoff_freq, r_vals, c_vals)
+        return render_bode(
+            freq_hz,
+            mag,
+            phase,
+            path=path,
+            title=f"Bessel Passe-Haut ordre {order}",
+            marker_frequency=cutoff_freq,
         )
-        ax_mag_hp.semilogx(freq_hz2, mag2, "b")
-        ax_mag_hp.set_ylabel("Magnitude (dB)")
-
-        ax_phase_hp.semilogx(freq_hz2, phase2, "r")
-        ax_phase_hp.set_xlabel("Frequency (Hz)")
-        ax_phase_hp.set_ylabel("Phase (deg)")
-        ax_phase_hp.grid(True)
-        ax_mag_hp.grid(True)
-        plt.tight_layout()
-        plt.show()
@@ -1,24 +1,241 @@
+from functools import cache
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.signal import TransferFunction, bode
 
+from ..instrumentation import timed
+from ..plotting import log_frequencies, render_bode
+from ..response import frequency_response
+from .cascade import cascade_sections, solve_stages, split_pairs
+from .coefficients import stage_coefficients
+from .sos import section_parameters
+
+
+@cache
+def butterworth_q_values(order):
+    """
+    Calcule les facteurs de qualité des étages d'un filtre Butterworth normalisé.
+
+    Les pôles de Butterworth sont répartis sur le cercle unité avec les angles
+    theta_k = (2k - 1) * pi / (2n), ce qui donne pour chaque paire de pôles
+    Q_k = 1 / (2 * sin(theta_k)). Toutes les pulsations normalisées valent 1.
+
+    Le résultat est mémorisé dans un cache partagé par tous les objets :
+    un ordre déjà calculé ne coûte plus rien.
+
+    Format de sortie --> (Q1, Q2, ..., Qx) trié par Q croissant, avec 0.0 en
+    premier pour la cellule du premier ordre si l'ordre est impair.
+    """
+    integer = isinstance(order, (int, np.integer)) and not isinstance(order, bool)
+    if not integer or order < 1:
+        raise ValueError(f"L'ordre {order} n'est pas supporté.")
+
+    k = np.arange(order // 2, 0, -1)
+    q_values = 1 / (2 * np.sin((2 * k - 1) * np.pi / (2 * order)))
+    first_order = (0.0,) if order % 2 else ()
+    return first_order + tuple(float(q) for q in q_values)
+
+
+@timed("validation")
+def _check_component_list(order, values):
+    """
+    Vérifie la liste de composants fournie pour un filtre d'ordre donné.
+
+    Reprend les contrôles historiques de components() (taille et type des
+    éléments) afin de conserver les mêmes messages d'erreur.
+    """
+    nbr_elements = len(values)
+    if order == 1:
+        if nbr_elements != 1:
+            raise ValueError("Pour le 1er ordre veuillez mettre un seul élément.")
+    elif nbr_elements != order:
+        raise ValueError(f"Veuillez mettre {order} éléments dans la liste.")
+    for x in values:
+        # Verifier que chaque élément est du type int ou float
+        if not isinstance(x, (int, float)):
+            raise ValueError("Veuillez insérer des int ou float.")
+
+
+def _batch_inputs(order, cutoff_frequencies, values):
+    """
+    Met en forme les entrées du mode batch.
+
+    Retourne les pulsations (n, 1) et les composants (n, order) en float64.
+    Une fréquence scalaire ou une seule liste de composants sont diffusées
+    sur toutes les conceptions.
+    """
+    cutoff_frequencies = np.asarray(cutoff_frequencies, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if cutoff_frequencies.ndim > 1:
+        raise ValueError("Les fréquences de coupure doivent former un tableau 1-D.")
+    if values.ndim not in (1, 2) or values.shape[-1] != order:
+        raise ValueError(f"Veuillez mettre {order} éléments par conception.")
+    nbr_designs = max(
+        cutoff_frequencies.size if cutoff_frequencies.ndim else 1,
+        values.shape[0] if values.ndim == 2 else 1,
+    )
+    try:
+        cutoff_frequencies = np.broadcast_to(cutoff_frequencies, (nbr_designs,))
+        values = np.broadcast_to(values, (nbr_designs, order))
+    except ValueError:
+        raise ValueError(
+            "Le nombre de fréquences de coupure et de listes de composants diffère."
+        ) from None
+    # Calcul de W0 pour chaque conception
+    pulsations_W0 = (2 * np.pi * cutoff_frequencies)[:, np.newaxis]
+    return pulsations_W0, values
+
+
+def _stage_q(order, q_values=None):
+    """Facteurs de qualité de tous les étages, 0 pour la cellule du premier ordre."""
+    if q_values is None:
+        # Étages lus dans la table partagée (filters.snk.coefficients)
+        return stage_coefficients("butterworth", order)[1]
+    return (0.0,) * (order % 2) + tuple(q_values)
+
+
+@timed("kernel")
+def _butterworth_kernel(filter_type, given, order, pulsations_W0, values, q_values):
+    """
+    Noyau vectorisé commun aux passe-bas et passe-haut Butterworth.
+
+    filter_type : 'lowpass' ou 'highpass'
+    given : 'R' si les résistances sont imposées, 'C' pour les condensateurs
+    pulsations_W0 : tableau (n, 1) des pulsations de coupure
+    values : tableau (n, order) des composants imposés
+    q_values : facteurs de qualité des étages d'ordre 2
+
+    Retourne le tableau (n, order) des composants calculés, dans le même
+    ordre que la sortie scalaire de components().
+    """
+    # Toutes les pulsations propres d'un Butterworth valent W0 : le moteur
+    # commun (filters.snk.cascade) résout tous les étages en une passe
+    q = _stage_q(order, q_values)
+    first, second = split_pairs(values, q, layout="flat")
+    fixed = ("R1", "R2") if given == "R" else ("C1", "C2")
+    solved = solve_stages(
+        filter_type, pulsations_W0, q, **{fixed[0]: first, fixed[1]: second}
+    )
+    name_1, name_2 = ("C1", "C2") if given == "R" else ("R1", "R2")
+    if filter_type == "lowpass" and given == "R":
+        # Sortie historique par paires [C2, C1]
+        name_1, name_2 = name_2, name_1
+
+    computed = np.empty_like(values)
+    # Pour un ordre impair, le premier étage est une cellule RC du premier ordre
+    offset = order % 2
+    if offset:
+        computed[:, 0] = solved["C1" if given == "R" else "R1"][:, 0]
+    computed[:, offset::2] = solved[name_1][:, offset:]
+    computed[:, offset + 1 :: 2] = solved[name_2][:, offset:]
+    return computed
+
+
+@timed("sections")
+def _butterworth_sections(filter_type, order, res, condo, swap_c=False):
+    """
+    Construit les sections SOS (n, nbr_étages, 6) à partir des composants.
+
+    res / condo : tableaux (n, order) au format de components()
+    swap_c : True lorsque les condensateurs sont sortis par paires [C2, C1]
+             (passe-bas calculé à partir des résistances)
+    """
+    q = _stage_q(order)
+    R1, R2 = split_pairs(res, q, layout="flat")
+    C1, C2 = split_pairs(condo, q, layout="flat")
+    if swap_c:
+        # La cellule du premier ordre garde son unique condensateur
+        first = np.asarray(q) == 0
+        C1, C2 = np.where(first, C1, C2), np.where(first, C2, C1)
+    return cascade_sections(filter_type, q, {"R1": R1, "R2": R2, "C1": C1, "C2": C2})
+
+
+def _butterworth_stages(order, res, condo, sections, swap_c=False):
+    """Regroupe les composants d'une conception par étage, comme bessel/tchebychev."""
+    offset = order % 2
+    stages = []
+    if offset:
+        stages.append({"params": {"R": res[0], "C": condo[0]}, "sos": sections[0]})
+    for y in range(order // 2):
+        idx = offset + 2 * y
+        c1, c2 = condo[idx], condo[idx + 1]
+        if swap_c:
+            c1, c2 = c2, c1
+        params = {"R1": res[idx], "R2": res[idx + 1], "C1": c1, "C2": c2}
+        stages.append({"params": params, "sos": sections[offset + y]})
+    return stages
+
+
+def _single_design(designer, order, cutoff_frequency, res_values, condo_values):
+    """
+    Valide une conception scalaire puis la calcule avec le noyau batch.
+
+    Retourne ({"R": (1, order), "C": (1, order)}, True si les résistances
+    sont imposées).
+    """
+    # Verifie que une frequence de coupure à été donnée
+    if cutoff_frequency is None:
+        raise ValueError("Veuillez fournir une fréquence de coupure.")
+    if res_values is not None:
+        _check_component_list(order, res_values)
+        values = designer.components_batch(
+            order, [cutoff_frequency], res_values=[res_values]
+        )
+        return values, True
+    if condo_values is not None:
+        _check_component_list(order, condo_values)
+        values = designer.components_batch(
+            order, [cutoff_frequency], condo_values=[condo_values]
+        )
+        return values, False
+    raise KeyError("Veuillez au moin insérer une liste de composants.")
+
+
+def _graph_sections(designer, filter_type, order, cutoff_frequency, res, condo):
+    """Sections et fréquence de coupure à tracer pour graphs()."""
+    # Verifie que l'ordre du filtre est supporté
+    butterworth_q_values(order)
+    if cutoff_frequency is not None:  # Si une frequence de coupure est donnée
+        if res is None and condo is None:
+            raise KeyError("Veuillez au moin insérer une liste de composants.")
+        # Les condensateurs imposés sont prioritaires
+        if condo is not None:
+            res = None
+        return designer.sos(order, cutoff_frequency, res, condo), cutoff_frequency
+    if res is not None and condo is not None:
+        # Tous les composants sont connus, au format de sortie de components()
+        _check_component_list(order, res)
+        _check_component_list(order, condo)
+        res, condo = np.array([res], float), np.array([condo], float)
+        if filter_type == "lowpass":
+            # components() sort les condensateurs par paires [C2, C1] s'il a
+            # calculé à partir des résistances, [C1, C2] sinon. En passe-bas,
+            # Q <= sqrt(C1 / C2) / 2 : tout étage de Butterworth (Q > 0.5) a
+            # C1 > C2, le plus grand condensateur de chaque paire est C1.
+            pairs = np.sort(condo[0, order % 2 :].reshape(-1, 2), axis=1)
+            condo[0, order % 2 :] = pairs[:, ::-1].ravel()
+        sos = _butterworth_sections(filter_type, order, res, condo)[0]
+        # Pulsation propre de chaque étage, identique pour un Butterworth
+        omega0, _ = section_parameters(sos)
+        return sos, float(np.exp(np.mean(np.log(omega0)))) / (2 * np.pi)
+    raise KeyError(
+        "Veuillez inserer les listes de composants, "
+        + "Ou ajouter une frequence de coupure + une liste de composants."
+    )
+
+
+def _bode_response(sos, order, cutoff_frequency):
+    """Réponse (freq, magnitude_db, phase_deg) d'une cascade SOS autour de la coupure."""
+    # 2 décades de part et d'autre au premier ordre, sinon 10^(stage + 1)
+    # fois la fréquence de coupure
+    decades = 2 if order == 1 else order // 2 + order % 2 + 1
+    # Pour avoir un graphe qui est toujours dans les bonnes plages
+    freq_hz = log_frequencies(cutoff_frequency, decades)
+    mag, phase = frequency_response(sos, freq_hz)
+    return freq_hz, mag, phase
 
-class Butterworth_LowPass:
-    def __init__(self):
-        # Tableau des pulsations et facteurs de qualité des filtres passe-bas normalisés
-        self.BUTTERWORTH_TABLE = {
-            1: [(0.0)],
-            2: [(0.7071)],
-            3: [(0.0), (1.0)],
-            4: [(0.5412), (1.3066)],
-            5: [(0.0), (0.6180), (1.6180)],
-            6: [(0.5176), (0.7071), (1.9319)],
-            7: [(0.0000), (0.5550), (0.8019), (2.2470)],
-            8: [(0.5098), (0.6013), (0.8999), (2.5629)],
-            9: [(0.0000), (0.5321), (0.6527), (1.0), (2.8794)],
-            10: [(0.5062), (0.5612), (0.7071), (1.1013), (3.1962)],
-        }
 
+class Butterworth_LowPass:
+    @timed("butterworth.lowpass.components")
     def components(self, order, cutoff_frequency, res_values=None, condo_values=None):
         """
         Cette fonction calcule les composants manquants pour réaliser le filtre Passe-Bas voulu.
@@ -28,532 +245,153 @@ class Butterworth_LowPass:
         Format de la liste des condensateurs --> [C1, C2, ..., Cx]
         Format de sortie --> [Composant 1, Composant 2, ..., Composant x]
         """
-        # Verifie si l'ordre du filtre est dans le dictionnaire
-        if order not in self.BUTTERWORTH_TABLE:
-            raise ValueError(f"L'ordre {order} n'est pas supporté.")
+        # Verifie que l'ordre du filtre est supporté
+        butterworth_q_values(order)
+
+        values, res_given = _single_design(
+            self, order, cutoff_frequency, res_values, condo_values
+        )
+        if res_given:
+            computed = values["C"][0]
+            if order == 1:
+                return {"R": res_values[0], "C": float(computed[0])}
+            return {"R": res_values, "C": computed.tolist()}
+        computed = values["R"][0]
+        if order == 1:
+            return {"R": float(computed[0]), "C": condo_values[0]}
+        return {"R": computed.tolist(), "C": condo_values}
 
-        # Verifie que une frequence de coupure à été donnée
-        if cutoff_frequency is None:
-            raise ValueError("Veuillez fournir une fréquence de coupure.")
-        # Calcul de W0
-        pulsation_W0 = 2 * np.pi * cutoff_frequency
+    def components_batch(
+        self, order, cutoff_frequencies, res_values=None, condo_values=None
+    ):
+        """
+        Version vectorisée de components() pour un grand nombre de conceptions.
 
-        if order == 1:
-            # Verifie si une liste à été entrée
-            if res_values is not None:
-                nbr_elements = len(res_values)
-                # Verifie la taille de la liste
-                if nbr_elements > 1 or nbr_elements == 0:
-                    raise ValueError(
-                        "Pour le 1er ordre veuillez mettre une résistance."
-                    )
-                # Verifie le type des données de la liste
-                if isinstance(res_values[0], (int, float)):
-                    # Calcul du composant
-                    condo_value = 1 / (pulsation_W0 * res_values[0])
-                    # Retourne les valeurs calculées
-                    return {"R": res_values[0], "C": condo_value}
-                else:
-                    raise ValueError("Veuillez insérer des valeurs valables.")
-            elif condo_values is not None:
-                # Verifie que l'entrée est du type int ou float
-                nbr_elements = len(condo_values)
-                # Verifie que la liste ne contient qu'1 seul élément
-                if nbr_elements > 1 or nbr_elements == 0:
-                    raise ValueError(
-                        "Pour le 1er ordre veuillez mettre qu'un seul élément."
-                    )
-                if isinstance(condo_values[0], (int, float)):
-                    res_value = 1 / (pulsation_W0 * condo_values[0])
-                    return {"R": res_value, "C": condo_values[0]}
-                else:
-                    raise ValueError("Veuillez insérer des int ou float.")
-            else:
-                raise KeyError("Veuillez au moin insérer une liste de composants.")
-
-        if order >= 2:
-            # Verifie si une liste à été entrée
-            if res_values is not None:
-                nbr_elements = len(res_values)
-                # Verifie si l'ordre est pair
-                # Calcul le nombre d'étages du filtre
-                if order % 2 == 0:
-                    stage = order / 2
-                    # Verifie que la taille de la liste soit conforme
-                    if nbr_elements < (stage * 2) or nbr_elements > (stage * 2):
-                        raise ValueError(
-                            f"Veuillez mettre {stage * 2} éléments dans la liste."
-                        )
-                    for x in res_values:
-                        # Verifier que chaque élément est du type int ou float
-                        if isinstance(x, (int, float)):
-                            None
-                        else:
-                            raise ValueError("Veuillez insérer des int ou float.")
-                    condo_value = []
-                    for y in range(int(stage)):
-                        # Indices pour les résistances
-                        res_start = y * 2
-                        res_end = res_start + 2
-                        current_res = res_values[res_start:res_end]
-                        # Calculs des composants
-                        c = 1 / (
-                            (current_res[0] + current_res[1])
-                            * pulsation_W0
-                            * self.BUTTERWORTH_TABLE[order][y]
-                        )
-                        condo_value.append(c)
-
-                        c = (
-                            (current_res[0] + current_res[1])
-                            * self.BUTTERWORTH_TABLE[order][y]
-                        ) / (current_res[0] * current_res[1] * pulsation_W0)
-                        condo_value.append(c)
-
-                # Verifie si l'ordre est impair
-                elif order % 2 != 0:
-                    stage = order // 2 + 1
-                    # Verifie que la taille de la liste soit conforme
-                    if nbr_elements > (stage * 2 - 1) or nbr_elements < (stage * 2 - 1):
-                        raise ValueError(
-                            f"Veuillez mettre {stage * 2 - 1} éléments dans la liste."
-                        )
-                    for x in res_values:
-                        # Verifier que chaque élément est du type int ou float
-                        if isinstance(x, (int, float)):
-                            None
-                        else:
-                            raise ValueError("Veuillez insérer des int ou float.")
-                    condo_value = []
-                    for y in range(int(stage)):
-                        # Indices pour les résistances
-                        if y == 0:  # Premier stage pour un ordre impair
-                            # Le premier stage utilise une résistance et un condensateur
-                            c1 = 1 / (pulsation_W0 * res_values[0])
-                            condo_value.append(c1)
-                        else:
-                            # Stages suivants avec deux résistances et deux condensateurs
-                            res_start = (y - 1) * 2 + (1 if order % 2 == 1 else 0)
-                            current_res = res_values[res_start : res_start + 2]
-                            c1 = 1 / (
-                                (current_res[0] + current_res[1])
-                                * pulsation_W0
-                                * self.BUTTERWORTH_TABLE[order][y]
-                            )
-                            c2 = (
-                                (current_res[0] + current_res[1])
-                                * self.BUTTERWORTH_TABLE[order][y]
-                            ) / (current_res[0] * current_res[1] * pulsation_W0)
-                            condo_value.extend([c1, c2])
-                return {"R": res_values, "C": condo_value}
-
-            # Verifie si une liste à été entrée
-            if condo_values is not None:
-                nbr_elements = len(condo_values)
-                # Verifie si l'ordre est pair
-                # Calcul le nombre d'étages du filtre
-                if order % 2 == 0:
-                    stage = order / 2
-                    # Verifie que la taille de la liste soit conforme
-                    if nbr_elements < (stage * 2) or nbr_elements > (stage * 2):
-                        raise ValueError(
-                            f"Veuillez mettre {stage * 2} éléments dans la liste."
-                        )
-                    for x in condo_values:
-                        # Verifier que chaque élément est du type int ou float
-                        if isinstance(x, (int, float)):
-                            None
-                        else:
-                            raise ValueError("Veuillez insérer des int ou float.")
-                    res_value = []
-                    for y in range(int(stage)):
-                        c1_idx = y * 2
-                        c2_idx = c1_idx + 1
-                        q0 = self.BUTTERWORTH_TABLE[order][y]
-                        c1, c2 = condo_values[c1_idx], condo_values[c2_idx]
-
-                        # Vérification de la condition
-                        if (
-                            condo_values[c1_idx]
-                            < 4
-                            * condo_values[c2_idx]
-                            * self.BUTTERWORTH_TABLE[order][y] ** 2
-                        ):
-                            raise ValueError(
-                                f"Condition non respectée au stage {y + 1}: C1 ({c1}) >= 4 * C2 ({c2}) * Q0^2 ({q0**2})."
-                            )
-
-                        # Calcul des résistances
-                        j = 1 / (pulsation_W0 * condo_values[c2_idx] * q0)
-                        k = 1 / (
-                            pulsation_W0**2
-                            * condo_values[c1_idx]
-                            * condo_values[c2_idx]
-                        )
-                        discriminant = j**2 - 4 * k
-
-                        if discriminant < 0:
-                            raise ValueError(
-                                "Discriminant négatif : impossible de calculer les résistances."
-                            )
-
-                        r2 = (j + np.sqrt(discriminant)) / 2
-                        r1 = j - r2
-                        res_value.extend([r1, r2])
-                # Verifie si l'ordre est impair
-                # Calcul le nombre d'étages du filtre
-                elif order % 2 != 0:
-                    stage = order // 2 + 1
-                    # Verifie que la taille de la liste soit conforme
-                    if nbr_elements > (stage * 2 - 1) or nbr_elements < (stage * 2 - 1):
-                        raise ValueError(
-                            f"Veuillez mettre {stage * 2 - 1} éléments dans la liste."
-                        )
-                    for x in condo_values:
-                        # Verifier que chaque élément est du type int ou float
-                        if isinstance(x, (int, float)):
-                            None
-                        else:
-                            raise ValueError("Veuillez insérer des int ou float.")
-                    res_value = []
-                    # Calcul des étages d'ordre 2 suivants
-                    for y in range(int(stage)):
-                        c1_idx = y * 2 - 1
-                        c2_idx = c1_idx + 1
-                        q0 = self.BUTTERWORTH_TABLE[order][y]
-                        c1, c2 = condo_values[c1_idx], condo_values[c2_idx]
-                        # Calcul des résistances
-                        if y == 0:
-                            # Calcul du premier étage
-                            r1 = 1 / (pulsation_W0 * condo_values[0])
-                            res_value.append(r1)
-                        elif y > 0:
-                            # Vérification de la condition
-                            if (
-                                condo_values[c1_idx]
-                                < 4
-                                * condo_values[c2_idx]
-                                * self.BUTTERWORTH_TABLE[order][y] ** 2
-                            ):
-                                raise ValueError(
-                                    f"Condition non respectée au stage {y + 1}: C1 ({c1}) >= 4 * C2 ({c2}) * Q0^2 ({q0**2})."
-                                )
-                            j = 1 / (pulsation_W0 * condo_values[c2_idx] * q0)
-                            k = 1 / (
-                                pulsation_W0**2
-                                * condo_values[c1_idx]
-                                * condo_values[c2_idx]
-                            )
-                            discriminant = j**2 - 4 * k
-
-                            if discriminant < 0:
-                                raise ValueError(
-                                    "Discriminant négatif : impossible de calculer les résistances."
-                                )
-
-                            r2 = (j + np.sqrt(discriminant)) / 2
-                            r1 = j - r2
-                            res_value.extend([r1, r2])
-                return {"R": res_value, "C": condo_values}
-            else:
-                raise KeyError("Veuillez au moin insérer une liste de composants.")
-
-    def graphs(self, order, cutoff_frequency=None, res_values=None, condo_values=None):
-        if order > 10 or order < 1:
-            raise ValueError(f"L'ordre {order} n'est pas supporté.")
-        if cutoff_frequency is not None:  # Si une frequence de coupure est donnée
-            if res_values is not None or condo_values is not None:
-                if condo_values is None:
-                    condo = self.components(
-                        order=order,
-                        cutoff_frequency=cutoff_frequency,
-                        res_values=res_values,
-                    )
-                else:
-                    res = self.components(
-                        order=order,
-                        cutoff_frequency=cutoff_frequency,
-                        condo_values=condo_values,
-                    )
-
-                if order == 1:
-                    # Pour avoir 2 decades apres et 2 decades avant
-                    freq_min_hz = (
-                        cutoff_frequency / 100
-                    )  # 10^(-2) fois la fréquence de coupure
-                    freq_max_hz = (
-                        cutoff_frequency * 100
-                    )  # 10^(2) fois la fréquence de coupure
-                    num = [1.0]
-                    if condo_values is None:
-                        den = [res_values[0] * condo["C"], 1.0]
-                    else:
-                        den = [condo_values[0] * res["R"], 1.0]
-                    tf = TransferFunction(num, den)
-                    # Pour avoir un graphe qui est toujours dans les bonnes plages
-                    w = np.logspace(
-                        np.log10(2 * np.pi * freq_min_hz),
-                        np.log10(2 * np.pi * freq_max_hz),
-                        500,
-                    )
-                    w, mag, phase = bode(tf, w=w)
-
-                elif order >= 2:
-                    den_combined = [1]
-                    if order % 2 == 0:
-                        stage = order / 2
-                        freq_min_hz = cutoff_frequency / 10 ** (
-                            stage + 1
-                        )  # 10^(stage + 1) fois la fréquence de coupure
-                        freq_max_hz = cutoff_frequency * 10 ** (
-                            stage + 1
-                        )  # 10^(stage + 1) fois la fréquence de coupure
-                        if condo_values is None:
-                            for x in range(int(stage)):
-                                idx_1 = x * 2
-                                idx_2 = idx_1 + 1
-                                den = [
-                                    condo["C"][idx_1]
-                                    * condo["C"][idx_2]
-                                    * res_values[idx_1]
-                                    * res_values[idx_2],
-                                    (res_values[idx_1] + res_values[idx_2]),
-                                    1.0,
-                                ]
-                                den_combined = np.polymul(den_combined, den)
-                        else:
-                            for x in range(int(stage)):
-                                idx_1 = x * 2
-                                idx_2 = idx_1 + 1
-                                # Calcul du polynome pour etage "X"
-                                den = [
-                                    condo_values[idx_1]
-                                    * condo_values[idx_2]
-                                    * res["R"][idx_1]
-                                    * res["R"][idx_2],
-                                    (res["R"][idx_1] + res["R"][idx_2]),
-                                    1.0,
-                                ]
-                                den_combined = np.polymul(den_combined, den)
-                    else:
-                        stage = order // 2 + 1
-                        freq_min_hz = cutoff_frequency / 10 ** (
-                            stage + 1
-                        )  # 10^(stage + 1) fois la fréquence de coupure
-                        freq_max_hz = cutoff_frequency * 10 ** (
-                            stage + 1
-                        )  # 10^(stage + 1) fois la fréquence de coupure
-                        if condo_values is None:
-                            for x in range(int(stage)):
-                                idx_1 = x * 2 - 1
-                                idx_2 = idx_1 + 1
-                                if x == 0:
-                                    den = [condo["C"][0] * res_values[0], 1]
-                                # Calcul du polynome pour etage "X"
-                                else:
-                                    den = [
-                                        condo["C"][idx_1]
-                                        * condo["C"][idx_2]
-                                        * res_values[idx_1]
-                                        * res_values[idx_2],
-                                        (res_values[idx_1] + res_values[idx_2]),
-                                        1,
-                                    ]
-                                den_combined = np.polymul(den_combined, den)
-                        else:
-                            for x in range(int(stage)):
-                                idx_1 = x * 2 - 1
-                                idx_2 = idx_1 + 1
-                                if x == 0:
-                                    den = [res["R"][0] * condo_values[0], 1]
-                                # Calcul du polynome pour etage "X"
-                                else:
-                                    den = [
-                                        condo_values[idx_1]
-                                        * condo_values[idx_2]
-                                        * res["R"][idx_1]
-                                        * res["R"][idx_2],
-                                        (res["R"][idx_1] + res["R"][idx_2]),
-                                        1,
-                                    ]
-                                den_combined = np.polymul(den_combined, den)
-                    num_combined = [1]
-                    tf = TransferFunction(num_combined, den_combined)
-                    # Pour avoir un graphe qui est toujours dans les bonnes plages
-                    w = np.logspace(
-                        np.log10(2 * np.pi * freq_min_hz),
-                        np.log10(2 * np.pi * freq_max_hz),
-                        500,
-                    )
-                    w, mag, phase = bode(tf, w=w)
-
-                freq_hz = w / (2 * np.pi)
-                fig_lp, (ax_mag_lp, ax_phase_lp) = plt.subplots(
-                    2, 1, figsize=(8, 6), sharex=True
-                )
-
-                # Tracer les données
-                ax_mag_lp.semilogx(freq_hz, mag, "b")
-                ax_mag_lp.set_ylabel("Magnitude (dB)")
-                ax_phase_lp.semilogx(freq_hz, phase, "r")
-                ax_phase_lp.set_xlabel("Frequency (Hz)")
-                ax_phase_lp.set_ylabel("Phase (deg)")
-
-                # Activer les grilles pour les deux axes
-                ax_mag_lp.grid(
-                    True, which="both", axis="x"
-                )  # Ajout des lignes de grille entre les décennies
-                ax_phase_lp.grid(True, which="both", axis="x")
-                ax_mag_lp.grid(
-                    True, which="both", axis="y"
-                )  # Ajout des lignes de grille entre les décennies
-                ax_phase_lp.grid(True, which="both", axis="y")
-
-                # Ajuster la disposition pour éviter le chevauchement
-                plt.tight_layout()
-                # Afficher le graphique
-                plt.show()
-            else:
-                raise KeyError("Veuillez au moin insérer une liste de composants.")
-
-        elif res_values is not None and condo_values is not None:
-            den_combined = [1]
-            if order % 2 == 0:
-                stage = order / 2
-                freq_min_hz = cutoff_frequency / 10 ** (
-                    stage + 1
-                )  # 10^(stage + 1) fois la fréquence de coupure
-                freq_max_hz = cutoff_frequency * 10 ** (
-                    stage + 1
-                )  # 10^(stage + 1) fois la fréquence de coupure
-                if condo_values is None:
-                    for x in range(int(stage)):
-                        idx_1 = x * 2
-                        idx_2 = idx_1 + 1
-                        den = [
-                            condo_values[idx_1]
-                            * condo_values[idx_2]
-                            * res_values[idx_1]
-                            * res_values[idx_2],
-                            (res_values[idx_1] + res_values[idx_2]),
-                            1.0,
-                        ]
-                        den_combined = np.polymul(den_combined, den)
-                else:
-                    for x in range(int(stage)):
-                        idx_1 = x * 2
-                        idx_2 = idx_1 + 1
-                        # Calcul du polynome pour etage "X"
-                        den = [
-                            condo_values[idx_1]
-                            * condo_values[idx_2]
-                            * res_values[idx_1]
-                            * res_values[idx_2],
-                            (res_values[idx_1] + res_values[idx_2]),
-                            1.0,
-                        ]
-                        den_combined = np.polymul(den_combined, den)
-            else:
-                stage = order // 2 + 1
-                freq_min_hz = cutoff_frequency / 10 ** (
-                    stage + 1
-                )  # 10^(stage + 1) fois la fréquence de coupure
-                freq_max_hz = cutoff_frequency * 10 ** (
-                    stage + 1
-                )  # 10^(stage + 1) fois la fréquence de coupure
-                if condo_values is None:
-                    for x in range(int(stage)):
-                        idx_1 = x * 2 - 1
-                        idx_2 = idx_1 + 1
-                        if x == 0:
-                            den = [condo["C"][0] * res_values[0], 1]
-                        # Calcul du polynome pour etage "X"
-                        else:
-                            den = [
-                                condo_values[idx_1]
-                                * condo_values[idx_2]
-                                * res_values[idx_1]
-                                * res_values[idx_2],
-                                (res_values[idx_1] + res_values[idx_2]),
-                                1.0,
-                            ]
-                        den_combined = np.polymul(den_combined, den)
-                else:
-                    for x in range(int(stage)):
-                        idx_1 = x * 2 - 1
-                        idx_2 = idx_1 + 1
-                        if x == 0:
-                            den = [res["R"][0] * condo_values[0], 1]
-                        # Calcul du polynome pour etage "X"
-                        else:
-                            den = [
-                                condo_values[idx_1]
-                                * condo_values[idx_2]
-                                * res_values[idx_1]
-                                * res_values[idx_2],
-                                (res_values[idx_1] + res_values[idx_2]),
-                                1.0,
-                            ]
-                        den_combined = np.polymul(den_combined, den)
-            num_combined = [1]
-            tf = TransferFunction(num_combined, den_combined)
-            # Pour avoir un graphe qui est toujours dans les bonnes plages
-            w = np.logspace(
-                np.log10(2 * np.pi * freq_min_hz),
-                np.log10(2 * np.pi * freq_max_hz),
-                500,
-            )
-            w, mag, phase = bode(tf, w=w)
+        cutoff_frequencies : tableau (n,) des fréquences de coupure (ou scalaire)
+        res_values / condo_values : tableau (n, order) des composants imposés,
+                                    une ligne par conception (ou une seule ligne
+                                    commune à toutes les conceptions)
 
-            freq_hz = w / (2 * np.pi)
-            fig_lp, (ax_mag_lp, ax_phase_lp) = plt.subplots(
-                2, 1, figsize=(8, 6), sharex=True
-            )
+        Retourne {"R": tableau (n, order), "C": tableau (n, order)} avec les
+        composants imposés et calculés, au même format que components().
+        """
+        q_values = _stage_q(order)[order % 2 :]
 
-            # Tracer les données
-            ax_mag_lp.semilogx(freq_hz, mag, "b")
-            ax_mag_lp.set_ylabel("Magnitude (dB)")
-            ax_phase_lp.semilogx(freq_hz, phase, "r")
-            ax_phase_lp.set_xlabel("Frequency (Hz)")
-            ax_phase_lp.set_ylabel("Phase (deg)")
-
-            # Activer les grilles pour les deux axes
-            ax_mag_lp.grid(
-                True, which="both", axis="x"
-            )  # Ajout des lignes de grille entre les décennies
-            ax_phase_lp.grid(True, which="both", axis="x")
-            ax_mag_lp.grid(
-                True, which="both", axis="y"
-            )  # Ajout des lignes de grille entre les décennies
-            ax_phase_lp.grid(True, which="both", axis="y")
-
-            # Ajuster la disposition pour éviter le chevauchement
-            plt.tight_layout()
-            # Afficher le graphique
-            plt.show()
-        else:
-            raise KeyError(
-                "Veuillez inserer les listes de composants, "
-                + "Ou ajouter une frequence de coupure + une liste de composants."
+        if res_values is not None:
+            pulsations_W0, res = _batch_inputs(order, cutoff_frequencies, res_values)
+            condo = _butterworth_kernel(
+                "lowpass", "R", order, pulsations_W0, res, q_values
+            )
+        elif condo_values is not None:
+            pulsations_W0, condo = _batch_inputs(
+                order, cutoff_frequencies, condo_values
+            )
+            res = _butterworth_kernel(
+                "lowpass", "C", order, pulsations_W0, condo, q_values
             )
+        else:
+            raise KeyError("Veuillez au moin insérer une liste de composants.")
+        return {"R": res, "C": condo}
 
+    @timed("butterworth.lowpass.stages")
+    def stages(self, order, cutoff_frequency, res_values=None, condo_values=None):
+        """
+        Retourne les étages du filtre au même format que bessel et tchebychev.
+
+        Format de sortie --> [{"params": {"R": .., "C": ..}, "sos": section},
+                              {"params": {"R1": .., "R2": .., "C1": .., "C2": ..},
+                               "sos": section}, ...]
+        """
+        values, res_given = _single_design(
+            self, order, cutoff_frequency, res_values, condo_values
+        )
+        swap_c = res_given
+        sections = _butterworth_sections(
+            "lowpass", order, values["R"], values["C"], swap_c
+        )[0]
+        return _butterworth_stages(
+            order, values["R"][0].tolist(), values["C"][0].tolist(), sections, swap_c
+        )
+
+    def stages_batch(
+        self, order, cutoff_frequencies, res_values=None, condo_values=None
+    ):
+        """
+        Version vectorisée de stages() : chaque composant d'un étage est un
+        tableau (n,) et chaque section un tableau (n, 6).
+        """
+        values = self.components_batch(
+            order, cutoff_frequencies, res_values=res_values, condo_values=condo_values
+        )
+        swap_c = res_values is not None
+        sections = _butterworth_sections(
+            "lowpass", order, values["R"], values["C"], swap_c
+        )
+        return _butterworth_stages(
+            order, values["R"].T, values["C"].T, sections.transpose(1, 0, 2), swap_c
+        )
+
+    @timed("butterworth.lowpass.sos")
+    def sos(self, order, cutoff_frequency, res_values=None, condo_values=None):
+        """
+        Retourne le tableau des sections du second ordre (nbr_étages x 6).
+
+        Format d'une ligne --> [b2, b1, b0, a2, a1, a0] (voir filters.snk.sos)
+        """
+        values, res_given = _single_design(
+            self, order, cutoff_frequency, res_values, condo_values
+        )
+        return _butterworth_sections(
+            "lowpass", order, values["R"], values["C"], res_given
+        )[0]
+
+    def sos_batch(self, order, cutoff_frequencies, res_values=None, condo_values=None):
+        """
+        Version vectorisée de sos() : tableau (n, nbr_étages, 6) pour n conceptions.
+        """
+        values = self.components_batch(
+            order, cutoff_frequencies, res_values=res_values, condo_values=condo_values
+        )
+        res_given = res_values is not None
+        return _butterworth_sections(
+            "lowpass", order, values["R"], values["C"], res_given
+        )
+
+    def response(
+        self, order, cutoff_frequency=None, res_values=None, condo_values=None
+    ):
+        """
+        Calcule le diagramme de Bode sans rien afficher.
+
+        Mêmes paramètres que graphs() ; retourne (freq, magnitude_db, phase_deg).
+        """
+        sos, cutoff_frequency = _graph_sections(
+            self, "lowpass", order, cutoff_frequency, res_values, condo_values
+        )
+        return _bode_response(sos, order, cutoff_frequency)
+
+    def graphs(
+        self,
+        order,
+        cutoff_frequency=None,
+        res_values=None,
+        condo_values=None,
+        path=None,
+    ):
+        """
+        Affiche le diagramme de Bode, ou l'écrit dans le fichier path sans
+        affichage (moteur non interactif) si path est donné.
+        """
+        freq_hz, mag, phase = self.response(
+            order, cutoff_frequency, res_values, condo_values
+        )
+        return render_bode(
+            freq_hz, mag, phase, path=path, title=f"Butterworth Passe-Bas ordre {order}"
+        )
 
-class Butterworth_HighPass:
-    def __init__(self):
-        # Tableau des pulsations et facteurs de qualité des filtres passe-bas normalisés (Pour Butterworth rien ne change)
-        self.BUTTERWORTH_TABLE = {
-            1: [(0.0)],
-            2: [(0.7071)],
-            3: [(0.0), (1.0)],
-            4: [(0.5412), (1.3066)],
-            5: [(0.0), (0.6180), (1.6180)],
-            6: [(0.5176), (0.7071), (1.9319)],
-            7: [(0.0000), (0.5550), (0.8019), (2.2470)],
-            8: [(0.5098), (0.6013), (0.8999), (2.5629)],
-            9: [(0.0000), (0.5321), (0.6527), (1.0), (2.8794)],
-            10: [(0.5062), (0.5612), (0.7071), (1.1013), (3.1962)],
-        }
 
+class Butterworth_HighPass:
+    @timed("butterworth.highpass.components")
     def components(self, order, cutoff_frequency, res_values=None, condo_values=None):
         """
         Cette fonction calcule les composants manquants pour réaliser le filtre Passe-Haut voulu.
@@ -563,568 +401,139 @@ class Butterworth_HighPass:
         Format de la liste des condensateurs --> [C1, C2, ..., Cx]
         Format de sortie --> [Composant 1, Composant 2, ..., Composant x]
         """
-        # Verifie si l'ordre du filtre est dans le dictionnaire
-        if order not in self.BUTTERWORTH_TABLE:
-            raise ValueError(f"L'ordre {order} n'est pas supporté.")
+        # Verifie que l'ordre du filtre est supporté
+        butterworth_q_values(order)
+
+        values, res_given = _single_design(
+            self, order, cutoff_frequency, res_values, condo_values
+        )
+        if res_given:
+            computed = values["C"][0]
+            if order == 1:
+                return {"R": res_values[0], "C": float(computed[0])}
+            return {"R": res_values, "C": computed.tolist()}
+        computed = values["R"][0]
+        if order == 1:
+            return {"R": float(computed[0]), "C": condo_values[0]}
+        return {"R": computed.tolist(), "C": condo_values}
 
-        # Verifie que une frequence de coupure à été donnée
-        if cutoff_frequency is None:
-            raise ValueError("Veuillez fournir une fréquence de coupure.")
-        # Calcul de W0
-        pulsation_W0 = 2 * np.pi * cutoff_frequency
+    def components_batch(
+        self, order, cutoff_frequencies, res_values=None, condo_values=None
+    ):
+        """
+        Version vectorisée de components() pour un grand nombre de conceptions.
 
-        if order == 1:
-            # Verifie si une liste à été entrée
-            if res_values is not None:
-                nbr_elements = len(res_values)
-                # Verifie la taille de la liste
-                if nbr_elements > 1 or nbr_elements == 0:
-                    raise ValueError(
-                        "Pour le 1er ordre veuillez mettre une résistance."
-                    )
-                # Verifie le type des données de la liste
-                if isinstance(res_values[0], (int, float)):
-                    # Calcul du composant
-                    condo_value = 1 / (pulsation_W0 * res_values[0])
-                    # Retourne les valeurs calculées
-                    return {"R": res_values[0], "C": condo_value}
-                else:
-                    raise ValueError("Veuillez insérer des valeurs valables.")
-            elif condo_values is not None:
-                # Verifie que l'entrée est du type int ou float
-                nbr_elements = len(condo_values)
-                # Verifie que la liste ne contient qu'1 seul élément
-                if nbr_elements > 1 or nbr_elements == 0:
-                    raise ValueError(
-                        "Pour le 1er ordre veuillez mettre qu'un seul élément."
-                    )
-                if isinstance(condo_values[0], (int, float)):
-                    res_value = 1 / (pulsation_W0 * condo_values[0])
-                    return {"R": res_value, "C": condo_values[0]}
-                else:
-                    raise ValueError("Veuillez insérer des int ou float.")
-            else:
-                raise KeyError("Veuillez au moin insérer une liste de composants.")
-
-        if order >= 2:
-            # Verifie si une liste à été entrée
-            if res_values is not None:
-                nbr_elements = len(res_values)
-                # Verifie si l'ordre est pair
-                # Calcul le nombre d'étages du filtre
-                if order % 2 == 0:
-                    stage = order / 2
-                    # Verifie que la taille de la liste soit conforme
-                    if nbr_elements < (stage * 2) or nbr_elements > (stage * 2):
-                        raise ValueError(
-                            f"Veuillez mettre {stage * 2} éléments dans la liste."
-                        )
-                    for x in res_values:
-                        # Verifier que chaque élément est du type int ou float
-                        if isinstance(x, (int, float)):
-                            None
-                        else:
-                            raise ValueError("Veuillez insérer des int ou float.")
-                    condo_value = []
-                    for y in range(int(stage)):
-                        r1_idx = y * 2
-                        r2_idx = r1_idx + 1
-                        q0 = self.BUTTERWORTH_TABLE[order][y]
-                        r1, r2 = res_values[r1_idx], res_values[r2_idx]
-
-                        # Vérification de la condition
-                        if (
-                            res_values[r2_idx]
-                            < 4
-                            * res_values[r1_idx]
-                            * self.BUTTERWORTH_TABLE[order][y] ** 2
-                        ):
-                            raise ValueError(
-                                f"Condition non respectée au stage {y + 1}: R2 ({r2}) >= 4 * R1 ({r1}) * Q0^2 ({q0**2})."
-                            )
-
-                        # Calcul des résistances
-                        j = 1 / (pulsation_W0 * res_values[r1_idx] * q0)
-                        k = 1 / (
-                            pulsation_W0**2 * res_values[r1_idx] * res_values[r2_idx]
-                        )
-                        discriminant = j**2 - 4 * k
-
-                        if discriminant < 0:
-                            raise ValueError(
-                                "Discriminant négatif : impossible de calculer les résistances."
-                            )
-
-                        c2 = (j + np.sqrt(discriminant)) / 2
-                        c1 = j - c2
-                        condo_value.extend([c1, c2])
-                    return {"R": res_values, "C": condo_value}
-
-                # Verifie si l'ordre est impair
-                elif order % 2 != 0:
-                    stage = order // 2 + 1
-                    # Verifie que la taille de la liste soit conforme
-                    if nbr_elements > (stage * 2 - 1) or nbr_elements < (stage * 2 - 1):
-                        raise ValueError(
-                            f"Veuillez mettre {stage * 2 - 1} éléments dans la liste."
-                        )
-                    for x in res_values:
-                        # Verifier que chaque élément est du type int ou float
-                        if isinstance(x, (int, float)):
-                            None
-                        else:
-                            raise ValueError("Veuillez insérer des int ou float.")
-                    condo_value = []
-                    # Calcul des étages d'ordre 2 suivants
-                    for y in range(int(stage)):
-                        r1_idx = y * 2 - 1
-                        r2_idx = r1_idx + 1
-                        q0 = self.BUTTERWORTH_TABLE[order][y]
-                        r1, r2 = res_values[r1_idx], res_values[r2_idx]
-                        # Calcul des résistances
-                        if y == 0:
-                            # Calcul du premier étage
-                            c1 = 1 / (pulsation_W0 * res_values[0])
-                            condo_value.append(c1)
-                        if y > 0:
-                            # Vérification de la condition
-                            if (
-                                res_values[r2_idx]
-                                < 4
-                                * res_values[r1_idx]
-                                * self.BUTTERWORTH_TABLE[order][y] ** 2
-                            ):
-                                raise ValueError(
-                                    f"Condition non respectée au stage {y + 1}: R2 ({r2}) >= 4 * R1 ({r1}) * Q0^2 ({q0**2})."
-                                )
-                            j = 1 / (pulsation_W0 * res_values[r1_idx] * q0)
-                            k = 1 / (
-                                pulsation_W0**2
-                                * res_values[r1_idx]
-                                * res_values[r2_idx]
-                            )
-                            discriminant = j**2 - 4 * k
-
-                            if discriminant < 0:
-                                raise ValueError(
-                                    "Discriminant négatif : impossible de calculer les résistances."
-                                )
-
-                            c2 = (j + np.sqrt(discriminant)) / 2
-                            c1 = j - c2
-                            condo_value.extend([c1, c2])
-                    return {"R": res_values, "C": condo_value}
-            # Verifie si une liste à été entrée
-            elif condo_values is not None:
-                nbr_elements = len(condo_values)
-                # Verifie si l'ordre est pair
-                # Calcul le nombre d'étages du filtre
-                if order % 2 == 0:
-                    stage = order / 2
-                    # Verifie que la taille de la liste soit conforme
-                    if nbr_elements < (stage * 2) or nbr_elements > (stage * 2):
-                        raise ValueError(
-                            f"Veuillez mettre {stage * 2} éléments dans la liste."
-                        )
-                    for x in condo_values:
-                        # Verifier que chaque élément est du type int ou float
-                        if isinstance(x, (int, float)):
-                            None
-                        else:
-                            raise ValueError("Veuillez insérer des int ou float.")
-                    res_value = []
-                    for y in range(int(stage)):
-                        c1_idx = y * 2
-                        c2_idx = c1_idx + 1
-                        q0 = self.BUTTERWORTH_TABLE[order][y]
-                        c1, c2 = condo_values[c1_idx], condo_values[c2_idx]
-
-                        # Calcul des résistances
-                        r2 = ((c1 + c2) * self.BUTTERWORTH_TABLE[order][y]) / (
-                            c1 * c2 * pulsation_W0
-                        )
-                        r1 = 1 / (
-                            (c1 + c2) * pulsation_W0 * self.BUTTERWORTH_TABLE[order][y]
-                        )
-                        res_value.extend([r1, r2])
-                # Verifie si l'ordre est impair
-                # Calcul le nombre d'étages du filtre
-                elif order % 2 != 0:
-                    stage = order // 2 + 1
-                    # Verifie que la taille de la liste soit conforme
-                    if nbr_elements > (stage * 2 - 1) or nbr_elements < (stage * 2 - 1):
-                        raise ValueError(
-                            f"Veuillez mettre {stage * 2 - 1} éléments dans la liste."
-                        )
-                    for x in condo_values:
-                        # Verifier que chaque élément est du type int ou float
-                        if isinstance(x, (int, float)):
-                            None
-                        else:
-                            raise ValueError("Veuillez insérer des int ou float.")
-                    res_value = []
-                    # Calcul des étages d'ordre 2 suivants
-                    for y in range(int(stage)):
-                        c1_idx = y * 2 - 1
-                        c2_idx = c1_idx + 1
-                        q0 = self.BUTTERWORTH_TABLE[order][y]
-                        c1, c2 = condo_values[c1_idx], condo_values[c2_idx]
-                        # Calcul des résistances
-                        if y == 0:
-                            # Calcul du premier étage
-                            r1 = 1 / (pulsation_W0 * condo_values[0])
-                            res_value.append(r1)
-                        if y > 0:
-                            # Vérification de la condition
-                            r2 = ((c1 + c2) * self.BUTTERWORTH_TABLE[order][y]) / (
-                                c1 * c2 * pulsation_W0
-                            )
-                            r1 = 1 / (
-                                (c1 + c2)
-                                * pulsation_W0
-                                * self.BUTTERWORTH_TABLE[order][y]
-                            )
-                            res_value.extend([r1, r2])
-                    return {"R": res_value, "C": condo_values}
-            else:
-                raise KeyError("Veuillez au moin insérer une liste de composants.")
-
-    def graphs(self, order, cutoff_frequency=None, res_values=None, condo_values=None):
-        if order > 10 or order < 1:
-            raise ValueError(f"L'ordre {order} n'est pas supporté.")
-        if cutoff_frequency is not None:  # Si une frequence de coupure est donnée
-            if res_values is not None or condo_values is not None:
-                if condo_values is None:
-                    condo = self.components(
-                        order=order,
-                        cutoff_frequency=cutoff_frequency,
-                        res_values=res_values,
-                    )
-                else:
-                    res = self.components(
-                        order=order,
-                        cutoff_frequency=cutoff_frequency,
-                        condo_values=condo_values,
-                    )
-
-                if order == 1:
-                    # Pour avoir 2 decades apres et 2 decades avant
-                    freq_min_hz = (
-                        cutoff_frequency / 100
-                    )  # 10^(-2) fois la fréquence de coupure
-                    freq_max_hz = (
-                        cutoff_frequency * 100
-                    )  # 10^(2) fois la fréquence de coupure
-                    if condo_values is None:
-                        num = [res_values[0] * condo["C"]]
-                        den = [res_values[0] * condo["C"], 1.0]
-                    else:
-                        num = [condo_values[0] * res["R"]]
-                        den = [condo_values[0] * res["R"], 1.0]
-                    tf = TransferFunction(num, den)
-                    # Pour avoir un graphe qui est toujours dans les bonnes plages
-                    w = np.logspace(
-                        np.log10(2 * np.pi * freq_min_hz),
-                        np.log10(2 * np.pi * freq_max_hz),
-                        500,
-                    )
-                    w, mag, phase = bode(tf, w=w)
-
-                elif order >= 2:
-                    den_combined = [1]
-                    num_combined = [1]
-                    if order % 2 == 0:
-                        stage = order / 2
-                        freq_min_hz = cutoff_frequency / 10 ** (
-                            stage + 1
-                        )  # 10^(stage + 1) fois la fréquence de coupure
-                        freq_max_hz = cutoff_frequency * 10 ** (
-                            stage + 1
-                        )  # 10^(stage + 1) fois la fréquence de coupure
-                        if condo_values is None:
-                            for x in range(int(stage)):
-                                idx_1 = x * 2
-                                idx_2 = idx_1 + 1
-                                den = [
-                                    condo["C"][idx_1]
-                                    * condo["C"][idx_2]
-                                    * res_values[idx_1]
-                                    * res_values[idx_2],
-                                    (res_values[idx_1] + res_values[idx_2]),
-                                    1.0,
-                                ]
-                                num = [
-                                    condo["C"][idx_1]
-                                    * condo["C"][idx_2]
-                                    * res_values[idx_1]
-                                    * res_values[idx_2]
-                                ]
-                                den_combined = np.polymul(den_combined, den)
-                                num_combined = np.polymul(num_combined, num)
-                        else:
-                            for x in range(int(stage)):
-                                idx_1 = x * 2
-                                idx_2 = idx_1 + 1
-                                # Calcul du polynome pour etage "X"
-                                den = [
-                                    condo_values[idx_1]
-                                    * condo_values[idx_2]
-                                    * res["R"][idx_1]
-                                    * res["R"][idx_2],
-                                    (res["R"][idx_1] + res["R"][idx_2]),
-                                    1.0,
-                                ]
-                                num = [
-                                    condo_values[idx_1]
-                                    * condo_values[idx_2]
-                                    * res["R"][idx_1]
-                                    * res["R"][idx_2]
-                                ]
-                                den_combined = np.polymul(den_combined, den)
-                                num_combined = np.polymul(num_combined, num)
-                    else:
-                        stage = order // 2 + 1
-                        freq_min_hz = cutoff_frequency / 10 ** (
-                            stage + 1
-                        )  # 10^(stage + 1) fois la fréquence de coupure
-                        freq_max_hz = cutoff_frequency * 10 ** (
-                            stage + 1
-                        )  # 10^(stage + 1) fois la fréquence de coupure
-                        if condo_values is None:
-                            for x in range(int(stage)):
-                                idx_1 = x * 2 - 1
-                                idx_2 = idx_1 + 1
-                                if x == 0:
-                                    den = [condo["C"][0] * res_values[0], 1]
-                                    num = [condo["C"][0] * res_values[0]]
-                                # Calcul du polynome pour etage "X"
-                                else:
-                                    den = [
-                                        condo["C"][idx_1]
-                                        * condo["C"][idx_2]
-                                        * res_values[idx_1]
-                                        * res_values[idx_2],
-                                        (res_values[idx_1] + res_values[idx_2]),
-                                        1,
-                                    ]
-                                    num = [
-                                        condo["C"][idx_1]
-                                        * condo["C"][idx_2]
-                                        * res_values[idx_1]
-                                        * res_values[idx_2]
-                                    ]
-                                den_combined = np.polymul(den_combined, den)
-                                num_combined = np.polymul(num_combined, num)
-                        else:
-                            for x in range(int(stage)):
-                                idx_1 = x * 2 - 1
-                                idx_2 = idx_1 + 1
-                                if x == 0:
-                                    den = [res["R"][0] * condo_values[0], 1]
-                                    num = [res["R"][0] * condo_values[0]]
-                                # Calcul du polynome pour etage "X"
-                                else:
-                                    den = [
-                                        condo_values[idx_1]
-                                        * condo_values[idx_2]
-                                        * res["R"][idx_1]
-                                        * res["R"][idx_2],
-                                        (res["R"][idx_1] + res["R"][idx_2]),
-                                        1,
-                                    ]
-                                    num = [
-                                        condo_values[idx_1]
-                                        * condo_values[idx_2]
-                                        * res["R"][idx_1]
-                                        * res["R"][idx_2]
-                                    ]
-                                den_combined = np.polymul(den_combined, den)
-                                num_combined = np.polymul(num_combined, num)
-                    tf = TransferFunction(num_combined, den_combined)
-                    # Pour avoir un graphe qui est toujours dans les bonnes plages
-                    w = np.logspace(
-                        np.log10(2 * np.pi * freq_min_hz),
-                        np.log10(2 * np.pi * freq_max_hz),
-                        500,
-                    )
-                    w, mag, phase = bode(tf, w=w)
-
-                freq_hz = w / (2 * np.pi)
-                fig_lp, (ax_mag_lp, ax_phase_lp) = plt.subplots(
-                    2, 1, figsize=(8, 6), sharex=True
-                )
-
-                # Tracer les données
-                ax_mag_lp.semilogx(freq_hz, mag, "b")
-                ax_mag_lp.set_ylabel("Magnitude (dB)")
-                ax_phase_lp.semilogx(freq_hz, phase, "r")
-                ax_phase_lp.set_xlabel("Frequency (Hz)")
-                ax_phase_lp.set_ylabel("Phase (deg)")
-
-                # Activer les grilles pour les deux axes
-                ax_mag_lp.grid(
-                    True, which="both", axis="x"
-                )  # Ajout des lignes de grille entre les décennies
-                ax_phase_lp.grid(True, which="both", axis="x")
-                ax_mag_lp.grid(
-                    True, which="both", axis="y"
-                )  # Ajout des lignes de grille entre les décennies
-                ax_phase_lp.grid(True, which="both", axis="y")
-
-                # Ajuster la disposition pour éviter le chevauchement
-                plt.tight_layout()
-                # Afficher le graphique
-                plt.show()
-            else:
-                raise KeyError("Veuillez au moin insérer une liste de composants.")
-
-        elif res_values is not None and condo_values is not None:
-            den_combined = [1]
-            num_combined = [1]
-            if order % 2 == 0:
-                stage = order / 2
-                freq_min_hz = cutoff_frequency / 10 ** (
-                    stage + 1
-                )  # 10^(stage + 1) fois la fréquence de coupure
-                freq_max_hz = cutoff_frequency * 10 ** (
-                    stage + 1
-                )  # 10^(stage + 1) fois la fréquence de coupure
-                if condo_values is None:
-                    for x in range(int(stage)):
-                        idx_1 = x * 2
-                        idx_2 = idx_1 + 1
-                        den = [
-                            condo_values[idx_1]
-                            * condo_values[idx_2]
-                            * res_values[idx_1]
-                            * res_values[idx_2],
-                            (res_values[idx_1] + res_values[idx_2]),
-                            1.0,
-                        ]
-                        num = [
-                            condo_values[idx_1]
-                            * condo_values[idx_2]
-                            * res_values[idx_1]
-                            * res_values[idx_2]
-                        ]
-                        den_combined = np.polymul(den_combined, den)
-                        num_combined = np.polymul(num_combined, num)
-                else:
-                    for x in range(int(stage)):
-                        idx_1 = x * 2
-                        idx_2 = idx_1 + 1
-                        # Calcul du polynome pour etage "X"
-                        den = [
-                            condo_values[idx_1]
-                            * condo_values[idx_2]
-                            * res_values[idx_1]
-                            * res_values[idx_2],
-                            (res_values[idx_1] + res_values[idx_2]),
-                            1.0,
-                        ]
-                        num = [
-                            condo_values[idx_1]
-                            * condo_values[idx_2]
-                            * res_values[idx_1]
-                            * res_values[idx_2]
-                        ]
-                        den_combined = np.polymul(den_combined, den)
-                        num_combined = np.polymul(num_combined, num)
-            else:
-                stage = order // 2 + 1
-                freq_min_hz = cutoff_frequency / 10 ** (
-                    stage + 1
-                )  # 10^(stage + 1) fois la fréquence de coupure
-                freq_max_hz = cutoff_frequency * 10 ** (
-                    stage + 1
-                )  # 10^(stage + 1) fois la fréquence de coupure
-                if condo_values is None:
-                    for x in range(int(stage)):
-                        idx_1 = x * 2 - 1
-                        idx_2 = idx_1 + 1
-                        if x == 0:
-                            den = [condo["C"][0] * res_values[0], 1]
-                            num = [condo["C"][0] * res_values[0]]
-                        # Calcul du polynome pour etage "X"
-                        else:
-                            den = [
-                                condo_values[idx_1]
-                                * condo_values[idx_2]
-                                * res_values[idx_1]
-                                * res_values[idx_2],
-                                (res_values[idx_1] + res_values[idx_2]),
-                                1.0,
-                            ]
-                            num = [
-                                condo_values[idx_1]
-                                * condo_values[idx_2]
-                                * res_values[idx_1]
-                                * res_values[idx_2]
-                            ]
-                        den_combined = np.polymul(den_combined, den)
-                        num_combined = np.polymul(num_combined, num)
-                else:
-                    for x in range(int(stage)):
-                        idx_1 = x * 2 - 1
-                        idx_2 = idx_1 + 1
-                        if x == 0:
-                            den = [res["R"][0] * condo_values[0], 1]
-                            num = [res["R"][0] * condo_values[0]]
-                        # Calcul du polynome pour etage "X"
-                        else:
-                            den = [
-                                condo_values[idx_1]
-                                * condo_values[idx_2]
-                                * res_values[idx_1]
-                                * res_values[idx_2],
-                                (res_values[idx_1] + res_values[idx_2]),
-                                1.0,
-                            ]
-                            num = [
-                                condo_values[idx_1]
-                                * condo_values[idx_2]
-                                * res_values[idx_1]
-                                * res_values[idx_2]
-                            ]
-                        den_combined = np.polymul(den_combined, den)
-                        num_combined = np.polymul(num_combined, num)
-            tf = TransferFunction(num_combined, den_combined)
-            # Pour avoir un graphe qui est toujours dans les bonnes plages
-            w = np.logspace(
-                np.log10(2 * np.pi * freq_min_hz),
-                np.log10(2 * np.pi * freq_max_hz),
-                500,
-            )
-            w, mag, phase = bode(tf, w=w)
+        cutoff_frequencies : tableau (n,) des fréquences de coupure (ou scalaire)
+        res_values / condo_values : tableau (n, order) des composants imposés,
+                                    une ligne par conception (ou une seule ligne
+                                    commune à toutes les conceptions)
 
-            freq_hz = w / (2 * np.pi)
-            fig_lp, (ax_mag_lp, ax_phase_lp) = plt.subplots(
-                2, 1, figsize=(8, 6), sharex=True
-            )
+        Retourne {"R": tableau (n, order), "C": tableau (n, order)} avec les
+        composants imposés et calculés, au même format que components().
+        """
+        q_values = _stage_q(order)[order % 2 :]
 
-            # Tracer les données
-            ax_mag_lp.semilogx(freq_hz, mag, "b")
-            ax_mag_lp.set_ylabel("Magnitude (dB)")
-            ax_phase_lp.semilogx(freq_hz, phase, "r")
-            ax_phase_lp.set_xlabel("Frequency (Hz)")
-            ax_phase_lp.set_ylabel("Phase (deg)")
-
-            # Activer les grilles pour les deux axes
-            ax_mag_lp.grid(
-                True, which="both", axis="x"
-            )  # Ajout des lignes de grille entre les décennies
-            ax_phase_lp.grid(True, which="both", axis="x")
-            ax_mag_lp.grid(
-                True, which="both", axis="y"
-            )  # Ajout des lignes de grille entre les décennies
-            ax_phase_lp.grid(True, which="both", axis="y")
-
-            # Ajuster la disposition pour éviter le chevauchement
-            plt.tight_layout()
-            # Afficher le graphique
-            plt.show()
-        else:
-            raise KeyError(
-                "Veuillez inserer les listes de composants, "
-                + "Ou ajouter une frequence de coupure + une liste de composants."
+        if res_values is not None:
+            pulsations_W0, res = _batch_inputs(order, cutoff_frequencies, res_values)
+            condo = _butterworth_kernel(
+                "highpass", "R", order, pulsations_W0, res, q_values
+            )
+        elif condo_values is not None:
+            pulsations_W0, condo = _batch_inputs(
+                order, cutoff_frequencies, condo_values
             )
+            res = _butterworth_kernel(
+                "highpass", "C", order, pulsations_W0, condo, q_values
+            )
+        else:
+            raise KeyError("Veuillez au moin insérer une liste de composants.")
+        return {"R": res, "C": condo}
+
+    @timed("butterworth.highpass.stages")
+    def stages(self, order, cutoff_frequency, res_values=None, condo_values=None):
+        """
+        Retourne les étages du filtre au même format que bessel et tchebychev.
+
+        Format de sortie --> [{"params": {"R": .., "C": ..}, "sos": section},
+                              {"params": {"R1": .., "R2": .., "C1": .., "C2": ..},
+                               "sos": section}, ...]
+        """
+        values, _ = _single_design(
+            self, order, cutoff_frequency, res_values, condo_values
+        )
+        sections = _butterworth_sections("highpass", order, values["R"], values["C"])[0]
+        return _butterworth_stages(
+            order, values["R"][0].tolist(), values["C"][0].tolist(), sections
+        )
+
+    def stages_batch(
+        self, order, cutoff_frequencies, res_values=None, condo_values=None
+    ):
+        """
+        Version vectorisée de stages() : chaque composant d'un étage est un
+        tableau (n,) et chaque section un tableau (n, 6).
+        """
+        values = self.components_batch(
+            order, cutoff_frequencies, res_values=res_values, condo_values=condo_values
+        )
+        sections = _butterworth_sections("highpass", order, values["R"], values["C"])
+        return _butterworth_stages(
+            order, values["R"].T, values["C"].T, sections.transpose(1, 0, 2)
+        )
+
+    @timed("butterworth.highpass.sos")
+    def sos(self, order, cutoff_frequency, res_values=None, condo_values=None):
+        """
+        Retourne le tableau des sections du second ordre (nbr_étages x 6).
+
+        Format d'une ligne --> [b2, b1, b0, a2, a1, a0] (voir filters.snk.sos)
+        """
+        values, _ = _single_design(
+            self, order, cutoff_frequency, res_values, condo_values
+        )
+        return _butterworth_sections("highpass", order, values["R"], values["C"])[0]
+
+    def sos_batch(self, order, cutoff_frequencies, res_values=None, condo_values=None):
+        """
+        Version vectorisée de sos() : tableau (n, nbr_étages, 6) pour n conceptions.
+        """
+        values = self.components_batch(
+            order, cutoff_frequencies, res_values=res_values, condo_values=condo_values
+        )
+        return _butterworth_sections("highpass", order, values["R"], values["C"])
+
+    def response(
+        self, order, cutoff_frequency=None, res_values=None, condo_values=None
+    ):
+        """
+        Calcule le diagramme de Bode sans rien afficher.
+
+        Mêmes paramètres que graphs() ; retourne (freq, magnitude_db, phase_deg).
+        """
+        sos, cutoff_frequency = _graph_sections(
+            self, "highpass", order, cutoff_frequency, res_values, condo_values
+        )
+        return _bode_response(sos, order, cutoff_frequency)
+
+    def graphs(
+        self,
+        order,
+        cutoff_frequency=None,
+        res_values=None,
+        condo_values=None,
+        path=None,
+    ):
+        """
+        Affiche le diagramme de Bode, ou l'écrit dans le fichier path sans
+        affichage (moteur non interactif) si path est donné.
+        """
+        freq_hz, mag, phase = self.response(
+            order, cutoff_frequency, res_values, condo_values
+        )
+        return render_bode(
+            freq_hz,
+            mag,
+            phase,
+            path=path,
+            title=f"Butterworth Passe-Haut ordre {order}",
+        )
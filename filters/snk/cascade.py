@@ -0,0 +1,361 @@
+import numpy as np
+
+from ..instrumentation import phase, timed
+from .sos import DAMPINGS, default_damping, sos_to_tf, transfer_function
+
+# Moteur de calcul commun aux cascades Sallen-Key des trois familles.
+#
+# Une conception est décrite par son prototype, la liste des (omega0_norm, Q)
+# de ses étages (Q = 0 pour la cellule RC du premier ordre), et par les
+# composants imposés de chaque étage sous forme de tableaux (..., n_étages) :
+#     R1, R2, C1, C2  (R1 et C1 seulement pour un étage du premier ordre)
+# où NaN marque un composant à calculer. Tous les étages de toutes les
+# conceptions sont résolus en une seule passe NumPy, par diffusion.
+#
+# Le terme en s du dénominateur dépend du montage (voir sos.DAMPINGS) :
+#     "sum_r" : a1 = (R1 + R2) C2   (passe-bas Sallen-Key)
+#     "sum_c" : a1 = R1 (C1 + C2)   (passe-haut Sallen-Key, et équations
+#                                    historiques du passe-bas de tchebychev)
+# et dans les deux cas a2 = R1 R2 C1 C2 = 1 / omega0^2 et a1 = 1 / (omega0 Q).
+
+COMPONENTS = ("R1", "R2", "C1", "C2")
+
+
+def stage_pulsations(filter_type, cutoff_frequency, omega0_norm):
+    """
+    Pulsations propres (rad/s) des étages.
+
+    omega0 = 2 pi fc * omega0_norm en passe-bas, 2 pi fc / omega0_norm en
+    passe-haut (transformation passe-bas -> passe-haut du prototype).
+    cutoff_frequency : scalaire ou (n,) ; retourne (n_étages,) ou (n, n_étages).
+    """
+    if filter_type not in ["lowpass", "highpass"]:
+        raise ValueError("filter_type doit être 'lowpass' ou 'highpass'.")
+    omega_c = 2 * np.pi * np.asarray(cutoff_frequency, dtype=float)[..., np.newaxis]
+    omega0_norm = np.asarray(omega0_norm, dtype=float)
+    if filter_type == "lowpass":
+        return omega_c * omega0_norm
+    return omega_c / omega0_norm
+
+
+def _full(value, shape):
+    """Vue de value à la forme complète (np.broadcast_to seulement si nécessaire)."""
+    value = np.asarray(value)
+    return value if value.shape == shape else np.broadcast_to(value, shape)
+
+
+def _columns(value, columns):
+    """Étages columns de value (inchangé s'il est constant le long des étages)."""
+    if value.ndim == 0 or value.shape[-1] == 1:
+        return value
+    return value[..., columns]
+
+
+def _same(a, b):
+    """Égalité élément par élément, deux NaN étant considérés égaux."""
+    return bool(np.all((a == b) | (np.isnan(a) & np.isnan(b))))
+
+
+def _sum_r_direct(R1, R2, omega0, qq):
+    # C2 = 1 / ((R1 + R2) omega0 Q), C1 = (R1 + R2) Q / (R1 R2 omega0)
+    total = R1 + R2
+    c2 = total * omega0
+    c2 *= qq
+    np.divide(1, c2, out=c2)
+    total *= qq
+    product = R1 * R2
+    product *= omega0
+    total /= product
+    return total, c2
+
+
+def _quadratic(a, b1, b2, omega0, qq):
+    """
+    Racines x1 + x2 = 1 / (omega0 a Q), x1 x2 = 1 / (omega0^2 b1 b2) ;
+    retourne (x1, x2 >= x1, discriminant).
+    """
+    total = omega0 * a
+    total *= qq
+    np.divide(1, total, out=total)
+    product = omega0**2 * b1
+    product *= b2
+    np.divide(1, product, out=product)
+    product *= 4
+    discriminant = total**2
+    discriminant -= product
+    x2 = np.sqrt(discriminant, out=product)
+    x2 += total
+    x2 /= 2
+    total -= x2
+    return total, x2, discriminant
+
+
+@timed("cascade")
+def solve_stages(
+    filter_type, omega0, q, R1=None, R2=None, C1=None, C2=None, prefer="R", damping=None
+):
+    """
+    Calcule les composants manquants de tous les étages d'une cascade.
+
+    - omega0 : pulsations propres des étages (..., n_étages), voir stage_pulsations
+    - q : facteurs de qualité (n_étages,), 0 pour la cellule du premier ordre
+    - R1, R2, C1, C2 : composants imposés (..., n_étages), NaN ou None si
+                       inconnus ; un étage du premier ordre utilise R1 et C1
+    - prefer : paire retenue ('R' ou 'C') si les deux paires d'un étage du
+               second ordre sont imposées ; au premier ordre R est prioritaire
+    - damping : 'sum_r' ou 'sum_c' (voir DAMPINGS), selon filter_type par défaut
+
+    Retourne {"R1", "R2", "C1", "C2"} : tableaux (..., n_étages) complétés
+    (R2 et C2 valent NaN pour un étage du premier ordre). Un tableau imposé
+    déjà complet peut être retourné tel quel, sans copie.
+    """
+    if damping is None:
+        damping = default_damping(filter_type)
+    if damping not in DAMPINGS:
+        raise ValueError(f"damping doit être l'un de {DAMPINGS}.")
+    omega0 = np.asarray(omega0, dtype=float)
+    q = np.asarray(q, dtype=float)
+    shape = np.broadcast_shapes(omega0.shape, q.shape)
+    has_r = R1 is not None or R2 is not None
+    has_c = C1 is not None or C2 is not None
+    R1, R2, C1, C2 = (
+        np.asarray(np.nan if x is None else x, dtype=float) for x in (R1, R2, C1, C2)
+    )
+    # Le premier ordre est une propriété de l'étage : sélection par colonnes
+    first = q == 0
+    second = ~first
+
+    # Paire retenue par étage du second ordre : un booléen si une seule
+    # paire est fournie (cas courant, sans sélection élément par élément)
+    if has_r and has_c:
+        r_pair = ~(np.isnan(R1) | np.isnan(R2))
+        c_pair = ~(np.isnan(C1) | np.isnan(C2))
+        use_r = r_pair & ((prefer == "R") | ~c_pair)
+        complete = use_r | c_pair
+    else:
+        use_r = has_r
+        given_1, given_2 = (R1, R2) if has_r else (C1, C2)
+        complete = ~(np.isnan(given_1) | np.isnan(given_2))
+    use_c = (not use_r) if isinstance(use_r, bool) else ~use_r
+    r_first, c_first = (_columns(x, first) for x in (R1, C1))
+    r_given = ~np.isnan(r_first)
+    if (
+        not _full(complete, shape)[..., second].all()
+        or not (r_given | ~np.isnan(c_first)).all()
+    ):
+        missing = np.where(first, np.isnan(R1) & np.isnan(C1), ~complete)
+        stage = np.argwhere(_full(missing, shape))[0][-1] + 1
+        raise ValueError(
+            f"Étage {stage} : veuillez fournir soit (R1, R2), soit (C1, C2)."
+        )
+
+    # Même ordre des opérations que les formules historiques des concepteurs.
+    # Une branche qu'aucun étage du second ordre n'utilise n'est pas calculée.
+    if isinstance(use_r, bool):
+        any_r, any_c = use_r, use_c
+    else:
+        stage_r = _full(use_r, shape)[..., second]
+        any_r, any_c = bool(stage_r.any()), not stage_r.all()
+    qq = np.where(first, 1.0, q)
+    r1_c = r2_c = c1_r = c2_r = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if damping == "sum_r":
+            if any_r:
+                # R imposées : formules directes
+                c1_r, c2_r = _sum_r_direct(R1, R2, omega0, qq)
+            if any_c:
+                # C imposés : R1 + R2 = 1 / (omega0 C2 Q), R1 R2 = 1 / (omega0^2 C1 C2)
+                r1_c, r2_c, discriminant = _quadratic(C2, C1, C2, omega0, qq)
+                _check_discriminant(discriminant, use_c, C1, C2, ("C1", "C2"), q)
+        else:
+            if any_c:
+                # C imposés : formules directes
+                r2_c, r1_c = _sum_r_direct(C1, C2, omega0, qq)
+            if any_r:
+                # R imposées : C1 + C2 = 1 / (omega0 R1 Q), C1 C2 = 1 / (omega0^2 R1 R2)
+                c1_r, c2_r, discriminant = _quadratic(R1, R1, R2, omega0, qq)
+                _check_discriminant(discriminant, use_r, R2, R1, ("R2", "R1"), q)
+
+        # Premier ordre : R C = 1 / omega0, R prioritaire
+        rc = 1 / (_columns(omega0, first) * np.where(r_given, r_first, c_first))
+
+    components = {}
+    for name, given, computed, first_value in (
+        ("R1", R1, r1_c, np.where(r_given, r_first, rc)),
+        ("R2", R2, r2_c, np.nan),
+        ("C1", C1, c1_r, np.where(r_given, rc, c_first)),
+        ("C2", C2, c2_r, np.nan),
+    ):
+        keep = use_r if name[0] == "R" else use_c
+        if isinstance(keep, bool):
+            value = given if keep else computed
+        else:
+            value = np.where(keep, given, computed)
+        if value is given and np.shape(value) == shape:
+            # Composants imposés retournés tels quels s'ils sont déjà complets
+            if _same(value[..., first], first_value):
+                components[name] = value
+                continue
+            value = value.copy()
+        elif np.shape(value) != shape:
+            value = np.array(_full(value, shape))
+        value[..., first] = first_value
+        components[name] = value
+    return components
+
+
+def _check_discriminant(discriminant, mask, big, small, names, q):
+    """Racines réelles si big >= 4 * small * Q^2 (étages du second ordre de mask)."""
+    invalid = _full(mask & (discriminant < 0), discriminant.shape)
+    invalid = invalid[..., q != 0]
+    if invalid.any():
+        index = tuple(np.argwhere(invalid)[0])
+        stage = np.flatnonzero(q != 0)[index[-1]]
+        index = index[:-1] + (stage,)
+        big, small = (_full(x, discriminant.shape)[index] for x in (big, small))
+        raise ValueError(
+            f"Condition non respectée au stage {stage + 1}: "
+            f"{names[0]} ({big}) >= 4 * {names[1]} "
+            f"({small}) * Q0^2 ({q[stage] ** 2})."
+        )
+
+
+def cascade_sections(filter_type, q, components, damping=None):
+    """
+    Sections [b2, b1, b0, a2, a1, a0] (..., n_étages, 6) des étages résolus.
+
+    components : {"R1", "R2", "C1", "C2"} au format de solve_stages().
+    """
+    if damping is None:
+        damping = default_damping(filter_type)
+    R1, R2, C1, C2 = (np.asarray(components[name], dtype=float) for name in COMPONENTS)
+    first = np.asarray(q) == 0
+    rc = R1 * C1
+    a2 = np.where(first, 0.0, R1 * R2 * C1 * C2)
+    if damping == "sum_r":
+        a1 = np.where(first, rc, (R1 + R2) * C2)
+    else:
+        a1 = np.where(first, rc, R1 * (C1 + C2))
+    zero = np.zeros_like(a2)
+    one = np.ones_like(a2)
+    if filter_type == "lowpass":
+        num = [zero, zero, one]
+    else:
+        num = [a2, np.where(first, rc, 0.0), zero]
+    return np.stack(num + [a2, a1, one], axis=-1)
+
+
+def stage_params(q, components):
+    """
+    Composants d'une conception regroupés par étage, au format "params" :
+    {"R", "C"} au premier ordre, {"R1", "R2", "C1", "C2"} sinon.
+    """
+    params = []
+    for i, q0 in enumerate(q):
+        if q0 == 0:
+            params.append(
+                {"R": float(components["R1"][i]), "C": float(components["C1"][i])}
+            )
+        else:
+            params.append({name: float(components[name][i]) for name in COMPONENTS})
+    return params
+
+
+def design_cascade(
+    prototype,
+    filter_type,
+    cutoff_frequency,
+    R1=None,
+    R2=None,
+    C1=None,
+    C2=None,
+    prefer="R",
+    damping=None,
+):
+    """
+    Conçoit une cascade complète à partir de son prototype.
+
+    - prototype : [(omega0_norm, Q), ...] par étage (bessel_poles,
+                  tchebychev_poles, filters.snk.coefficients...)
+    - cutoff_frequency : scalaire ou (n,) pour n conceptions
+    - R1, R2, C1, C2, prefer, damping : voir solve_stages
+
+    Retourne (components, sos) : composants (..., n_étages) et sections
+    (..., n_étages, 6).
+    """
+    prototype = np.asarray(prototype, dtype=float).reshape(-1, 2)
+    omega0_norm, q = prototype[:, 0], prototype[:, 1]
+    omega0 = stage_pulsations(filter_type, cutoff_frequency, omega0_norm)
+    components = solve_stages(
+        filter_type, omega0, q, R1, R2, C1, C2, prefer=prefer, damping=damping
+    )
+    return components, cascade_sections(filter_type, q, components, damping)
+
+
+def split_pairs(values, q, layout="flat"):
+    """
+    Répartit une liste de composants imposés entre les étages.
+
+    - values : liste ou tableau (..., n_valeurs), None pour une valeur
+               inconnue ; None pour une liste absente
+    - layout : 'flat' (butterworth, tchebychev) : la cellule du premier
+               ordre occupe une valeur, chaque étage du second ordre deux ;
+               'paired' (bessel) : deux emplacements par étage, le second
+               étant ignoré au premier ordre
+
+    Retourne (premier, second) composant de chaque étage, (..., n_étages),
+    NaN si inconnu ; les valeurs manquantes en fin de liste sont inconnues.
+    """
+    n_stages = len(q)
+    if values is None:
+        return None, None
+    offset = int(q[0] == 0) if layout == "flat" else 0
+    n_values = 2 * n_stages - offset
+    values = np.asarray(values, dtype=float)[..., :n_values]
+    padding = n_values - values.shape[-1]
+    if padding > 0:
+        values = np.concatenate(
+            [values, np.full(values.shape[:-1] + (padding,), np.nan)], axis=-1
+        )
+    first = np.empty(values.shape[:-1] + (n_stages,))
+    second = np.empty_like(first)
+    if offset:
+        first[..., 0] = values[..., 0]
+        second[..., 0] = np.nan
+    first[..., offset:] = values[..., offset::2]
+    second[..., offset:] = values[..., offset + 1 :: 2]
+    return first, second
+
+
+def _trim(coefficients):
+    """Retire les coefficients nuls de tête d'un polynôme (np.trim_zeros, plus vite)."""
+    return coefficients[np.flatnonzero(coefficients)[0] :]
+
+
+def cascade_stages(q, components, sos, damping=None):
+    """
+    Étages {"tf", "params", "sos"} d'une conception résolue, au format
+    historique de bessel et tchebychev (une TransferFunction par étage).
+
+    damping : montage imposé à design_cascade(), noté dans chaque étage
+              (stage["damping"]) pour que les sections puissent être
+              recalculées à partir des composants (voir sos.stage_section)
+    """
+    stages = []
+    for i, params in enumerate(stage_params(q, components), start=1):
+        with phase(f"stage[{i}]"):
+            section = sos[i - 1]
+            tf = transfer_function(_trim(section[:3]), _trim(section[3:]))
+            stage = {"tf": tf, "params": params, "sos": section}
+            if damping is not None:
+                stage["damping"] = damping
+            stages.append(stage)
+    return stages
+
+
+def cascade_output(sos, stages, output="tf"):
+    """Retourne (sos, stages) ou (TransferFunction globale, stages) selon output."""
+    if output == "sos":
+        return sos, stages
+    with phase("combine"):
+        return transfer_function(*sos_to_tf(sos)), stages
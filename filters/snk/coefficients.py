@@ -0,0 +1,181 @@
+import csv
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# Tables (omega0_norm, Q) des étages des trois familles, sous forme de
+# tableaux NumPy en lecture seule partagés par tout le processus.
+#
+# Les tables sont construites une seule fois par (famille, ondulation,
+# normalisation), à partir des générateurs analytiques des modules bessel,
+# butterworth et tchebychev : elles couvrent tous les ordres jusqu'à
+# MAX_ORDER, là où docs/table.csv s'arrête à l'ordre 10 et à deux
+# ondulations. Ligne = ordre, colonne = étage (même ordre que les
+# concepteurs : cellule du premier ordre en tête, puis Q croissant) ; les
+# cases au-delà du nombre d'étages valent NaN.
+#
+# Les concepteurs (bessel, butterworth, tchebychev) et filters.snk.order
+# lisent leurs étages ici ; validate_coefficients() compare ces tables aux
+# valeurs de docs/table.csv.
+
+FAMILIES = ("bessel", "butterworth", "tchebychev")
+MAX_ORDER = 16
+
+# Fichier de référence, présent dans les sources (pas dans le paquet installé)
+REFERENCE_TABLE = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "docs", "table.csv"
+)
+
+Coefficients = namedtuple("Coefficients", ["omega0", "q", "n_stages"])
+
+
+def _poles(family, order, ripple_db, normalization):
+    # Import différé : les modules des familles importent ce module
+    from .bessel import bessel_poles
+    from .butterworth import butterworth_q_values
+    from .tchebychev import tchebychev_poles
+
+    if family == "butterworth":
+        return tuple((1.0, q) for q in butterworth_q_values(order))
+    if family == "bessel":
+        return bessel_poles(order, normalization)
+    return tchebychev_poles(order, ripple_db)
+
+
+def _options(family, ripple_db, normalization):
+    """Ne garde que l'option qui concerne la famille (clé du cache)."""
+    if family not in FAMILIES:
+        raise ValueError(f"family doit être l'une de {FAMILIES}.")
+    if family == "tchebychev":
+        return float(ripple_db), None
+    if family == "bessel":
+        return None, normalization
+    return None, None
+
+
+@lru_cache(maxsize=64)
+def _table(family, ripple_db, normalization):
+    n_stages = np.array([0] + [(n + 1) // 2 for n in range(1, MAX_ORDER + 1)])
+    omega0 = np.full((MAX_ORDER + 1, n_stages[-1]), np.nan)
+    q = np.full_like(omega0, np.nan)
+    for order in range(1, MAX_ORDER + 1):
+        poles = np.array(_poles(family, order, ripple_db, normalization))
+        omega0[order, : len(poles)] = poles[:, 0]
+        q[order, : len(poles)] = poles[:, 1]
+    for array in (omega0, q, n_stages):
+        array.flags.writeable = False
+    return Coefficients(omega0, q, n_stages)
+
+
+def coefficient_table(family, ripple_db=1.0, normalization="mag"):
+    """
+    Tables des étages d'une famille pour les ordres 0 à MAX_ORDER.
+
+    - ripple_db : ondulation (tchebychev uniquement)
+    - normalization : normalisation des pôles (bessel uniquement)
+
+    Retourne Coefficients(omega0, q, n_stages) : omega0 et q de forme
+    (MAX_ORDER + 1, nbr_étages_max), n_stages de forme (MAX_ORDER + 1,),
+    tous en lecture seule. Une même table est retournée à chaque appel.
+    """
+    return _table(family, *_options(family, ripple_db, normalization))
+
+
+def stage_coefficients(family, order, ripple_db=1.0, normalization="mag"):
+    """
+    Pulsations normalisées et facteurs de qualité des étages d'un ordre.
+
+    Retourne (omega0_norm, q), deux tableaux (nbr_étages,) en lecture seule :
+    des vues sur la table partagée jusqu'à MAX_ORDER, calculés à la demande
+    au-delà. q vaut 0 pour la cellule du premier ordre.
+    """
+    options = _options(family, ripple_db, normalization)
+    table_order = isinstance(order, (int, np.integer)) and not isinstance(order, bool)
+    if table_order and 1 <= order <= MAX_ORDER:
+        table = _table(family, *options)
+        n = table.n_stages[order]
+        return table.omega0[order, :n], table.q[order, :n]
+    poles = np.array(_poles(family, order, *options))
+    omega0, q = poles[:, 0].copy(), poles[:, 1].copy()
+    omega0.flags.writeable = q.flags.writeable = False
+    return omega0, q
+
+
+def _number(text):
+    return None if text.strip() in ("", "-") else float(text)
+
+
+def read_reference_table(path=REFERENCE_TABLE):
+    """
+    Lit docs/table.csv.
+
+    Retourne {(famille, ondulation): {ordre: [(omega0_norm, q), ...]}} avec
+    les clés ("butterworth", None), ("bessel", None), ("tchebychev", 0.5) et
+    ("tchebychev", 1.0). Une case '-' est une cellule du premier ordre
+    (q = 0) ; la table ne donne pas les pulsations de Butterworth (toutes
+    égales à 1).
+    """
+    columns = [("butterworth", None), ("bessel", None)]
+    columns += [("tchebychev", 0.5), ("tchebychev", 1.0)]
+    tables = {key: {} for key in columns}
+    order = None
+    with open(path, newline="") as f:
+        rows = csv.reader(f)
+        next(rows)  # En-tête
+        for row in rows:
+            if not row:
+                continue
+            # Les lignes suivantes d'un même ordre n'ont pas toujours la
+            # colonne "Ordre" (7 valeurs au lieu de 8)
+            if len(row) == 8:
+                if row[0].strip() != "-":
+                    order = int(row[0])
+                row = row[1:]
+            values = [_number(text) for text in row]
+            butterworth_q = values[0]
+            stages = [(1.0, butterworth_q or 0.0)]
+            for i in (1, 3, 5):
+                stages.append((values[i], values[i + 1] or 0.0))
+            for key, stage in zip(columns, stages):
+                tables[key].setdefault(order, []).append(stage)
+    return tables
+
+
+def validate_coefficients(path=REFERENCE_TABLE, rtol=1e-3):
+    """
+    Compare les tables calculées aux valeurs de docs/table.csv.
+
+    Les valeurs du fichier sont arrondies à 4 décimales et celles de Bessel
+    proviennent d'anciennes tables un peu moins précises, d'où la tolérance
+    relative par défaut. Retourne la liste des écarts supérieurs à rtol :
+    [{"family", "ripple_db", "order", "stage", "name", "table", "computed"}],
+    vide si les tables concordent.
+    """
+    mismatches = []
+    for (family, ripple_db), orders in read_reference_table(path).items():
+        for order, stages in orders.items():
+            computed = stage_coefficients(family, order, ripple_db or 1.0)
+            if len(computed[0]) != len(stages):
+                raise ValueError(
+                    f"{family} ordre {order} : {len(computed[0])} étages calculés, "
+                    f"{len(stages)} dans la table."
+                )
+            for stage, expected in enumerate(stages):
+                for name, value, reference in zip(
+                    ("omega0", "q"), (computed[0][stage], computed[1][stage]), expected
+                ):
+                    if abs(value - reference) > rtol * abs(reference):
+                        mismatches.append(
+                            {
+                                "family": family,
+                                "ripple_db": ripple_db,
+                                "order": order,
+                                "stage": stage + 1,
+                                "name": name,
+                                "table": reference,
+                                "computed": float(value),
+                            }
+                        )
+    return mismatches
@@ -0,0 +1,56 @@
+from .bessel import highpass, lowpass
+from .butterworth import Butterworth_HighPass, Butterworth_LowPass
+from .tchebychev import TchebychevFilter
+
+# Point d'entrée commun aux trois familles de filtres actifs.
+#
+# Chaque famille a ses propres noms de paramètres (res_values/condo_values
+# pour butterworth, r_vals/c_vals pour bessel et tchebychev) ; design_stages()
+# les unifie et retourne toujours la liste d'étages {"params", "sos", ...}.
+
+FAMILIES = ("bessel", "butterworth", "tchebychev")
+
+
+def design_stages(
+    family, filter_type, order, cutoff_frequency, r_vals=None, c_vals=None, **options
+):
+    """
+    Calcule les étages d'un filtre actif de n'importe quelle famille.
+
+    - family : 'bessel', 'butterworth' ou 'tchebychev'
+    - filter_type : 'lowpass' ou 'highpass'
+    - r_vals / c_vals : composants imposés, au format de la famille choisie
+    - options : normalization (bessel), ripple_db (tchebychev)
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"family doit être l'une de {FAMILIES}.")
+    if filter_type not in ["lowpass", "highpass"]:
+        raise ValueError("filter_type doit être 'lowpass' ou 'highpass'.")
+    # Copies : bessel complète les listes reçues en place
+    r_vals = None if r_vals is None else list(r_vals)
+    c_vals = None if c_vals is None else list(c_vals)
+
+    if family == "butterworth":
+        if filter_type == "lowpass":
+            designer = Butterworth_LowPass()
+        else:
+            designer = Butterworth_HighPass()
+        return designer.stages(
+            order, cutoff_frequency, res_values=r_vals, condo_values=c_vals
+        )
+    if family == "bessel":
+        designer = (lowpass if filter_type == "lowpass" else highpass)(**options)
+        _, stages = designer.components(
+            order, cutoff_frequency, r_vals, c_vals, output="sos"
+        )
+        return stages
+    _, stages = TchebychevFilter().design_filter(
+        order,
+        cutoff_frequency,
+        filter_type,
+        c_vals=c_vals,
+        r_vals=r_vals,
+        output="sos",
+        **options,
+    )
+    return stages
@@ -0,0 +1,204 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .coefficients import FAMILIES, MAX_ORDER, stage_coefficients
+
+# Ordre minimal d'un filtre actif à partir d'un gabarit :
+#  - bande passante jusqu'à passband_freq, atténuation <= passband_attenuation_db
+#  - bande coupée dès stopband_freq, atténuation >= stopband_attenuation_db
+#
+# Butterworth et Tchebychev ont une formule fermée. Bessel n'en a pas :
+# pour chaque ordre, on cherche les pulsations normalisées où l'atténuation
+# atteint les deux niveaux (interpolation dans une grille mise en cache, puis
+# quelques itérations de Newton sur l'atténuation exacte des étages) et on
+# garde le premier ordre dont le rapport de ces pulsations tient dans le
+# gabarit. Toutes les entrées peuvent être des tableaux (lot de gabarits).
+
+OrderEstimate = namedtuple("OrderEstimate", ["order", "cutoff_freq"])
+
+# Grille des pulsations normalisées pour le point de départ de Newton (Bessel)
+_GRID = np.logspace(-3, 3, 601)
+_NEWTON_STEPS = 4
+
+# Marge sur l'ordre exact des formules fermées : un gabarit atteint tout
+# juste par l'ordre n ne doit pas demander n + 1 à cause des arrondis
+_ORDER_TOLERANCE = 1e-9
+
+
+def _stage_attenuation(u, omega0, q):
+    """
+    Atténuation (dB) d'une cascade normalisée et sa dérivée par rapport à u.
+
+    u = ln(w) est de forme (m, 1), omega0 et q de forme (nbr_étages,) ; q = 0
+    désigne la cellule du premier ordre, |H|^-2 = 1 + x avec x = (w / omega0)^2,
+    et une cellule du second ordre donne |H|^-2 = (1 - x)^2 + x / Q^2.
+    """
+    x = np.exp(2 * (u - np.log(omega0)))
+    first = q == 0
+    inv_q2 = np.divide(1.0, q**2, out=np.zeros_like(q), where=~first)
+    factor = np.where(first, 1 + x, (1 - x) ** 2 + x * inv_q2)
+    slope = np.where(first, 1.0, inv_q2 - 2 * (1 - x))
+    attenuation = 10 / np.log(10) * np.log(factor).sum(axis=-1)
+    derivative = 20 / np.log(10) * (x * slope / factor).sum(axis=-1)
+    return attenuation, derivative
+
+
+@lru_cache(maxsize=128)
+def _bessel_grid(order, normalization):
+    omega0, q = stage_coefficients("bessel", order, normalization=normalization)
+    attenuation, _ = _stage_attenuation(np.log(_GRID)[:, np.newaxis], omega0, q)
+    attenuation.flags.writeable = False
+    return omega0, q, attenuation
+
+
+def _bessel_pulsation(order, normalization, attenuation_db):
+    """Pulsation normalisée où un filtre de Bessel atteint attenuation_db."""
+    omega0, q, grid = _bessel_grid(order, normalization)
+    # L'atténuation croît avec w : interpolation en ln(w), puis Newton
+    u = np.interp(attenuation_db, grid, np.log(_GRID))[:, np.newaxis]
+    for _ in range(_NEWTON_STEPS):
+        attenuation, derivative = _stage_attenuation(u, omega0, q)
+        u = u - ((attenuation - attenuation_db) / derivative)[:, np.newaxis]
+    return np.exp(u[:, 0])
+
+
+def _bessel_order(passband_db, stopband_db, selectivity, normalization, max_order):
+    order = np.zeros(selectivity.shape, dtype=int)
+    omega_pass = np.full(selectivity.shape, np.nan)
+    pending = np.arange(selectivity.size)
+    for n in range(1, max_order + 1):
+        w_pass = _bessel_pulsation(n, normalization, passband_db[pending])
+        w_stop = _bessel_pulsation(n, normalization, stopband_db[pending])
+        done = w_stop <= w_pass * selectivity[pending] * (1 + _ORDER_TOLERANCE)
+        order[pending[done]] = n
+        omega_pass[pending[done]] = w_pass[done]
+        pending = pending[~done]
+        if not pending.size:
+            break
+    else:
+        raise ValueError(
+            f"Gabarit inatteignable avec un filtre de Bessel d'ordre <= {max_order}."
+        )
+    return order, omega_pass
+
+
+def minimum_order(
+    family,
+    filter_type,
+    passband_freq,
+    passband_attenuation_db,
+    stopband_freq,
+    stopband_attenuation_db,
+    normalization="mag",
+    max_order=MAX_ORDER,
+):
+    """
+    Ordre minimal d'un filtre respectant un gabarit, et sa fréquence de coupure.
+
+    - family : 'bessel', 'butterworth' ou 'tchebychev'
+    - filter_type : 'lowpass' ou 'highpass'
+    - passband_freq, stopband_freq : limites des bandes passante et coupée (Hz)
+    - passband_attenuation_db : atténuation maximale dans la bande passante
+    - stopband_attenuation_db : atténuation minimale dans la bande coupée
+    - normalization : normalisation des pôles (bessel uniquement)
+    - max_order : ordre maximal essayé (bessel uniquement)
+
+    Les quatre grandeurs du gabarit peuvent être des tableaux de formes
+    compatibles (lot de gabarits).
+
+    Retourne OrderEstimate(order, cutoff_freq) : cutoff_freq est la fréquence
+    de coupure à passer au concepteur pour que la bande passante respecte
+    exactement passband_attenuation_db (-3 dB pour Butterworth et Bessel). Pour
+    Tchebychev, la coupure est la fin de la bande d'ondulation : concevoir avec
+    ripple_db = passband_attenuation_db.
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"family doit être l'une de {FAMILIES}.")
+    if filter_type not in ["lowpass", "highpass"]:
+        raise ValueError("filter_type doit être 'lowpass' ou 'highpass'.")
+    passband_freq, passband_db, stopband_freq, stopband_db = np.broadcast_arrays(
+        *(
+            np.asarray(value, dtype=float)
+            for value in (
+                passband_freq,
+                passband_attenuation_db,
+                stopband_freq,
+                stopband_attenuation_db,
+            )
+        )
+    )
+    if not (passband_db > 0).all():
+        raise ValueError("L'atténuation en bande passante doit être positive.")
+    if not (stopband_db > passband_db).all():
+        raise ValueError(
+            "L'atténuation en bande coupée doit dépasser celle de la bande passante."
+        )
+    # Sélectivité : rapport des limites de bandes, > 1 pour un gabarit valide
+    if filter_type == "lowpass":
+        selectivity = stopband_freq / passband_freq
+    else:
+        selectivity = passband_freq / stopband_freq
+    if not (selectivity > 1).all():
+        raise ValueError(
+            "La bande coupée doit être au-delà de la bande passante "
+            "(stopband_freq > passband_freq pour un passe-bas, < pour un passe-haut)."
+        )
+
+    if family == "bessel":
+        order, omega_pass = _bessel_order(
+            passband_db.ravel(),
+            stopband_db.ravel(),
+            selectivity.ravel(),
+            normalization,
+            max_order,
+        )
+        order = order.reshape(selectivity.shape)
+        omega_pass = omega_pass.reshape(selectivity.shape)
+    else:
+        # Rapport des excès d'atténuation 10^(A/10) - 1 entre les deux bandes
+        ratio = np.expm1(np.log(10) / 10 * stopband_db) / np.expm1(
+            np.log(10) / 10 * passband_db
+        )
+        if family == "butterworth":
+            exact = np.log(ratio) / (2 * np.log(selectivity))
+        else:
+            exact = np.arccosh(np.sqrt(ratio)) / np.arccosh(selectivity)
+        order = np.maximum(np.ceil(exact - _ORDER_TOLERANCE), 1).astype(int)
+        if family == "butterworth":
+            # |H|^-2 = 1 + (w / wc)^(2n) : atténuation passband_db en w_pass
+            omega_pass = np.expm1(np.log(10) / 10 * passband_db) ** (1 / (2 * order))
+        else:
+            omega_pass = np.ones(order.shape)
+
+    if filter_type == "lowpass":
+        cutoff_freq = passband_freq / omega_pass
+    else:
+        cutoff_freq = passband_freq * omega_pass
+    if order.ndim == 0:
+        return OrderEstimate(int(order), float(cutoff_freq))
+    return OrderEstimate(order, cutoff_freq)
+
+
+def minimum_orders(
+    filter_type,
+    passband_freq,
+    passband_attenuation_db,
+    stopband_freq,
+    stopband_attenuation_db,
+    **options,
+):
+    """minimum_order() pour chacune des trois familles : {famille: OrderEstimate}."""
+    return {
+        family: minimum_order(
+            family,
+            filter_type,
+            passband_freq,
+            passband_attenuation_db,
+            stopband_freq,
+            stopband_attenuation_db,
+            **options,
+        )
+        for family in FAMILIES
+    }
@@ -0,0 +1,193 @@
+import numpy as np
+
+from ..instrumentation import timed
+
+# Représentation d'une cascade en sections du second ordre (SOS).
+#
+# Chaque ligne du tableau (n_stages x 6) décrit une cellule analogique :
+#     [b2, b1, b0, a2, a1, a0]  =>  H(s) = (b2 s^2 + b1 s + b0) / (a2 s^2 + a1 s + a0)
+# c'est-à-dire les coefficients num/den d'une TransferFunction (puissances
+# décroissantes) complétés à gauche par des zéros jusqu'au degré 2.
+# Une cellule du premier ordre a donc b2 = a2 = 0.
+#
+# Le terme en s du dénominateur d'une cellule Sallen-Key dépend du montage :
+#     "sum_r" : a1 = (R1 + R2) C2   (passe-bas Sallen-Key)
+#     "sum_c" : a1 = R1 (C1 + C2)   (passe-haut Sallen-Key, et équations
+#                                    historiques du passe-bas de tchebychev)
+# Un étage dont le montage n'est pas celui de son type de filtre l'indique
+# dans stage["damping"] (passe-bas de tchebychev).
+
+DAMPINGS = ("sum_r", "sum_c")
+
+
+def default_damping(filter_type):
+    """Montage Sallen-Key à gain unitaire correspondant au type de filtre."""
+    return "sum_r" if filter_type == "lowpass" else "sum_c"
+
+
+def stage_damping(filter_type, stage):
+    """Montage d'un étage : stage["damping"], sinon celui de filter_type."""
+    return stage.get("damping") or default_damping(filter_type)
+
+
+def first_order_section(filter_type, R, C):
+    """
+    Construit la section d'une cellule RC du premier ordre.
+
+    - Passe-bas : H(s) = 1 / [1 + s R C]
+    - Passe-haut : H(s) = (s R C) / [1 + s R C]
+
+    R et C peuvent être des scalaires ou des tableaux (diffusion NumPy),
+    la sortie a la forme (..., 6).
+    """
+    if filter_type not in ["lowpass", "highpass"]:
+        raise ValueError("filter_type doit être 'lowpass' ou 'highpass'.")
+    rc = np.asarray(R, dtype=float) * np.asarray(C, dtype=float)
+    zero = np.zeros_like(rc)
+    one = np.ones_like(rc)
+    num = [zero, zero, one] if filter_type == "lowpass" else [zero, rc, zero]
+    return np.stack(num + [zero, rc, one], axis=-1)
+
+
+def sallen_key_section(filter_type, R1, R2, C1, C2, damping=None):
+    """
+    Construit la section d'une cellule Sallen-Key à gain unitaire.
+
+    - Passe-bas : H(s) = 1 / [s^2 R1R2C1C2 + s (R1+R2) C2 + 1]
+    - Passe-haut : H(s) = s^2 R1R2C1C2 / [s^2 R1R2C1C2 + s R1 (C1+C2) + 1]
+
+    damping ('sum_r' ou 'sum_c', voir DAMPINGS) impose le terme en s ; par
+    défaut, celui du type de filtre ci-dessus. Les composants peuvent être des
+    scalaires ou des tableaux (diffusion NumPy), la sortie a la forme (..., 6).
+    """
+    if filter_type not in ["lowpass", "highpass"]:
+        raise ValueError("filter_type doit être 'lowpass' ou 'highpass'.")
+    if damping is None:
+        damping = default_damping(filter_type)
+    if damping not in DAMPINGS:
+        raise ValueError(f"damping doit être l'un de {DAMPINGS}.")
+    R1, R2, C1, C2 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (R1, R2, C1, C2))
+    )
+    a2 = R1 * R2 * C1 * C2
+    zero = np.zeros_like(a2)
+    one = np.ones_like(a2)
+    a1 = (R1 + R2) * C2 if damping == "sum_r" else R1 * (C1 + C2)
+    num = [zero, zero, one] if filter_type == "lowpass" else [a2, zero, zero]
+    return np.stack(num + [a2, a1, one], axis=-1)
+
+
+def section_from_params(filter_type, params, damping=None):
+    """
+    Construit la section d'un étage à partir de ses composants.
+
+    - {"R": .., "C": ..} : cellule RC du premier ordre
+    - {"R1": .., "R2": .., "C1": .., "C2": ..} : cellule Sallen-Key, de
+      montage damping (stage_damping(filter_type, stage) pour un étage)
+
+    Format des "params" des étages retournés par bessel, butterworth et
+    tchebychev ; les valeurs peuvent être des tableaux (lot de conceptions).
+    """
+    if "R" in params:
+        return first_order_section(filter_type, params["R"], params["C"])
+    return sallen_key_section(
+        filter_type,
+        params["R1"],
+        params["R2"],
+        params["C1"],
+        params["C2"],
+        damping=damping,
+    )
+
+
+def stage_section(filter_type, stage, params=None):
+    """
+    Section d'un étage {"params", "damping", ...}, recalculée à partir de ses
+    composants ou des composants params (valeurs normalisées, tirées...).
+    """
+    if params is None:
+        params = stage["params"]
+    return section_from_params(
+        filter_type, params, damping=stage_damping(filter_type, stage)
+    )
+
+
+def section_parameters(sos):
+    """
+    Pulsation propre omega0 (rad/s) et facteur de qualité Q de chaque section.
+
+    - Second ordre : omega0 = sqrt(a0 / a2), Q = sqrt(a0 a2) / a1
+    - Premier ordre : omega0 = a0 / a1, Q = 0 (même convention que les tables)
+
+    Retourne (omega0, q) de forme (..., n_stages).
+    """
+    sos = np.asarray(sos, dtype=float)
+    a2, a1, a0 = sos[..., 3], sos[..., 4], sos[..., 5]
+    first_order = a2 == 0
+    omega0 = np.where(
+        first_order, a0 / a1, np.sqrt(np.abs(a0 / np.where(first_order, 1, a2)))
+    )
+    q = np.where(first_order, 0.0, np.sqrt(np.abs(a0 * a2)) / a1)
+    return omega0, q
+
+
+def section_from_tf(num, den):
+    """Convertit un couple num/den (degré <= 2) en ligne SOS de 6 coefficients."""
+    num = np.atleast_1d(np.asarray(num, dtype=float))
+    den = np.atleast_1d(np.asarray(den, dtype=float))
+    if num.size > 3 or den.size > 3:
+        raise ValueError("Une section SOS est au plus du second ordre.")
+    section = np.zeros(6)
+    section[3 - num.size : 3] = num
+    section[6 - den.size :] = den
+    return section
+
+
+@timed("transfer_function")
+def transfer_function(num, den):
+    """
+    Construit une scipy.signal.TransferFunction.
+
+    scipy n'est importé qu'au premier appel : les calculs de composants et de
+    réponses (SOS) n'en ont pas besoin, ce qui allège l'import du paquet.
+    """
+    from scipy.signal import TransferFunction
+
+    return TransferFunction(num, den)
+
+
+def stages_to_sos(stages):
+    """Empile les sections des étages {"sos": ...} en un tableau (n_stages x 6)."""
+    return np.vstack([stage["sos"] for stage in stages])
+
+
+@timed("polymul")
+def sos_to_tf(sos):
+    """
+    Développe une cascade SOS en un unique couple (num, den).
+
+    À réserver à la compatibilité (TransferFunction globale) : aux ordres
+    élevés le polynôme développé est mal conditionné.
+    """
+    sos = np.atleast_2d(sos)
+    num, den = np.array([1.0]), np.array([1.0])
+    for section in sos:
+        num = np.polymul(num, section[:3])
+        den = np.polymul(den, section[3:])
+    return np.trim_zeros(num, "f"), np.trim_zeros(den, "f")
+
+
+def sos_freqresp(sos, w):
+    """
+    Réponse complexe H(jw) d'une cascade SOS aux pulsations w (rad/s).
+
+    Chaque section est évaluée séparément puis les réponses sont multipliées,
+    sans jamais développer le polynôme global.
+    """
+    sos = np.atleast_2d(sos)
+    s = 1j * np.asarray(w, dtype=float)
+    s2 = s * s
+    h = np.ones_like(s)
+    for b2, b1, b0, a2, a1, a0 in sos:
+        h = h * (b2 * s2 + b1 * s + b0) / (a2 * s2 + a1 * s + a0)
+    return h
@@ -1,6 +1,57 @@
+from functools import lru_cache
+
 import numpy as np
-from scipy.signal import TransferFunction, bode
-import matplotlib.pyplot as plt
+
+from ..instrumentation import phase, timed
+from ..plotting import log_frequencies, render_bode
+from ..response import frequency_response
+from .cascade import cascade_output, cascade_stages, design_cascade, split_pairs
+from .coefficients import stage_coefficients
+from .sos import transfer_function
+
+
+def tchebychev_poles(order, ripple_db=1.0):
+    """
+    Calcule la liste (omega0_norm, q0) d'un filtre de Tchebychev (type I).
+
+    Formules analytiques, avec eps = sqrt(10^(ripple_db/10) - 1) et
+    a = asinh(1/eps) / n, pour les pôles p_k (k = 1..n) :
+        theta_k = (2k - 1) * pi / (2n)
+        p_k = -sinh(a) * sin(theta_k) + j * cosh(a) * cos(theta_k)
+
+    Chaque paire de pôles conjugués donne omega0 = |p_k| et
+    q0 = |p_k| / (2 * sinh(a) * sin(theta_k)) ; le pôle réel d'un ordre impair
+    donne la cellule 1er ordre (omega0 = sinh(a), q0 = 0). Les pulsations sont
+    normalisées à la fin de la bande d'ondulation (wk/wr du tableau).
+
+    Les résultats sont mis en cache (LRU) par (ordre, ripple).
+    """
+    integer = isinstance(order, (int, np.integer)) and not isinstance(order, bool)
+    if not integer or order < 1:
+        raise ValueError(f"Table indisponible pour l'ordre {order}.")
+    if ripple_db <= 0:
+        raise ValueError("L'ondulation (ripple_db) doit être strictement positive.")
+    return _tchebychev_poles(int(order), float(ripple_db))
+
+
+@lru_cache(maxsize=256)
+def _tchebychev_poles(order, ripple_db):
+    epsilon = np.sqrt(10 ** (ripple_db / 10) - 1)
+    a = np.arcsinh(1 / epsilon) / order
+
+    # Paires de pôles conjugués (k = 1..n//2), Q décroissant avec k
+    k = np.arange(order // 2, 0, -1)
+    theta = (2 * k - 1) * np.pi / (2 * order)
+    sigma = np.sinh(a) * np.sin(theta)
+    omega = np.cosh(a) * np.cos(theta)
+    omega0_norm = np.hypot(sigma, omega)
+    q0 = omega0_norm / (2 * sigma)
+
+    poles = [(float(w0), float(q)) for w0, q in zip(omega0_norm, q0)]
+    if order % 2:
+        # Pôle réel => cellule 1er ordre
+        poles.insert(0, (float(np.sinh(a)), 0.0))
+    return tuple(poles)
 
 
 class TchebychevFilter:
@@ -9,26 +60,13 @@ class TchebychevFilter:
     d'ordre n, avec ou sans cellule d'ordre 1 (si un pôle a q=0).
 
     - On utilise des formules directes pour la cellule ordre 2.
-    - On stocke une table de pôles (omega0_norm, q0) adaptée à un certain ripple.
+    - Les pôles (omega0_norm, q0) sont calculés pour n'importe quel ordre et
+      n'importe quelle ondulation (ripple_db, 1 dB par défaut).
     """
 
-    def __init__(self):
-        # Table d'exemple (à adapter selon votre ripple).
-        # On suppose qu'on a la version "passe-bas" de la table.
-        self.TCHEBYCHEV_TABLE = {
-            1: [(1.9652, 0.0)],
-            2: [(1.0500, 0.9565)],
-            3: [(1.4942, 0.0), (0.9971, 2.0177)],
-            4: [(0.5286, 0.7845), (0.9932, 3.5590)],
-            5: [(0.2895, 0.0), (0.6552, 1.3988), (0.9941, 5.5564)],
-            # etc.
-        }
-
-    def tchebychev_poles(self, order):
-        """Retourne la liste (omega0_norm, q0) pour l'ordre donné."""
-        if order not in self.TCHEBYCHEV_TABLE:
-            raise ValueError(f"Table indisponible pour l'ordre {order}.")
-        return self.TCHEBYCHEV_TABLE[order]
+    def tchebychev_poles(self, order, ripple_db=1.0):
+        """Retourne la liste (omega0_norm, q0) pour l'ordre et le ripple donnés."""
+        return tchebychev_poles(order, ripple_db)
 
     # ----------------------------------------------------------------
     # 1) Cellule 1er ordre
@@ -74,7 +112,7 @@ class TchebychevFilter:
             num = [R * C, 0]
             den = [R * C, 1.0]
 
-        tf = TransferFunction(num, den)
+        tf = transfer_function(num, den)
         return tf, {"R": R, "C": C}
 
     # ----------------------------------------------------------------
@@ -128,14 +166,22 @@ class TchebychevFilter:
             num = [R1 * R2 * C1 * C2, 0, 0]
             den = [R1 * R2 * C1 * C2, R1 * (C1 + C2), 1.0]
 
-        tf = TransferFunction(num, den)
+        tf = transfer_function(num, den)
         return tf, {"R1": R1, "R2": R2, "C1": C1, "C2": C2}
 
     # ----------------------------------------------------------------
     # 3) Conception d'un filtre d'ordre n
     # ----------------------------------------------------------------
+    @timed("tchebychev.design_filter")
     def design_filter(
-        self, order, cutoff_freq, filter_type="lowpass", c_vals=None, r_vals=None
+        self,
+        order,
+        cutoff_freq,
+        filter_type="lowpass",
+        c_vals=None,
+        r_vals=None,
+        ripple_db=1.0,
+        output="tf",
     ):
         """
         - order : ordre du filtre
@@ -143,67 +189,106 @@ class TchebychevFilter:
         - filter_type : 'lowpass' ou 'highpass'
         - c_vals / r_vals : listes de longueur = order (facultatives)
                             pour imposer des composants.
+        - ripple_db : ondulation maximale dans la bande passante (dB)
+        - output : 'tf' pour la TF globale, 'sos' pour le tableau des sections
+                   (n_stages x 6), plus stable et rapide aux ordres élevés
 
         On cascade chaque pôle (omega0_norm, q0) :
          - si q0=0 => cellule 1er ordre
          - sinon => cellule 2e ordre
         """
-        if filter_type not in ["lowpass", "highpass"]:
-            raise ValueError("filter_type doit être 'lowpass' ou 'highpass'.")
+        with phase("validation"):
+            if filter_type not in ["lowpass", "highpass"]:
+                raise ValueError("filter_type doit être 'lowpass' ou 'highpass'.")
+            if output not in ["tf", "sos"]:
+                raise ValueError("output doit être 'tf' ou 'sos'.")
+
+            # Étages lus dans la table partagée (filters.snk.coefficients)
+            omega0, q = stage_coefficients("tchebychev", order, ripple_db=ripple_db)
+            poles = np.column_stack([omega0, q])
+
+            # Vérif longueur
+            if c_vals is not None and len(c_vals) != order:
+                raise ValueError(f"c_vals doit avoir {order} éléments.")
+            if r_vals is not None and len(r_vals) != order:
+                raise ValueError(f"r_vals doit avoir {order} éléments.")
+
+            C1, C2 = split_pairs(c_vals, q, layout="flat")
+            R1, R2 = split_pairs(r_vals, q, layout="flat")
+
+        # Toutes les cellules en une passe ; les équations historiques du
+        # passe-bas (R1 (C1 + C2) = 1 / [Q * w]) sont celles du passe-haut
+        components, sos = design_cascade(
+            poles,
+            filter_type,
+            cutoff_freq,
+            R1,
+            R2,
+            C1,
+            C2,
+            prefer="C",
+            damping="sum_c",
+        )
+        stages = cascade_stages(q, components, sos, damping="sum_c")
+        return cascade_output(sos, stages, output)
 
-        poles = self.tchebychev_poles(order)
-
-        # Vérif longueur
-        if c_vals is not None and len(c_vals) != order:
-            raise ValueError(f"c_vals doit avoir {order} éléments.")
-        if r_vals is not None and len(r_vals) != order:
-            raise ValueError(f"r_vals doit avoir {order} éléments.")
-
-        if c_vals is None:
-            c_vals = [None] * order
-        if r_vals is None:
-            r_vals = [None] * order
-
-        num_combined = [1.0]
-        den_combined = [1.0]
-        stages = []
-        idx = 0
-
-        for omega0_norm, q0 in poles:
-            if q0 == 0.0:
-                # => 1er ordre
-                tf1, params1 = self.first_order_filter(
-                    filter_type,
-                    cutoff_freq,
-                    R=r_vals[idx],
-                    C=c_vals[idx],
-                    omega0_norm=omega0_norm,
-                )
-                idx += 1
-                stages.append({"tf": tf1, "params": params1})
-                num_combined = np.polymul(num_combined, tf1.num)
-                den_combined = np.polymul(den_combined, tf1.den)
-
-            else:
-                # => 2e ordre
-                # On va consommer 2 valeurs (C1, C2) et pas de R imposé => calcul direct
-                C1, C2 = c_vals[idx], c_vals[idx + 1]
-                idx += 2
-                if (C1 is None) or (C2 is None):
-                    raise ValueError(
-                        "Cellule 2e ordre => il faut C1 et C2 (ou on revoit la logique)."
-                    )
-
-                tf2, params2 = self.second_order_filter_direct(
-                    filter_type, cutoff_freq, C1, C2, omega0_norm=omega0_norm, q0=q0
-                )
-                stages.append({"tf": tf2, "params": params2})
-                num_combined = np.polymul(num_combined, tf2.num)
-                den_combined = np.polymul(den_combined, tf2.den)
-
-        # TF globale
-        tf_global = TransferFunction(num_combined, den_combined)
-        return tf_global, stages
+    # ----------------------------------------------------------------
+    # 4) Diagramme de Bode
+    # ----------------------------------------------------------------
+    def response(
+        self,
+        order,
+        cutoff_freq,
+        filter_type="lowpass",
+        c_vals=None,
+        r_vals=None,
+        ripple_db=1.0,
+        freqs=None,
+    ):
+        """
+        Calcule le diagramme de Bode sans rien afficher.
+
+        - mêmes paramètres que design_filter()
+        - freqs : fréquences d'évaluation (Hz), par défaut 3 décades de part
+                  et d'autre de la coupure
+
+        Retourne (freq, magnitude_db, phase_deg).
+        """
+        sos, _ = self.design_filter(
+            order, cutoff_freq, filter_type, c_vals, r_vals, ripple_db, output="sos"
+        )
+        if freqs is None:
+            freqs = log_frequencies(cutoff_freq, 3)
+        freqs = np.asarray(freqs, dtype=float)
+        mag, phase = frequency_response(sos, freqs)
+        return freqs, mag, phase
+
+    def graphs(
+        self,
+        order,
+        cutoff_freq,
+        filter_type="lowpass",
+        c_vals=None,
+        r_vals=None,
+        ripple_db=1.0,
+        path=None,
+    ):
+        """
+        Affiche le diagramme de Bode, ou l'écrit dans le fichier path sans
+        affichage (moteur non interactif) si path est donné.
+        """
+        freq_hz, mag, phase = self.response(
+            order, cutoff_freq, filter_type, c_vals, r_vals, ripple_db
+        )
+        kind = "LP" if filter_type == "lowpass" else "HP"
+        return render_bode(
+            freq_hz,
+            mag,
+            phase,
+            path=path,
+            title=f"Tchebychev {kind} ordre={order}, Fc={cutoff_freq/1e3} kHz",
+            marker_frequency=cutoff_freq,
+        )
 
 
 # ----------------------------------------------------------------
@@ -221,35 +306,21 @@ if __name__ == "__main__":
     # et la 2ᵉ (q!=0) en utilisera 2.
     cvals_lp = [10e-9, 10e-9, 4.7e-9]
 
-    tf_lp, stages_lp = filter_designer.design_filter(
+    sos_lp, stages_lp = filter_designer.design_filter(
         order=order_lp,
         cutoff_freq=fc_lp,
         filter_type="lowpass",
         c_vals=cvals_lp,
         r_vals=None,  # on laisse calculer R
+        output="sos",
     )
     print("\n=== PASSE-BAS Ordre 3 ===")
     for i, st in enumerate(stages_lp, start=1):
         print(f"Cellule {i} => {st['params']}")
-    print("TF globale (num, den):", tf_lp.num, tf_lp.den)
+    print("Sections SOS [b2, b1, b0, a2, a1, a0]:\n", sos_lp)
 
     # Bode plot LP
-    w = np.logspace(2, 5, 400)
-    w, mag, phase = bode(tf_lp, w=w)
-    freq_hz = w / (2 * np.pi)
-
-    fig_lp, (ax_mag_lp, ax_phase_lp) = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
-    ax_mag_lp.semilogx(freq_hz, mag, "b")
-    ax_mag_lp.set_ylabel("Magnitude (dB)")
-    ax_mag_lp.set_title(f"Tchebychev LP ordre={order_lp}, Fc={fc_lp/1e3} kHz")
-
-    ax_phase_lp.semilogx(freq_hz, phase, "r")
-    ax_phase_lp.set_xlabel("Frequency (Hz)")
-    ax_phase_lp.set_ylabel("Phase (deg)")
-    ax_phase_lp.grid(True)
-    ax_mag_lp.grid(True)
-    plt.tight_layout()
-    plt.show()
+    filter_designer.graphs(order_lp, fc_lp, "lowpass", c_vals=cvals_lp)
 
     # 2) Ex: un filtre passe-haut d'ordre 4, fc=2.5 kHz
     order_hp = 4
@@ -257,32 +328,18 @@ if __name__ == "__main__":
     # 4 condensateurs => 2 cellules d'ordre 2, par ex. [10nF, 10nF, 10nF, 5nF]
     cvals_hp = [10e-9, 10e-9, 10e-9, 5e-9]
 
-    tf_hp, stages_hp = filter_designer.design_filter(
+    sos_hp, stages_hp = filter_designer.design_filter(
         order=order_hp,
         cutoff_freq=fc_hp,
         filter_type="highpass",
         c_vals=cvals_hp,
         r_vals=None,
+        output="sos",
     )
     print("\n=== PASSE-HAUT Ordre 4 ===")
     for i, st in enumerate(stages_hp, start=1):
         print(f"Cellule {i} => {st['params']}")
-    print("TF globale (num, den):", tf_hp.num, tf_hp.den)
+    print("Sections SOS [b2, b1, b0, a2, a1, a0]:\n", sos_hp)
 
     # Bode plot HP
-    w2 = np.logspace(2, 6, 500)
-    w2, mag2, phase2 = bode(tf_hp, w=w2)
-    freq_hz2 = w2 / (2 * np.pi)
-
-    fig_hp, (ax_mag_hp, ax_phase_hp) = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
-    ax_mag_hp.semilogx(freq_hz2, mag2, "b")
-    ax_mag_hp.set_ylabel("Magnitude (dB)")
-    ax_mag_hp.set_title(f"Tchebychev HP ordre={order_hp}, Fc={fc_hp/1e3} kHz")
-
-    ax_phase_hp.semilogx(freq_hz2, phase2, "r")
-    ax_phase_hp.set_xlabel("Frequency (Hz)")
-    ax_phase_hp.set_ylabel("Phase (deg)")
-    ax_phase_hp.grid(True)
-    ax_mag_hp.grid(True)
-    plt.tight_layout()
-    plt.show()
+    filter_designer.graphs(order_hp, fc_hp, "highpass", c_vals=cvals_hp)
@@ -0,0 +1,279 @@
+import os
+import time
+from functools import cache
+
+import numpy as np
+
+from .response import _as_sos
+from .snk.design import design_stages
+
+# Filtrage temporel en flux d'une conception analogique discrétisée.
+#
+# Les sections analogiques [b2, b1, b0, a2, a1, a0] (voir filters.snk.sos)
+# sont transformées par la transformation bilinéaire, avec pré-distorsion
+# (prewarp) à la fréquence de coupure : la réponse numérique est exactement
+# celle du filtre analogique à cette fréquence.
+#
+# Les sections numériques suivent la convention de scipy.signal.sosfilt :
+#     [b0, b1, b2, 1, a1, a2]
+#     =>  H(z) = (b0 + b1 z^-1 + b2 z^-2) / (1 + a1 z^-1 + a2 z^-2)
+#
+# StreamingFilter.process() n'alloue rien d'un bloc à l'autre : le bloc est
+# copié dans un tampon préalloué (agrandi seulement pour un bloc plus long
+# que tous les précédents), filtré en place avec l'état des biquads par le
+# noyau de scipy.signal.sosfilt (vérifié une fois, voir _inplace_kernel), puis
+# écrit dans le tableau out fourni.
+
+
+@cache
+def _inplace_kernel():
+    """
+    Noyau de sosfilt qui filtre en place (x, zi), None s'il est indisponible.
+
+    Il ne fait pas partie de l'API publique de scipy : il n'est retenu
+    qu'après avoir reproduit sosfilt sur un signal de contrôle (voir
+    _kernel_matches), une seule fois par processus. Sinon, process() utilise
+    sosfilt (qui alloue sa sortie).
+    """
+    try:
+        from scipy.signal._sosfilt import _sosfilt
+    except ImportError:
+        return None
+    return _sosfilt if _kernel_matches(_sosfilt) else None
+
+
+def _kernel_matches(kernel):
+    """Vérifie la signature kernel(sos, x, zi) et son résultat face à sosfilt."""
+    from scipy.signal import sosfilt
+
+    sos = np.array([[0.2, 0.4, 0.2, 1.0, -0.5, 0.25], [1.0, -1.0, 0.5, 1.0, 0.1, 0.3]])
+    # x : (n_voies, n_samples), zi : (n_voies, n_stages, 2), contigus
+    x = np.sin(0.7 * np.arange(32.0)).reshape(2, 16)
+    zi = np.linspace(-1.0, 1.0, 8).reshape(2, 2, 2)
+    expected, expected_zi = sosfilt(sos, x, axis=-1, zi=zi.transpose(1, 0, 2))
+    try:
+        kernel(sos, x, zi)
+    except (TypeError, ValueError):
+        return False
+    return np.allclose(x, expected) and np.allclose(zi, expected_zi.transpose(1, 0, 2))
+
+
+def bilinear_sos(sos, sample_rate, prewarp_frequency=None):
+    """
+    Discrétise une cascade analogique par la transformation bilinéaire.
+
+    - sos : sections analogiques (..., n_stages, 6) ou liste d'étages
+    - sample_rate : fréquence d'échantillonnage (Hz)
+    - prewarp_frequency : fréquence (Hz) où les réponses analogique et
+                          numérique coïncident, en général la coupure ;
+                          None pour la transformation sans pré-distorsion
+
+    Retourne les sections numériques (..., n_stages, 6), normalisées a0 = 1.
+    """
+    sos = _as_sos(sos)
+    if prewarp_frequency is None:
+        k = 2.0 * sample_rate
+    else:
+        if not 0 < prewarp_frequency < sample_rate / 2:
+            raise ValueError(
+                "La fréquence de pré-distorsion doit être comprise entre 0 et "
+                "la moitié de la fréquence d'échantillonnage."
+            )
+        omega = 2 * np.pi * prewarp_frequency
+        k = omega / np.tan(omega / (2 * sample_rate))
+
+    # s = k (1 - z^-1) / (1 + z^-1), multiplié par (1 + z^-1)^2
+    k2 = k * k
+    b2, b1, b0, a2, a1, a0 = (sos[..., i] for i in range(6))
+    digital = np.stack(
+        [
+            b2 * k2 + b1 * k + b0,
+            2 * (b0 - b2 * k2),
+            b2 * k2 - b1 * k + b0,
+            a2 * k2 + a1 * k + a0,
+            2 * (a0 - a2 * k2),
+            a2 * k2 - a1 * k + a0,
+        ],
+        axis=-1,
+    )
+    return digital / digital[..., 3:4]
+
+
+class StreamingFilter:
+    """
+    Filtre numérique en flux issu d'une conception snk.
+
+    - sos : sections analogiques ou liste d'étages (bessel, butterworth,
+            tchebychev, filters.snk.design.design_stages)
+    - cutoff_frequency : coupure analogique (Hz), utilisée pour le prewarp
+    - sample_rate : fréquence d'échantillonnage (Hz)
+    - channels : None pour des blocs 1-D, sinon nombre de voies ; les blocs
+                 sont alors de forme (n_samples, channels)
+
+    process(block) filtre des blocs de taille quelconque ; l'état des
+    biquads est conservé d'un appel à l'autre, si bien que filtrer un signal
+    en plusieurs blocs donne le même résultat qu'en une seule fois. Avec
+    process(block, out=...), aucun tableau n'est alloué par bloc.
+    """
+
+    def __init__(self, sos, cutoff_frequency, sample_rate, channels=None):
+        # Import différé : scipy n'est chargé que pour le filtrage
+        from scipy.signal import sosfilt
+
+        self._sosfilt = sosfilt
+        self._kernel = _inplace_kernel()
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sos = np.ascontiguousarray(
+            bilinear_sos(sos, sample_rate, cutoff_frequency)
+        )
+        if self.sos.ndim != 2:
+            raise ValueError("Une seule cascade (n_stages x 6) peut être filtrée.")
+        # État des biquads, alloué une fois, au format du noyau :
+        # (n_voies, n_stages, 2), une voie pour des blocs 1-D
+        self._signals = 1 if channels is None else channels
+        self._state = np.zeros((self._signals, self.sos.shape[0], 2))
+        # Tampon de travail (voies x échantillons, contigu), agrandi au besoin
+        self._buffer = np.empty(0)
+
+    @classmethod
+    def from_design(
+        cls,
+        family,
+        filter_type,
+        order,
+        cutoff_frequency,
+        sample_rate,
+        r_vals=None,
+        c_vals=None,
+        channels=None,
+        **options,
+    ):
+        """Conçoit le filtre (voir design_stages) puis le discrétise."""
+        stages = design_stages(
+            family, filter_type, order, cutoff_frequency, r_vals, c_vals, **options
+        )
+        return cls(stages, cutoff_frequency, sample_rate, channels)
+
+    def _work(self, n_samples):
+        """Vue contiguë (n_voies, n_samples) du tampon de travail."""
+        size = self._signals * n_samples
+        if self._buffer.size < size:
+            self._buffer = np.empty(size)
+        return self._buffer[:size].reshape(self._signals, n_samples)
+
+    def process(self, block, out=None):
+        """
+        Filtre un bloc (n_samples,) ou (n_samples, channels).
+
+        - out : tableau float64 préalloué de même forme que block, qui reçoit
+                la sortie ; sans out, un nouveau tableau est alloué
+
+        Retourne out (ou le nouveau tableau).
+        """
+        block = np.asarray(block)
+        if out is None:
+            out = np.empty(block.shape)
+        elif out.shape != block.shape:
+            raise ValueError("out doit avoir la même forme que le bloc.")
+        if len(block) == 0:
+            return out
+        work = self._work(len(block))
+        # Voies en lignes : block.T est une vue, la copie convertit le type
+        np.copyto(work, block.T)
+        if self._kernel is not None:
+            self._kernel(self.sos, work, self._state)
+        else:
+            state = self._state.transpose(1, 0, 2)
+            output, final_state = self._sosfilt(self.sos, work, axis=-1, zi=state)
+            work[...] = output
+            self._state[...] = final_state.transpose(1, 0, 2)
+        np.copyto(out.T, work)
+        return out
+
+    def reset(self):
+        """Remet l'état des biquads à zéro (début d'un nouveau signal)."""
+        self._state.fill(0.0)
+
+    def frequency_response(self, freqs):
+        """Gain (dB) et phase (degrés) du filtre numérique aux fréquences freqs (Hz)."""
+        from scipy.signal import sosfreqz
+
+        _, h = sosfreqz(
+            self.sos, worN=np.asarray(freqs, dtype=float), fs=self.sample_rate
+        )
+        return 20 * np.log10(np.abs(h)), np.degrees(np.unwrap(np.angle(h)))
+
+
+def filter_file(
+    sos,
+    cutoff_frequency,
+    sample_rate,
+    input_path,
+    output_path,
+    dtype="float32",
+    channels=1,
+    output_dtype=None,
+    offset=0,
+    chunk_frames=1 << 18,
+):
+    """
+    Filtre un fichier brut d'échantillons vers un autre fichier, par blocs.
+
+    - sos, cutoff_frequency, sample_rate : voir StreamingFilter
+    - input_path / output_path : fichiers bruts (sans en-tête après offset)
+    - dtype : type des échantillons en entrée ('int16', 'float32'...)
+    - channels : nombre de voies entrelacées (échantillon 0 de chaque voie,
+                 puis échantillon 1 de chaque voie...)
+    - output_dtype : type en sortie, dtype par défaut ; les types entiers
+                     sont arrondis et saturés
+    - offset : octets à ignorer au début du fichier d'entrée (en-tête)
+    - chunk_frames : nombre de trames filtrées par bloc
+
+    Les deux fichiers sont projetés en mémoire (np.memmap) : seul un bloc
+    est converti et filtré à la fois, l'état étant conservé d'un bloc à
+    l'autre. Retourne un rapport {"frames", "channels", "seconds",
+    "samples_per_second", "bytes_per_second"}.
+    """
+    dtype = np.dtype(dtype)
+    output_dtype = dtype if output_dtype is None else np.dtype(output_dtype)
+    start_time = time.perf_counter()
+
+    size = os.path.getsize(input_path) - offset
+    if size % (dtype.itemsize * channels):
+        raise ValueError(
+            "La taille du fichier ne correspond pas à un nombre entier de trames."
+        )
+    frames = size // (dtype.itemsize * channels)
+    if frames == 0:
+        open(output_path, "wb").close()
+    else:
+        source = np.memmap(
+            input_path, dtype, mode="r", offset=offset, shape=(frames, channels)
+        )
+        target = np.memmap(
+            output_path, output_dtype, mode="w+", shape=(frames, channels)
+        )
+        stream = StreamingFilter(sos, cutoff_frequency, sample_rate, channels)
+        if np.issubdtype(output_dtype, np.integer):
+            limits = np.iinfo(output_dtype)
+        # Sortie filtrée d'un bloc, allouée une fois
+        output = np.empty((min(chunk_frames, frames), channels))
+        for start in range(0, frames, chunk_frames):
+            chunk = source[start : start + chunk_frames]
+            block = stream.process(chunk, out=output[: len(chunk)])
+            if np.issubdtype(output_dtype, np.integer):
+                np.rint(block, out=block)
+                np.clip(block, limits.min, limits.max, out=block)
+            target[start : start + chunk_frames] = block
+        target.flush()
+        del source, target
+
+    seconds = time.perf_counter() - start_time
+    return {
+        "frames": frames,
+        "channels": channels,
+        "seconds": seconds,
+        "samples_per_second": frames * channels / seconds,
+        "bytes_per_second": size / seconds,
+    }
@@ -0,0 +1,250 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .response import _as_sos
+from .snk.sos import section_parameters
+
+# Réponses temporelles exactes d'une cascade par décomposition en éléments
+# simples.
+#
+# Les pôles de chaque section se déduisent de son omega0 et de son Q :
+#     p = omega0 * (-1 / (2Q) +/- sqrt(1 / (4Q^2) - 1))   (second ordre)
+#     p = -omega0                                         (premier ordre)
+# Avec H(s) = N(s) / D(s), N et D produits des numérateurs et dénominateurs
+# des sections, le résidu en un pôle simple p de la section k vaut
+#     r = N(p) / (D_k'(p) * prod_{i != k} D_i(p))
+# et H(s) = d + somme r / (s - p), d étant le terme direct (non nul pour un
+# passe-haut). On en tire, pour t >= 0 :
+#     h(t) = d delta(t) + somme r exp(p t)
+#     y(t) = d + somme r (exp(p t) - 1) / p      (réponse indicielle)
+#          = H(0) + somme (r / p) exp(p t)
+# Pôles et résidus sont calculés une fois par conception, puis les réponses
+# sont évaluées sur n'importe quelle grille, pour tout un lot à la fois.
+
+PartialFractions = namedtuple(
+    "PartialFractions", ["poles", "residues", "direct", "dc_gain"]
+)
+
+# Points de la grille par défaut de step_metrics()
+DEFAULT_POINTS = 2000
+
+# Écart relatif minimal entre deux pôles pour les considérer distincts
+SIMPLE_POLE_TOLERANCE = 1e-6
+
+# Taille des blocs (conceptions x instants) évalués ensemble
+CHUNK_ELEMENTS = 2**16
+
+
+def _section_poles(omega0, q):
+    """Pôles (complexes) d'une section du second ordre, deux tableaux."""
+    half = 1 / (2 * q)
+    root = np.sqrt(half.astype(complex) ** 2 - 1)
+    return omega0 * (-half + root), omega0 * (-half - root)
+
+
+def _polyval(sections, s):
+    """Valeur de c2 s^2 + c1 s + c0 de chaque section (..., S) en chaque s (..., n)."""
+    c2, c1, c0 = (sections[..., np.newaxis, :, k] for k in range(3))
+    s = s[..., np.newaxis]
+    return (c2 * s + c1) * s + c0
+
+
+def partial_fractions(stages):
+    """
+    Pôles et résidus d'une ou plusieurs cascades.
+
+    - stages : tableau SOS (n_stages x 6), lot de conceptions
+               (n_designs x n_stages x 6) ou liste d'étages {"sos": ...}
+
+    Retourne PartialFractions(poles, residues, direct, dc_gain) :
+    - poles, residues : tableaux complexes (..., ordre), les deux pôles d'une
+                        section du second ordre se suivent
+    - direct : terme direct d (..., ), 0 pour un passe-bas
+    - dc_gain : gain statique H(0) (..., )
+
+    Les pôles doivent être simples (Q != 0.5, pas deux sections identiques),
+    ce qui est le cas des familles Bessel, Butterworth et Tchebychev.
+    """
+    sos = _as_sos(stages)
+    omega0, q = section_parameters(sos)
+    # Structure commune au lot : une section est du premier ordre si a2 = 0
+    first = np.all(sos[..., 3] == 0, axis=tuple(range(sos.ndim - 2)))
+
+    poles, owners = [], []
+    for k in range(sos.shape[-2]):
+        if first[k]:
+            poles.append(-omega0[..., k].astype(complex))
+            owners.append(k)
+        else:
+            poles.extend(_section_poles(omega0[..., k], q[..., k]))
+            owners.extend([k, k])
+    poles = np.stack(poles, axis=-1)
+    owners = np.array(owners)
+
+    numerator = _polyval(sos[..., :3], poles).prod(axis=-1)
+    denominator = _polyval(sos[..., 3:], poles)
+    # Sa propre section s'annule au pôle : on prend sa dérivée 2 a2 p + a1
+    own = np.arange(owners.size), owners
+    a2, a1 = sos[..., owners, 3], sos[..., owners, 4]
+    denominator[..., own[0], own[1]] = 2 * a2 * poles + a1
+    # Pôles confondus (aux arrondis près) : résidus infinis ou démesurés
+    gap = np.abs(poles[..., :, np.newaxis] - poles[..., np.newaxis, :])
+    gap[..., np.arange(owners.size), np.arange(owners.size)] = np.inf
+    if np.any(gap.min(axis=-1) <= SIMPLE_POLE_TOLERANCE * np.abs(poles)):
+        raise ValueError("Les pôles de la cascade doivent être simples.")
+    residues = numerator / denominator.prod(axis=-1)
+
+    b2, b1, b0, a2, a1, a0 = (sos[..., k] for k in range(6))
+    # Limite de chaque section en l'infini : b2 / a2, ou b1 / a1 au premier ordre
+    direct = np.where(first, b1 / np.where(first, a1, 1), b2 / np.where(first, 1, a2))
+    return PartialFractions(
+        poles, residues, direct.prod(axis=-1), (b0 / a0).prod(axis=-1)
+    )
+
+
+def _fractions(stages):
+    if isinstance(stages, PartialFractions):
+        return stages
+    return partial_fractions(stages)
+
+
+def _evaluate(poles, coefficients, t):
+    """
+    Somme des Re(c exp(p t)) sur les pôles, pour t >= 0 (0 avant).
+
+    Un pôle complexe et son conjugué donnent la même partie réelle : seul le
+    pôle de partie imaginaire positive est évalué, avec un poids 2. Les
+    conceptions sont traitées par blocs d'environ CHUNK_ELEMENTS valeurs pour
+    borner la mémoire des exponentielles intermédiaires.
+    """
+    t = np.asarray(t, dtype=float)
+    n_times = t.shape[-1]
+    shape = np.broadcast_shapes(poles.shape[:-1], t.shape[:-1]) + (n_times,)
+    poles = np.broadcast_to(poles, shape[:-1] + poles.shape[-1:])
+    weights = np.where(poles.imag > 0, 2.0, np.where(poles.imag < 0, 0.0, 1.0))
+    poles = poles.reshape(-1, poles.shape[-1])
+    coefficients = (weights * coefficients).reshape(poles.shape)
+    # Grille commune (1, n_t) ou propre à chaque conception (n, n_t)
+    times = t.reshape(1, n_times) if t.ndim == 1 else np.broadcast_to(t, shape)
+    times = times.reshape(-1, n_times)
+
+    value = np.empty((poles.shape[0], n_times))
+    chunk = max(1, CHUNK_ELEMENTS // n_times)
+    for start in range(0, poles.shape[0], chunk):
+        rows = slice(start, start + chunk)
+        t_rows = times if times.shape[0] == 1 else times[rows]
+        total = np.zeros((min(chunk, poles.shape[0] - start), n_times))
+        for k in range(poles.shape[1]):
+            c = coefficients[rows, k, np.newaxis]
+            if not c.any():
+                continue  # Conjugué d'un pôle déjà évalué
+            total += (c * np.exp(poles[rows, k, np.newaxis] * t_rows)).real
+        value[rows] = total
+    return np.where(t >= 0, value.reshape(shape), 0.0)
+
+
+def impulse_response(stages, t):
+    """
+    Réponse impulsionnelle h(t), hors impulsion de Dirac à t = 0.
+
+    - stages : étages, SOS (voir partial_fractions) ou PartialFractions déjà
+               calculées, pour éviter de refaire la décomposition
+    - t : instants (s), grille commune (n_t,) ou propre à chaque conception
+          (..., n_t)
+
+    Le terme d delta(t) d'un passe-haut (d = PartialFractions.direct) n'est
+    pas inclus. Retourne un tableau (..., n_t).
+    """
+    fractions = _fractions(stages)
+    return _evaluate(fractions.poles, fractions.residues, t)
+
+
+def step_response(stages, t):
+    """
+    Réponse indicielle y(t) (entrée échelon unité), mêmes entrées que
+    impulse_response(). Retourne un tableau (..., n_t).
+    """
+    fractions = _fractions(stages)
+    # y(t) = d - somme r / p + somme (r / p) exp(p t), et d - somme r / p = H(0)
+    response = _evaluate(fractions.poles, fractions.residues / fractions.poles, t)
+    t = np.asarray(t)
+    return response + np.where(t >= 0, fractions.dc_gain[..., np.newaxis], 0.0)
+
+
+def _crossing(t, x, index, level):
+    """Instant où x atteint level entre les échantillons index - 1 et index."""
+    index = np.clip(index, 1, x.shape[-1] - 1)[..., np.newaxis]
+    t0, t1 = (np.take_along_axis(t, i, axis=-1)[..., 0] for i in (index - 1, index))
+    x0, x1 = (np.take_along_axis(x, i, axis=-1)[..., 0] for i in (index - 1, index))
+    step = x1 - x0
+    ratio = np.divide(level - x0, step, out=np.ones_like(step), where=step != 0)
+    return t0 + np.clip(ratio, 0, 1) * (t1 - t0)
+
+
+def step_metrics(stages, t=None, settling_tolerance=0.02, rise_levels=(0.1, 0.9)):
+    """
+    Temps de montée, dépassement et temps d'établissement de la réponse
+    indicielle, pour une ou plusieurs cascades.
+
+    - stages : étages, SOS ou PartialFractions (voir impulse_response)
+    - t : grille d'instants (s) ; par défaut DEFAULT_POINTS points jusqu'à ce
+          que le pôle le plus lent soit amorti sous settling_tolerance / 100
+    - settling_tolerance : bande d'établissement relative (0.02 pour 2 %)
+    - rise_levels : niveaux relatifs du temps de montée (10 % - 90 %)
+
+    Les grandeurs sont relatives à la valeur finale H(0) ; les instants sont
+    interpolés linéairement entre les échantillons. Une cascade de gain
+    statique nul (passe-haut) n'a pas de valeur finale : NaN. De même,
+    rise_time vaut NaN si le niveau haut n'est jamais atteint et
+    settling_time si la réponse est encore hors de la bande au dernier
+    instant de t.
+
+    Retourne un dict de tableaux (...,) : "rise_time", "overshoot" (0.05
+    pour 5 %), "peak_time", "settling_time".
+    """
+    fractions = _fractions(stages)
+    if t is None:
+        slowest = np.abs(fractions.poles.real).min(axis=-1)
+        duration = np.log(100 / settling_tolerance) / slowest
+        t = duration[..., np.newaxis] * np.linspace(0, 1, DEFAULT_POINTS)
+    y = step_response(fractions, t)
+    t = np.broadcast_to(t, y.shape)
+    final = fractions.dc_gain[..., np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = _metrics(t, y / final, settling_tolerance, rise_levels)
+    no_final = fractions.dc_gain == 0
+    for name, value in result.items():
+        value = np.where(no_final, np.nan, value)
+        result[name] = float(value) if value.ndim == 0 else value
+    return result
+
+
+def _metrics(t, x, settling_tolerance, rise_levels):
+    low, high = rise_levels
+    rise_time = _crossing(t, x, np.argmax(x >= high, axis=-1), high) - _crossing(
+        t, x, np.argmax(x >= low, axis=-1), low
+    )
+    rise_time = np.where((x >= high).any(axis=-1), rise_time, np.nan)
+    peak = np.argmax(x, axis=-1)[..., np.newaxis]
+    overshoot = np.maximum(np.take_along_axis(x, peak, axis=-1)[..., 0] - 1, 0)
+    peak_time = np.take_along_axis(t, peak, axis=-1)[..., 0]
+
+    # Dernier échantillon hors de la bande, puis passage dans la bande
+    deviation = np.abs(x - 1)
+    outside = deviation > settling_tolerance
+    last = x.shape[-1] - 1 - np.argmax(outside[..., ::-1], axis=-1)
+    settling_time = np.where(
+        outside.any(axis=-1),
+        _crossing(t, -deviation, last + 1, -settling_tolerance),
+        0.0,
+    )
+    # Toujours hors de la bande au dernier instant : grille trop courte
+    settling_time = np.where(outside[..., -1], np.nan, settling_time)
+
+    return {
+        "rise_time": rise_time,
+        "overshoot": overshoot,
+        "peak_time": peak_time,
+        "settling_time": settling_time,
+    }
@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .montecarlo import envelopes, sample_responses
+from .plotting import log_frequencies
+from .snk.design import design_stages
+
+# Analyse de rendement (yield) Monte-Carlo répartie sur plusieurs processus.
+#
+# Les tirages de chaque conception sont découpés en lots de taille fixe
+# (shard_size), indépendante du nombre de processus. Chaque lot reçoit son
+# propre flux aléatoire, engendré par SeedSequence.spawn() à partir de la
+# graine : les mêmes lots produisent donc les mêmes tirages quel que soit le
+# processus qui les exécute. Les résultats sont rassemblés dans l'ordre des
+# lots avant le calcul des statistiques, si bien que le résultat est
+# identique au bit près pour 1 ou N processus.
+
+SHARD_SIZE = 10000
+
+
+def _run_shard(
+    stages, filter_type, cutoff, n_samples, tolerance, distribution, freqs, seed
+):
+    """Exécute un lot de tirages (appelé dans un processus de calcul)."""
+    result = sample_responses(
+        stages, filter_type, cutoff, n_samples, tolerance, distribution, freqs, seed
+    )
+    return result["magnitude_db"], result["cutoff"]
+
+
+def _shard_sizes(n_samples, shard_size):
+    sizes = [shard_size] * (n_samples // shard_size)
+    if n_samples % shard_size:
+        sizes.append(n_samples % shard_size)
+    return sizes
+
+
+def yield_analysis(
+    designs,
+    n_samples,
+    tolerance=0.01,
+    distribution="uniform",
+    cutoff_tolerance=0.05,
+    percentiles=(5, 50, 95),
+    workers=None,
+    shard_size=SHARD_SIZE,
+    seed=0,
+):
+    """
+    Rendement Monte-Carlo d'une ou plusieurs conceptions de filtres actifs.
+
+    - designs : dict ou liste de dicts décrivant chaque conception, avec les
+                arguments de filters.snk.design.design_stages() :
+                {"family": "bessel", "filter_type": "lowpass", "order": 4,
+                 "cutoff_frequency": 1000, "r_vals": [...], ...}
+    - n_samples : nombre de tirages par conception
+    - tolerance, distribution : voir filters.montecarlo.perturb()
+    - cutoff_tolerance : écart relatif de coupure accepté (0.05 pour 5 %)
+    - workers : nombre de processus (None : nombre de coeurs, 1 : aucun
+                processus supplémentaire)
+    - shard_size : nombre de tirages par lot
+    - seed : graine globale, chaque conception puis chaque lot en dérive
+             un flux indépendant
+
+    Retourne, pour chaque conception (liste si designs est une liste), un
+    dict {"stages", "freqs", "cutoff", "yield", "gain_envelope",
+    "cutoff_percentiles"}.
+    """
+    if n_samples < 1:
+        raise ValueError("n_samples doit être supérieur ou égal à 1.")
+    if shard_size < 1:
+        raise ValueError("shard_size doit être supérieur ou égal à 1.")
+    single = isinstance(designs, dict)
+    if single:
+        designs = [designs]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    design_seeds = np.random.SeedSequence(seed).spawn(len(designs))
+    tasks = []
+    plans = []
+    for design, design_seed in zip(designs, design_seeds):
+        # Seuls les composants et le montage sont transmis aux processus de calcul
+        stages = []
+        for stage in design_stages(**design):
+            shard_stage = {"params": dict(stage["params"])}
+            if "damping" in stage:
+                shard_stage["damping"] = stage["damping"]
+            stages.append(shard_stage)
+        cutoff = design["cutoff_frequency"]
+        freqs = log_frequencies(cutoff, 1, 200)
+        sizes = _shard_sizes(n_samples, shard_size)
+        for size, shard_seed in zip(sizes, design_seed.spawn(len(sizes))):
+            tasks.append(
+                (
+                    stages,
+                    design["filter_type"],
+                    cutoff,
+                    size,
+                    tolerance,
+                    distribution,
+                    freqs,
+                    shard_seed,
+                )
+            )
+        plans.append((stages, cutoff, freqs, len(sizes)))
+
+    if workers == 1:
+        shards = [_run_shard(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(_run_shard, *zip(*tasks)))
+
+    results = []
+    start = 0
+    for stages, cutoff, freqs, n_shards in plans:
+        design_shards = shards[start : start + n_shards]
+        start += n_shards
+        magnitude_db = np.concatenate([mag for mag, _ in design_shards])
+        cutoffs = np.concatenate([cut for _, cut in design_shards])
+        within = np.abs(cutoffs / cutoff - 1) <= cutoff_tolerance
+        result = {
+            "stages": stages,
+            "freqs": freqs,
+            "cutoff": cutoffs,
+            "yield": float(np.mean(within)),
+        }
+        result.update(envelopes(magnitude_db, cutoffs, percentiles))
+        results.append(result)
+    return results[0] if single else results
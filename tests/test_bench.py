@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+
+from filters.bench import benchmarks, compare, fixed_components, main, run, time_call
+from filters.snk.design import FAMILIES, design_stages
+
+
+def report(**times):
+    return {"meta": {}, "results": {name: {"min_s": t} for name, t in times.items()}}
+
+
+class TestBench(unittest.TestCase):
+    def test_fixed_components_are_valid(self):
+        for family in FAMILIES:
+            for filter_type in ("lowpass", "highpass"):
+                for order in range(1, 9):
+                    stages = design_stages(
+                        family,
+                        filter_type,
+                        order,
+                        1000,
+                        **fixed_components(family, filter_type, order),
+                    )
+                    self.assertEqual(len(stages), (order + 1) // 2)
+
+    def test_benchmark_names(self):
+        names = benchmarks()
+        self.assertIn("bessel.highpass.components[8]", names)
+        self.assertIn("tchebychev.lowpass.design_filter[3]", names)
+        self.assertIn("passives.bandstop_rlc", names)
+        self.assertIn("response.frequency_response[100000]", names)
+
+    def test_time_call(self):
+        result = time_call(sum, ([1, 2, 3],), repeat=3, min_time=0.001)
+        self.assertEqual(result["repeat"], 3)
+        self.assertLessEqual(result["min_s"], result["median_s"])
+        self.assertGreaterEqual(result["loops"], 1)
+
+    def test_run_selection(self):
+        result = run("passives.lowpass", repeat=2, min_time=0.001)
+        self.assertEqual(
+            sorted(result["results"]),
+            [
+                "passives.lowpass_double_rc",
+                "passives.lowpass_rc",
+                "passives.lowpass_rl",
+                "passives.lowpass_rlc",
+            ],
+        )
+
+    def test_compare_flags_regressions(self):
+        rows = compare(report(a=1.0, b=1.0, c=1.0), report(a=1.1, b=1.5, d=9.0))
+        self.assertEqual([row["name"] for row in rows], ["a", "b"])
+        self.assertFalse(rows[0]["regression"])
+        self.assertTrue(rows[1]["regression"])
+        self.assertAlmostEqual(rows[1]["ratio"], 1.5)
+
+    def test_main_compare_exit_status(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {}
+            for name, times in (("base", 1.0), ("fast", 0.9), ("slow", 2.0)):
+                paths[name] = os.path.join(tmp, name + ".json")
+                with open(paths[name], "w") as f:
+                    json.dump(report(x=times), f)
+            args = ["--compare", paths["base"], "--input"]
+            self.assertEqual(main(args + [paths["fast"]]), 0)
+            self.assertEqual(main(args + [paths["slow"]]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from filters.snk.bessel import lowpass, highpass
+import numpy as np
+from filters.snk.bessel import lowpass, highpass, bessel_poles
 
 
 class TestBesselFilters(unittest.TestCase):
@@ -126,6 +127,58 @@ class TestBesselFilters(unittest.TestCase):
             msg=f"Erreur pour R2 : {stages[0]['params']['R2']} != {r_vals[1]}",
         )
 
+    def test_bessel_poles_table(self):
+        # Valeurs du tableau normalisé à -3 dB (précision du tableau ~1e-3)
+        table = {
+            2: [(1.2723, 0.5774)],
+            5: [(1.5015, 0.0), (1.5555, 0.5635), (1.7545, 0.9165)],
+            10: [
+                (1.9412, 0.5039),
+                (1.9790, 0.5376),
+                (2.0606, 0.6205),
+                (2.2021, 0.8098),
+                (2.4487, 1.4153),
+            ],
+        }
+        for order, poles_wanted in table.items():
+            poles = self.lowpass_instance.bessel_q0_omega0(order)
+            np.testing.assert_allclose(poles, poles_wanted, rtol=1e-3, atol=1e-4)
+
+    def test_bessel_poles_high_order(self):
+        order = 25
+        poles = bessel_poles(order)
+        self.assertEqual(len(poles), 13)
+        self.assertEqual(poles[0][1], 0.0)
+
+        # Gain de -3 dB à la pulsation normalisée 1
+        gain = 1.0
+        for omega0_norm, q0 in poles:
+            if q0 == 0.0:
+                gain *= omega0_norm / abs(1j + omega0_norm)
+            else:
+                gain *= omega0_norm**2 / abs(omega0_norm**2 - 1 + 1j * omega0_norm / q0)
+        self.assertAlmostEqual(20 * np.log10(gain), -3.0103, places=3)
+
+        # Le cache est partagé entre les classes
+        self.assertIs(self.highpass_instance.bessel_q0_omega0(order), poles)
+
+    def test_bessel_poles_normalization(self):
+        # Normalisation en retard de groupe : le pôle d'ordre 1 vaut 1
+        np.testing.assert_allclose(bessel_poles(1, "delay"), [(1.0, 0.0)])
+        with self.assertRaises(ValueError):
+            bessel_poles(4, "unknown")
+        with self.assertRaises(ValueError):
+            bessel_poles(0)
+
+    def test_high_order_lowpass(self):
+        order = 15
+        c_vals = [1e-6, 1e-9] * 8
+
+        _, stages = self.lowpass_instance.components(
+            order=order, cutoff_freq=self.cutoff_freq, c_vals=c_vals
+        )
+        self.assertEqual(len(stages), 8)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,12 @@
 import unittest
-from filters.snk.butterworth import Butterworth_HighPass, Butterworth_LowPass
+import warnings
+import numpy as np
+from filters.snk.butterworth import (
+    Butterworth_HighPass,
+    Butterworth_LowPass,
+    butterworth_q_values,
+)
+from filters.snk.sos import sos_freqresp, stages_to_sos
 
 
 class TestButterWorthFilters(unittest.TestCase):
@@ -60,8 +67,8 @@ class TestButterWorthFilters(unittest.TestCase):
         order = 2
         res_values = [1000, 5000]  # Résistances spécifiées
         condos_wanted = [
-            3.751353959644919e-08,
-            1.3504615231233503e-07,
+            3.751317983987942e-08,
+            1.3504744742356593e-07,
         ]  # Valeur attendue à la sortie de la fonction
 
         # Résultats obtenus via la fonction
@@ -83,8 +90,8 @@ class TestButterWorthFilters(unittest.TestCase):
         res_values = [1000, 5000, 12000]  # Résistances spécifiées
         condos_wanted = [
             1.5915494309189535e-07,
-            9.362055475993845e-09,
-            4.5093900542703685e-08,
+            9.362055475993841e-09,
+            4.509390054270369e-08,
         ]  # Valeur attendue à la sortie de la fonction
 
         # Résultats obtenus via la fonction
@@ -105,10 +112,10 @@ class TestButterWorthFilters(unittest.TestCase):
         order = 4
         res_values = [1000, 5000, 12000, 6000]  # Résistances spécifiées
         condos_wanted = [
-            4.901297828649154e-08,
-            1.0336158624160052e-07,
-            6.767137060219711e-09,
-            5.1987962160967617e-08,
+            4.901333147353357e-08,
+            1.0336084142438842e-07,
+            6.76732887780856e-09,
+            5.1986488580219445e-08,
         ]  # Valeur attendue à la sortie de la fonction
 
         # Résultats obtenus via la fonction
@@ -171,8 +178,8 @@ class TestButterWorthFilters(unittest.TestCase):
         order = 2
         res_values = [1000, 5000]  # Résistances spécifiées
         condos_wanted = [
-            2.5366472992716085e-08,
-            1.997147645859791e-07,
+            2.5366787049756184e-08,
+            1.9971229198952036e-07,
         ]  # Valeur attendue à la sortie de la fonction
 
         # Résultats obtenus via la fonction
@@ -210,10 +217,10 @@ class TestButterWorthFilters(unittest.TestCase):
         order = 4
         res_values = [1000, 5000, 1000, 12000]  # Résistances spécifiées
         condos_wanted = [
-            1.837507364548829e-08,
-            2.75702796073461e-07,
-            2.0923392245338568e-08,
-            1.0088507483861624e-07,
+            1.8374922326059813e-08,
+            2.7570506651514164e-07,
+            2.092248883002789e-08,
+            1.0088943097052619e-07,
         ]  # Valeur attendue à la sortie de la fonction
 
         # Résultats obtenus via la fonction
@@ -230,6 +237,147 @@ class TestButterWorthFilters(unittest.TestCase):
             msg=f"Erreur pour C : {condos_wanted} != {values_test}",
         )
 
+    def test_components_batch_matches_scalar(self):  # Mode batch vs appel scalaire
+        order = 5
+        cutoffs = np.array([100.0, 1000.0, 2500.0])
+        condo_values = np.array(
+            [
+                [1e-7, 1e-6, 1e-8, 1e-6, 1e-9],
+                [2.2e-7, 4.7e-6, 1e-8, 2.2e-6, 1e-9],
+                [1e-8, 1e-6, 2.2e-8, 1e-5, 1e-9],
+            ]
+        )
+
+        # Une seule passe vectorisée pour les trois conceptions
+        batch = self.lowpass_instance.components_batch(
+            order=order, cutoff_frequencies=cutoffs, condo_values=condo_values
+        )
+        self.assertEqual(batch["R"].shape, (3, order))
+
+        for i, cutoff in enumerate(cutoffs):
+            values = self.lowpass_instance.components(
+                order=order,
+                cutoff_frequency=float(cutoff),
+                condo_values=condo_values[i].tolist(),
+            )
+            np.testing.assert_allclose(batch["R"][i], values["R"], rtol=1e-12)
+
+    def test_components_batch_highpass_broadcast(self):  # Liste commune diffusée
+        order = 4
+        res_values = [1000, 5000, 1000, 12000]
+        cutoffs = np.linspace(500, 5000, 10)
+
+        batch = self.highpass_instance.components_batch(
+            order=order, cutoff_frequencies=cutoffs, res_values=res_values
+        )
+        self.assertEqual(batch["C"].shape, (10, order))
+        np.testing.assert_allclose(batch["R"], np.tile(res_values, (10, 1)))
+
+        # Les condensateurs sont inversement proportionnels à la fréquence
+        values = self.highpass_instance.components(
+            order=order, cutoff_frequency=1000, res_values=res_values
+        )
+        np.testing.assert_allclose(
+            batch["C"] * cutoffs[:, np.newaxis],
+            np.tile(np.array(values["C"]) * 1000, (10, 1)),
+            rtol=1e-12,
+        )
+
+    def test_components_batch_invalid_condition(self):  # Erreur sur une conception
+        with self.assertRaises(ValueError) as context:
+            self.highpass_instance.components_batch(
+                order=3,
+                cutoff_frequencies=[1000, 2000],
+                res_values=[[1000, 5000, 50000], [1000, 5000, 12000]],
+            )
+        self.assertIn("Condition non respectée au stage 2", str(context.exception))
+
+    def test_butterworth_q_values(self):  # Facteurs de qualité calculés
+        # Valeurs du tableau normalisé (arrondies à 4 chiffres)
+        table = {
+            4: [0.5412, 1.3066],
+            7: [0.0, 0.5550, 0.8019, 2.2470],
+            10: [0.5062, 0.5612, 0.7071, 1.1013, 3.1962],
+        }
+        for order, q_wanted in table.items():
+            np.testing.assert_allclose(butterworth_q_values(order), q_wanted, atol=5e-5)
+
+        # Ordres élevés disponibles sans tableau
+        q_values = butterworth_q_values(31)
+        self.assertEqual(len(q_values), 16)
+        self.assertEqual(q_values[0], 0.0)
+        self.assertEqual(list(q_values[1:]), sorted(q_values[1:]))
+
+        # Le cache est partagé : même objet pour le même ordre
+        self.assertIs(butterworth_q_values(31), q_values)
+
+        with self.assertRaises(ValueError):
+            butterworth_q_values(0)
+
+    def test_high_order_lowpass(self):  # Ordre supérieur à 10
+        order = 16
+        res_values = [1000, 5000] * 8
+        values = self.lowpass_instance.components(
+            order=order, cutoff_frequency=self.cutoff_frequency, res_values=res_values
+        )
+        self.assertEqual(len(values["C"]), order)
+
+    def test_sos_cutoff(self):  # Sections SOS : -3 dB à la fréquence de coupure
+        w = np.array([2 * np.pi * self.cutoff_frequency])
+        designs = [
+            (self.lowpass_instance, {"res_values": [1000, 5000, 12000]}),
+            (self.lowpass_instance, {"condo_values": [1e-7, 1e-6, 1e-8, 1e-6, 1e-9]}),
+            (self.highpass_instance, {"res_values": [1000, 5000, 1000, 12000]}),
+            (self.highpass_instance, {"condo_values": [1e-7, 1e-6, 1e-8]}),
+        ]
+        for instance, values in designs:
+            order = len(next(iter(values.values())))
+            sos = instance.sos(order, self.cutoff_frequency, **values)
+            self.assertEqual(sos.shape, (order // 2 + order % 2, 6))
+            gain = 20 * np.log10(abs(sos_freqresp(sos, w)[0]))
+            self.assertAlmostEqual(gain, -3.0103, places=3)
+
+        stages = self.lowpass_instance.stages(
+            3, self.cutoff_frequency, res_values=[1000, 5000, 12000]
+        )
+        self.assertEqual(set(stages[1]["params"]), {"R1", "R2", "C1", "C2"})
+        sos_lp = self.lowpass_instance.sos(
+            3, self.cutoff_frequency, res_values=[1000, 5000, 12000]
+        )
+        np.testing.assert_allclose(stages_to_sos(stages), sos_lp)
+
+    def test_response_from_components(self):  # Aller-retour components() -> response()
+        designs = [
+            (self.lowpass_instance, {"res_values": [1000, 5000, 12000]}),
+            (self.lowpass_instance, {"condo_values": [1e-7, 1e-6, 1e-8, 1e-6, 1e-9]}),
+            (self.highpass_instance, {"res_values": [1000, 5000, 1000, 12000]}),
+            (self.highpass_instance, {"condo_values": [1e-7, 1e-6, 1e-8]}),
+        ]
+        for instance, values in designs:
+            order = len(next(iter(values.values())))
+            components = instance.components(order, self.cutoff_frequency, **values)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                freq_hz, mag, _ = instance.response(
+                    order, None, components["R"], components["C"]
+                )
+            sos = instance.sos(order, self.cutoff_frequency, **values)
+            expected = 20 * np.log10(abs(sos_freqresp(sos, 2 * np.pi * freq_hz)))
+            np.testing.assert_allclose(mag, expected, atol=1e-9)
+            self.assertAlmostEqual(
+                freq_hz[0] * freq_hz[-1], self.cutoff_frequency**2, delta=1e-3
+            )
+
+    def test_sos_batch(self):  # Sections pour plusieurs conceptions
+        sos = self.highpass_instance.sos_batch(
+            4, [100, 1000, 10000], res_values=[1000, 5000, 1000, 12000]
+        )
+        self.assertEqual(sos.shape, (3, 2, 6))
+        np.testing.assert_allclose(
+            sos[1],
+            self.highpass_instance.sos(4, 1000, res_values=[1000, 5000, 1000, 12000]),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
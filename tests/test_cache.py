@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+from filters.cache import DesignCache, canonical_key
+from filters.snk.bessel import lowpass
+from filters.snk.butterworth import Butterworth_LowPass
+from filters.snk.tchebychev import TchebychevFilter
+
+
+class TestCanonicalKey(unittest.TestCase):
+    def test_normalization(self):
+        self.assertEqual(
+            canonical_key([1000, 5000.0]), canonical_key((1000.0, 5000.0000000001))
+        )
+        self.assertEqual(canonical_key(np.array([1.0, 2.0])), (1.0, 2.0))
+        self.assertEqual(canonical_key({"b": 1, "a": [2]}), (("a", (2.0,)), ("b", 1.0)))
+        self.assertNotEqual(canonical_key(1000.0), canonical_key(1000.1))
+        # Tolérance relative configurable
+        self.assertEqual(canonical_key(1000.0, 1e-2), canonical_key(1001.0, 1e-2))
+        hash(canonical_key({"R": [1, 2], "C": None}))
+
+    def test_unsupported_type(self):
+        with self.assertRaises(TypeError):
+            canonical_key(object())
+
+
+class TestDesignCache(unittest.TestCase):
+    def test_hits_and_call_styles(self):
+        cache = DesignCache()
+        components = cache.wrap(Butterworth_LowPass().components)
+        first = components(4, 1000, res_values=[1000, 5000, 1000, 5000])
+        # Même conception écrite autrement : positionnel, float, tuple
+        second = components(4, 1000.0, (1000.0, 5000, 1000, 5000))
+        self.assertIs(first, second)
+        self.assertEqual(cache.cache_info().hits, 1)
+        self.assertEqual(cache.cache_info().misses, 1)
+        expected = Butterworth_LowPass().components(
+            4, 1000, res_values=[1000, 5000, 1000, 5000]
+        )
+        self.assertEqual(list(first["C"]), expected["C"])
+
+    def test_results_are_immutable(self):
+        cache = DesignCache()
+        design = cache.wrap(TchebychevFilter().design_filter)
+        sos, stages = design(3, 1000, c_vals=[1e-8, 1e-8, 4.7e-9], output="sos")
+        with self.assertRaises(ValueError):
+            sos[0, 0] = 1.0
+        with self.assertRaises(TypeError):
+            stages[0]["params"]["R"] = 1.0
+        with self.assertRaises(TypeError):
+            stages[0] = {}
+
+        # Les TransferFunction ne peuvent être figées : copie à chaque lecture
+        tf, stages = design(3, 1000, c_vals=[1e-8, 1e-8, 4.7e-9])
+        tf.num = np.array([2.0])
+        tf_again, _ = design(3, 1000, c_vals=[1e-8, 1e-8, 4.7e-9])
+        self.assertIsNot(tf, tf_again)
+        self.assertNotEqual(tf_again.num[0], 2.0)
+
+    def test_designer_state_is_part_of_the_key(self):
+        cache = DesignCache()
+        mag = cache.wrap(lowpass("mag").components)
+        delay = cache.wrap(lowpass("delay").components)
+        r_vals = [1000, 1000, 1000, 1000]
+        sos_mag, _ = mag(4, 1000, list(r_vals), output="sos")
+        sos_delay, _ = delay(4, 1000, list(r_vals), output="sos")
+        self.assertFalse(np.allclose(sos_mag, sos_delay))
+        self.assertEqual(cache.cache_info().misses, 2)
+
+    def test_eviction_and_clear(self):
+        calls = []
+
+        def design(order, cutoff):
+            calls.append((order, cutoff))
+            return [order, cutoff]
+
+        cache = DesignCache(maxsize=2)
+        cached = cache.wrap(design)
+        cached(1, 100)
+        cached(2, 100)
+        cached(1, 100)  # (1, 100) devient le plus récent
+        cached(3, 100)  # évince (2, 100)
+        cached(1, 100)
+        self.assertEqual(cache.cache_info(), (2, 3, 1, 2, 2))
+        cached(2, 100)
+        self.assertEqual(calls[-1], (2, 100))
+
+        cache.cache_clear()
+        self.assertEqual(cache.cache_info(), (0, 0, 0, 2, 0))
+
+    def test_errors_are_not_cached(self):
+        cache = DesignCache()
+        components = cache.wrap(Butterworth_LowPass().components)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                components(2, 1000, res_values=[1000])
+        self.assertEqual(cache.cache_info().currsize, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+
+from filters.snk.bessel import bessel_poles, lowpass
+from filters.snk.cascade import (
+    design_cascade,
+    solve_stages,
+    split_pairs,
+    stage_pulsations,
+)
+from filters.snk.tchebychev import TchebychevFilter, tchebychev_poles
+
+
+class TestCascadeEngine(unittest.TestCase):
+    def test_matches_single_stage_methods(self):
+        poles = bessel_poles(4)
+        components, _ = design_cascade(
+            poles, "lowpass", 1000, R1=[1000, 2000], R2=[10000, 3000]
+        )
+        for i, (omega0_norm, q0) in enumerate(poles):
+            (stage,) = lowpass().sallen_key_lowpass(
+                2, 1000, [1000, 2000][i], [10000, 3000][i], None, None, omega0_norm, q0
+            )
+            params = stage["params"]
+            self.assertAlmostEqual(components["C1"][i], params["C1"], delta=1e-18)
+            self.assertAlmostEqual(components["C2"][i], params["C2"], delta=1e-18)
+
+        poles = tchebychev_poles(5)
+        components, _ = design_cascade(
+            poles,
+            "highpass",
+            2500,
+            C1=[1e-8, 1e-8, 2e-8],
+            C2=[np.nan, 5e-9, 1e-8],
+            prefer="C",
+            damping="sum_c",
+        )
+        omega0_norm, q0 = poles[2]
+        _, params = TchebychevFilter().second_order_filter_direct(
+            "highpass", 2500, 2e-8, 1e-8, omega0_norm, q0
+        )
+        self.assertAlmostEqual(components["R1"][2], params["R1"], places=6)
+        self.assertAlmostEqual(components["R2"][2], params["R2"], places=6)
+        self.assertTrue(np.isnan(components["C2"][0]))
+
+    def test_batch_broadcasting(self):
+        poles = bessel_poles(6)
+        cutoffs = np.array([100.0, 1000.0, 5000.0])
+        components, sos = design_cascade(
+            poles, "highpass", cutoffs, R1=1000.0, R2=[[5000.0, 8000.0, 20000.0]]
+        )
+        self.assertEqual(components["C1"].shape, (3, 3))
+        self.assertEqual(sos.shape, (3, 3, 6))
+        for n, fc in enumerate(cutoffs):
+            _, single = design_cascade(
+                poles, "highpass", fc, R1=1000.0, R2=[5000.0, 8000.0, 20000.0]
+            )
+            np.testing.assert_allclose(sos[n], single, rtol=1e-12)
+        # a2 = 1 / omega0^2 et a1 = 1 / (omega0 Q) pour chaque étage
+        omega0 = stage_pulsations("highpass", cutoffs, [w for w, _ in poles])
+        q = np.array([q0 for _, q0 in poles])
+        np.testing.assert_allclose(sos[..., 3], 1 / omega0**2, rtol=1e-12)
+        np.testing.assert_allclose(sos[..., 4], 1 / (omega0 * q), rtol=1e-12)
+
+    def test_prefer_selects_pair(self):
+        values = {"R1": [1000.0], "R2": [1000.0], "C1": [1e-7], "C2": [1e-9]}
+        by_r = solve_stages("lowpass", [1e4], [0.7], prefer="R", **values)
+        by_c = solve_stages("lowpass", [1e4], [0.7], prefer="C", **values)
+        self.assertEqual(by_r["R2"][0], 1000.0)
+        self.assertNotEqual(by_r["C1"][0], 1e-7)
+        self.assertEqual(by_c["C1"][0], 1e-7)
+        self.assertNotEqual(by_c["R2"][0], 1000.0)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, "Étage 2"):
+            solve_stages("lowpass", [1e4, 1e4], [0.0, 0.7], R1=[1000.0, 1000.0])
+        with self.assertRaisesRegex(ValueError, "Condition non respectée au stage 1"):
+            solve_stages("lowpass", [1e4], [2.0], C1=[1e-9], C2=[1e-9])
+
+    def test_split_pairs(self):
+        first, second = split_pairs([1, 2, 3, 4, 5], [0.0, 0.6, 1.3])
+        np.testing.assert_array_equal(first, [1, 2, 4])
+        np.testing.assert_array_equal(second, [np.nan, 3, 5])
+        first, second = split_pairs([1, 0, 2, None], [0.0, 0.6], layout="paired")
+        np.testing.assert_array_equal(first, [1, 2])
+        np.testing.assert_array_equal(second, [0, np.nan])
+        self.assertEqual(split_pairs(None, [0.6]), (None, None))
+
+    def test_tchebychev_accepts_resistances(self):
+        _, stages = TchebychevFilter().design_filter(
+            4, 1000, "lowpass", r_vals=[1000, 20000, 1000, 80000]
+        )
+        self.assertEqual(stages[1]["params"]["R2"], 80000)
+        self.assertGreater(stages[1]["params"]["C1"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import os
+import tempfile
+import unittest
+
+from filters.cli import main, read_specs, run_specs
+from filters.snk.design import design_stages
+
+CSV = """id,family,filter_type,order,cutoff_frequency,r_vals,c_vals,ripple_db
+a,butterworth,lowpass,4,1000,1000;10000;1000;10000,,
+b,bessel,highpass,2,2000,,1e-8;1e-8,
+c,tchebychev,lowpass,3,5000,,1e-8;1e-8;1e-9,0.5
+d,bessel,bandpass,2,2000,,1e-8;1e-8,
+"""
+
+YAML = """designs:
+  - family: butterworth
+    filter_type: highpass
+    order: 3
+    cutoff_frequency: 2000
+    c_vals: [1.0e-7, 1.0e-8, 1.0e-8]
+"""
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_read_csv(self):
+        specs = list(read_specs(self.write("spec.csv", CSV)))
+        self.assertEqual(len(specs), 4)
+        self.assertEqual(
+            specs[0],
+            {
+                "id": "a",
+                "family": "butterworth",
+                "filter_type": "lowpass",
+                "order": 4,
+                "cutoff_frequency": 1000.0,
+                "r_vals": [1000.0, 10000.0, 1000.0, 10000.0],
+            },
+        )
+        self.assertEqual(specs[2]["ripple_db"], 0.5)
+
+    def test_read_yaml(self):
+        specs = list(read_specs(self.write("spec.yml", YAML)))
+        self.assertEqual(len(specs), 1)
+        self.assertEqual(specs[0]["c_vals"], [1e-7, 1e-8, 1e-8])
+
+    def test_results_match_design_stages(self):
+        specs = list(read_specs(self.write("spec.csv", CSV)))
+        results = [json.loads(line) for line in run_specs(specs, workers=1)]
+        self.assertEqual([r["row"] for r in results], [1, 2, 3, 4])
+        self.assertEqual(results[0]["id"], "a")
+        expected = design_stages(**results[0]["design"])
+        for stage, reference in zip(results[0]["stages"], expected):
+            self.assertEqual(stage["params"], reference["params"])
+            self.assertEqual(stage["sos"], list(reference["sos"]))
+        self.assertNotIn("error", results[2])
+        self.assertIn("ValueError", results[3]["error"])
+
+    def test_workers_and_batches_preserve_order(self):
+        specs = list(read_specs(self.write("spec.csv", CSV))) * 5
+        sequential = list(run_specs(specs, workers=1))
+        parallel = list(run_specs(iter(specs), workers=2, batch_size=3))
+        self.assertEqual(sequential, parallel)
+
+    def test_malformed_row_is_reported(self):
+        path = self.write(
+            "spec.csv",
+            CSV + "e,bessel,lowpass,2,abc,1000;1000,,\n" + CSV.split("\n")[1],
+        )
+        results = [json.loads(line) for line in run_specs(read_specs(path), workers=1)]
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[4]["id"], "e")
+        self.assertIn("cutoff_frequency", results[4]["error"])
+        self.assertEqual(results[4]["design"]["cutoff_frequency"], "abc")
+        self.assertNotIn("error", results[5])
+
+    def test_rows_with_wrong_field_count_are_reported(self):
+        path = self.write(
+            "spec.csv",
+            CSV
+            + "e,bessel,lowpass,2,1000,,1e-8;1e-8,,extra\n"
+            + "f,bessel,lowpass\n"
+            + CSV.split("\n")[1],
+        )
+        results = [json.loads(line) for line in run_specs(read_specs(path), workers=1)]
+        self.assertEqual(len(results), 7)
+        self.assertEqual(results[4]["id"], "e")
+        self.assertIn("en trop", results[4]["error"])
+        self.assertEqual(results[5]["id"], "f")
+        self.assertIn("manquant", results[5]["error"])
+        self.assertNotIn("error", results[6])
+
+    def test_main_counts_error_records_only(self):
+        # Une clé "error" imbriquée (ici dans l'id) n'est pas une erreur
+        spec = YAML + "    id: {error: none}\n"
+        output = os.path.join(self.tmp.name, "out.jsonl")
+        self.assertEqual(main([self.write("spec.yml", spec), "-o", output]), 0)
+        with open(output) as f:
+            self.assertIn('"error":', f.read())
+
+    def test_main_writes_json_lines(self):
+        output = os.path.join(self.tmp.name, "out.jsonl")
+        status = main([self.write("spec.csv", CSV), "-o", output, "-w", "1"])
+        self.assertEqual(status, 1)
+        with open(output) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 4)
+        status = main([self.write("spec.yml", YAML), "-o", output, "-w", "1"])
+        self.assertEqual(status, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
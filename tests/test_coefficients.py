@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+
+from filters.snk.bessel import bessel_poles, lowpass
+from filters.snk.butterworth import Butterworth_HighPass
+from filters.snk.coefficients import (
+    MAX_ORDER,
+    coefficient_table,
+    read_reference_table,
+    stage_coefficients,
+    validate_coefficients,
+)
+from filters.snk.sos import section_parameters
+from filters.snk.tchebychev import TchebychevFilter, tchebychev_poles
+
+
+class TestCoefficientStore(unittest.TestCase):
+    def test_tables_are_shared_and_read_only(self):
+        table = coefficient_table("bessel")
+        self.assertIs(table, coefficient_table("bessel", ripple_db=3.0))
+        self.assertEqual(table.omega0.shape, (MAX_ORDER + 1, (MAX_ORDER + 1) // 2))
+        with self.assertRaises(ValueError):
+            table.q[2, 0] = 1.0
+        omega0, _ = stage_coefficients("bessel", 4)
+        self.assertTrue(np.shares_memory(omega0, table.omega0))
+        self.assertFalse(omega0.flags.writeable)
+
+    def test_matches_generators(self):
+        for order in (1, 4, 7, MAX_ORDER + 3):
+            omega0, q = stage_coefficients("tchebychev", order, ripple_db=0.5)
+            np.testing.assert_array_equal(
+                np.column_stack([omega0, q]), tchebychev_poles(order, 0.5)
+            )
+            omega0, q = stage_coefficients("bessel", order, normalization="delay")
+            np.testing.assert_array_equal(
+                np.column_stack([omega0, q]), bessel_poles(order, "delay")
+            )
+        omega0, q = stage_coefficients("butterworth", 5)
+        np.testing.assert_array_equal(omega0, 1.0)
+        np.testing.assert_allclose(q, [0.0, 0.6180, 1.6180], atol=1e-4)
+
+    def test_padding_and_stage_counts(self):
+        table = coefficient_table("butterworth")
+        self.assertEqual(table.n_stages[7], 4)
+        self.assertTrue(np.isnan(table.q[3, 2:]).all())
+
+    def test_invalid_family(self):
+        with self.assertRaises(ValueError):
+            coefficient_table("elliptic")
+
+    def test_designers_read_the_shared_table(self):
+        f = 1000
+        w = 2 * np.pi * f
+        designs = {
+            "bessel": lowpass("delay").components(
+                5, f, c_vals=[10e-9, 0, 10e-9, 2.2e-9, 10e-9, 1e-9], output="sos"
+            )[0],
+            "butterworth": Butterworth_HighPass().sos(5, f, condo_values=[10e-9] * 5),
+            "tchebychev": TchebychevFilter().design_filter(
+                5, f, c_vals=[10e-9, 10e-9, 4.7e-9, 10e-9, 4.7e-9], output="sos"
+            )[0],
+        }
+        for family, sos in designs.items():
+            omega0, q = section_parameters(sos)
+            expected = stage_coefficients(family, 5, normalization="delay")
+            np.testing.assert_allclose(q, expected[1], rtol=1e-9)
+            if family != "butterworth":
+                np.testing.assert_allclose(omega0 / w, expected[0], rtol=1e-9)
+
+    def test_bool_order(self):
+        with self.assertRaises(ValueError):
+            stage_coefficients("butterworth", True)
+
+    def test_reference_table(self):
+        tables = read_reference_table()
+        self.assertEqual(len(tables[("tchebychev", 0.5)][10]), 5)
+        self.assertEqual(tables[("bessel", None)][3][0], (1.3225, 0.0))
+
+    def test_validation_against_reference_table(self):
+        # Seules deux coquilles du tableau dépassent 0.1 %
+        mismatches = validate_coefficients()
+        self.assertEqual(
+            [(m["family"], m["ripple_db"], m["order"], m["name"]) for m in mismatches],
+            [("tchebychev", 0.5, 9, "q"), ("tchebychev", 1.0, 8, "omega0")],
+        )
+        self.assertEqual(len(validate_coefficients(rtol=1e-2)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
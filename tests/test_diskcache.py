@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from filters.diskcache import SQLiteDesignCache, request_key
+from filters.snk.design import design_stages
+
+REQUEST = {
+    "family": "bessel",
+    "filter_type": "lowpass",
+    "order": 4,
+    "cutoff_frequency": 1000,
+    "r_vals": [1000, 1000, 1000, 1000],
+}
+
+
+def _design_in_worker(path, cutoff):
+    with SQLiteDesignCache(path) as cache:
+        sos, _ = cache.design("butterworth", "highpass", 2, cutoff, c_vals=[1e-8] * 2)
+        return sos.tolist()
+
+
+class TestSQLiteDesignCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "designs.sqlite")
+
+    def open(self, **kwargs):
+        cache = SQLiteDesignCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_round_trip_across_instances(self):
+        first = self.open()
+        sos, stages = first.design(**REQUEST)
+        self.assertEqual((first.disk_misses, first.disk_hits), (1, 0))
+        expected = design_stages(**REQUEST)
+        np.testing.assert_array_equal(sos, np.vstack([s["sos"] for s in expected]))
+        self.assertEqual(dict(stages[1]["params"]), expected[1]["params"])
+        with self.assertRaises(ValueError):
+            sos[0, 0] = 0
+
+        # Second appel servi par la mémoire, sans accès disque
+        first.design(**REQUEST)
+        self.assertEqual((first.disk_misses, first.disk_hits), (1, 0))
+
+        # Un autre processus (nouvelle instance) lit la base
+        second = self.open()
+        sos_again, _ = second.design(**REQUEST)
+        self.assertEqual((second.disk_misses, second.disk_hits), (0, 1))
+        np.testing.assert_array_equal(sos_again, sos)
+
+    def test_wal_mode(self):
+        self.open().design(**REQUEST)
+        with sqlite3.connect(self.path) as connection:
+            (mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+        self.assertEqual(mode, "wal")
+
+    def test_key_is_stable_and_versioned(self):
+        request = dict(REQUEST, r_vals=(1000.0, 1000, 1000, 1000.0000000001))
+        self.assertEqual(request_key(REQUEST), request_key(request))
+        self.assertNotEqual(request_key(REQUEST), request_key(REQUEST, version="0.0.0"))
+        self.assertNotEqual(
+            request_key(REQUEST), request_key(dict(REQUEST, cutoff_frequency=1001))
+        )
+
+    def test_size_bounded_eviction(self):
+        cache = self.open(max_entries=3)
+        for cutoff in range(1000, 1006):
+            cache.design("butterworth", "lowpass", 1, cutoff, r_vals=[1000])
+        cache.evict()
+        self.assertEqual(len(cache), 3)
+        # Les plus récentes sont conservées
+        fresh = self.open()
+        fresh.design("butterworth", "lowpass", 1, 1005, r_vals=[1000])
+        self.assertEqual(fresh.disk_hits, 1)
+
+    def test_eviction_on_open(self):
+        # Processus de courte durée : bien moins de EVICTION_INTERVAL insertions
+        for cutoff in range(1000, 1006):
+            with SQLiteDesignCache(self.path) as cache:
+                cache.design("butterworth", "lowpass", 1, cutoff, r_vals=[1000])
+        bounded = self.open(max_entries=3)
+        self.assertEqual(len(bounded), 3)
+        bounded.design("butterworth", "lowpass", 1, 1005, r_vals=[1000])
+        self.assertEqual(bounded.disk_hits, 1)
+        # warm_up() applique aussi la borne
+        for cutoff in (2000, 2001):
+            self.open().design("butterworth", "lowpass", 1, cutoff, r_vals=[1000])
+        bounded.warm_up()
+        self.assertEqual(len(bounded), 3)
+
+    def test_reads_are_not_write_transactions(self):
+        self.open().design(**REQUEST)
+        with sqlite3.connect(self.path) as connection:
+            (before,) = connection.execute("SELECT last_used FROM designs").fetchone()
+        reader = self.open()
+        changes = reader.connection.total_changes
+        reader.design(**REQUEST)
+        self.assertEqual(reader.disk_hits, 1)
+        self.assertEqual(reader.connection.total_changes, changes)
+        # Date d'utilisation écrite à la fermeture
+        reader.close()
+        with sqlite3.connect(self.path) as connection:
+            (after,) = connection.execute("SELECT last_used FROM designs").fetchone()
+        self.assertGreater(after, before)
+
+    def test_damping_round_trip(self):
+        request = {
+            "family": "tchebychev",
+            "filter_type": "lowpass",
+            "order": 4,
+            "cutoff_frequency": 1000,
+            "c_vals": [1e-8, 4.7e-9] * 2,
+        }
+        self.open().design(**request)
+        _, stages = self.open().design(**request)
+        self.assertEqual(stages[1]["damping"], "sum_c")
+
+    def test_warm_up(self):
+        cache = self.open()
+        for cutoff in (1000, 2000, 3000):
+            cache.design("butterworth", "lowpass", 1, cutoff, r_vals=[1000])
+
+        worker = self.open(memory_size=2)
+        self.assertEqual(worker.warm_up(), 2)
+        # Préchargement : ni succès ni échec dans les statistiques
+        info = worker.memory.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 2))
+        worker.design("butterworth", "lowpass", 1, 3000, r_vals=[1000])
+        worker.design("butterworth", "lowpass", 1, 2000, r_vals=[1000])
+        self.assertEqual((worker.disk_hits, worker.disk_misses), (0, 0))
+        worker.design("butterworth", "lowpass", 1, 1000, r_vals=[1000])
+        self.assertEqual(worker.disk_hits, 1)
+
+    def test_concurrent_processes(self):
+        cutoffs = [1000 + 10 * (i % 4) for i in range(16)]
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(_design_in_worker, [self.path] * len(cutoffs), cutoffs)
+            )
+        self.assertEqual(len(self.open()), 4)
+        for cutoff, sos in zip(cutoffs, results):
+            self.assertEqual(sos, results[cutoffs.index(cutoff)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+import unittest
+
+import numpy as np
+
+from filters.eseries import (
+    E12,
+    E24,
+    E96,
+    cutoff_error,
+    optimize_stages,
+    preferred_values,
+    snap,
+    snap_stages,
+)
+from filters.snk.bessel import highpass, lowpass
+from filters.snk.butterworth import Butterworth_HighPass, Butterworth_LowPass
+from filters.snk.sos import section_parameters, stage_section
+from filters.snk.tchebychev import TchebychevFilter
+
+
+class TestPreferredValues(unittest.TestCase):
+    def test_tables(self):
+        self.assertEqual((len(E12), len(E24), len(E96)), (12, 24, 96))
+        # Chaque série contient la précédente (E12 dans E24)
+        self.assertTrue(set(E12) <= set(E24))
+        values = preferred_values("E96")
+        self.assertTrue(np.all(np.diff(values) > 0))
+        self.assertFalse(values.flags.writeable)
+        self.assertIn(4.7e-9, preferred_values("E12"))
+
+    def test_unknown_series(self):
+        with self.assertRaises(ValueError):
+            preferred_values("E7")
+
+
+class TestSnap(unittest.TestCase):
+    def test_scalar(self):
+        self.assertEqual(snap(1.061e-07), 1.1e-07)
+        self.assertEqual(snap(1.061e-07, "E96"), 1.07e-07)
+        self.assertEqual(snap(1.061e-07, "E12"), 1.0e-07)
+        self.assertEqual(snap(4.7e-9, "E12"), 4.7e-9)
+        self.assertIsInstance(snap(5000), float)
+
+    def test_geometric_midpoint(self):
+        # sqrt(1000 * 1200) = 1095.4 : 1095 -> 1000, 1096 -> 1200 (E12)
+        np.testing.assert_array_equal(snap([1095, 1096], "E12"), [1000, 1200])
+        # Passage de décade : 9.6 -> 10 en E24 (sqrt(9.1 * 10) = 9.54)
+        self.assertEqual(snap(9.6), 10.0)
+
+    def test_batch_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        values = 10 ** rng.uniform(-12, 6, size=(200, 7))
+        table = preferred_values("E96")
+        expected = table[np.argmin(np.abs(np.log(values[..., None] / table)), -1)]
+        np.testing.assert_array_equal(snap(values, "E96"), expected)
+
+    def test_out_of_range(self):
+        for value in (0, -1e3, 1e12, np.nan):
+            with self.assertRaises(ValueError):
+                snap([1e3, value])
+
+
+class TestSnapStages(unittest.TestCase):
+    def test_exact_values_have_no_error(self):
+        _, stages = lowpass().components(
+            3, 1000, r_vals=[1000, 0, 1000, 1000], output="sos"
+        )
+        result = snap_stages(stages, "lowpass", 1000, "E96")
+        self.assertEqual(result["stages"][0]["params"]["R"], 1000)
+        self.assertEqual(len(result["stages"]), 2)
+        self.assertEqual(result["q_error"].shape, (2,))
+        self.assertEqual(result["q_error"][0], 0)
+        self.assertLess(np.max(np.abs(result["omega0_error"])), 0.02)
+        self.assertLess(abs(result["cutoff_error"]), 0.02)
+
+    def test_errors_follow_snapped_sections(self):
+        stages = Butterworth_LowPass().stages(2, 1000, res_values=[1000, 10000])
+        result = snap_stages(stages, "lowpass", 1000, "E12")
+        omega0, q = section_parameters(result["stages"][0]["sos"][np.newaxis])
+        ideal_omega0, ideal_q = section_parameters(stages[0]["sos"][np.newaxis])
+        self.assertAlmostEqual(
+            result["omega0_error"][0], omega0[0] / ideal_omega0[0] - 1
+        )
+        self.assertAlmostEqual(result["q_error"][0], q[0] / ideal_q[0] - 1)
+        self.assertTrue(np.isfinite(result["cutoff_error"]))
+
+    def test_tchebychev_lowpass(self):
+        # Passe-bas de tchebychev : a1 = R1 (C1 + C2) (montage "sum_c")
+        _, stages = TchebychevFilter().design_filter(
+            4, 1000, "lowpass", c_vals=[1e-8, 4.7e-9] * 2, output="sos"
+        )
+        result = snap_stages(stages, "lowpass", 1000, "E96")
+        _, ideal_q = section_parameters(np.stack([s["sos"] for s in stages]))
+        _, q = section_parameters(np.stack([s["sos"] for s in result["stages"]]))
+        np.testing.assert_allclose(result["q_error"], q / ideal_q - 1, atol=1e-12)
+        self.assertLess(np.abs(result["q_error"]).max(), 0.02)
+        self.assertLess(abs(result["cutoff_error"]), 0.02)
+        self.assertEqual(result["stages"][0]["damping"], "sum_c")
+
+    def test_batch(self):
+        cutoffs = np.linspace(500, 5000, 50)
+        designer = Butterworth_HighPass()
+        stages = designer.stages_batch(3, cutoffs, condo_values=[1e-7, 1e-8, 1e-8])
+        self.assertEqual(stages[1]["params"]["R1"].shape, (50,))
+        result = snap_stages(stages, "highpass", cutoffs, "E24")
+        self.assertEqual(result["omega0_error"].shape, (50, 2))
+        self.assertEqual(result["cutoff_error"].shape, (50,))
+        # Identique à la normalisation conception par conception
+        for i in (0, 17, 49):
+            single = snap_stages(
+                designer.stages(3, cutoffs[i], condo_values=[1e-7, 1e-8, 1e-8]),
+                "highpass",
+                cutoffs[i],
+                "E24",
+            )
+            self.assertAlmostEqual(
+                single["cutoff_error"], result["cutoff_error"][i], places=12
+            )
+            np.testing.assert_allclose(
+                single["omega0_error"], result["omega0_error"][i], atol=1e-12
+            )
+
+    def test_cutoff_error_of_scaled_design(self):
+        sos = Butterworth_LowPass().sos(4, 1000, res_values=[1000, 10000] * 2)
+        # Multiplier tous les a1 par k et a2 par k^2 décale la coupure de 1/k
+        scaled = sos.copy()
+        scaled[:, 4] *= 1.05
+        scaled[:, 3] *= 1.05**2
+        self.assertAlmostEqual(cutoff_error(sos, scaled, 1000), 1 / 1.05 - 1, places=7)
+
+
+class TestOptimizeStages(unittest.TestCase):
+    def test_matches_exhaustive_search(self):
+        table = preferred_values("E12")
+        designs = [
+            (
+                "lowpass",
+                lowpass().components(2, 1234, r_vals=[1000, 4700], output="sos"),
+            ),
+            (
+                "highpass",
+                highpass().components(2, 1234, c_vals=[1e-8, 3.3e-8], output="sos"),
+            ),
+            # Passe-bas de tchebychev : montage "sum_c"
+            (
+                "lowpass",
+                TchebychevFilter().design_filter(
+                    2, 1234, "lowpass", c_vals=[1e-8, 4.7e-9], output="sos"
+                ),
+            ),
+        ]
+        for filter_type, (_, stages) in designs:
+            params = stages[0]["params"]
+            omega0, q = section_parameters(stages[0]["sos"])
+            # Toutes les combinaisons à un facteur 2 des valeurs calculées
+            grids = np.meshgrid(
+                *(
+                    table[(table >= params[name] / 2) & (table <= params[name] * 2)]
+                    for name in ("R1", "R2", "C1", "C2")
+                ),
+                indexing="ij",
+            )
+            candidates = dict(zip(("R1", "R2", "C1", "C2"), grids))
+            all_omega0, all_q = section_parameters(
+                stage_section(filter_type, stages[0], candidates)
+            )
+            errors = np.log(all_omega0 / omega0) ** 2 + np.log(all_q / q) ** 2
+
+            result = optimize_stages(stages, filter_type, 1234, "E12", spread=2)
+            error = (
+                np.log1p(result["omega0_error"][0]) ** 2
+                + np.log1p(result["q_error"][0]) ** 2
+            )
+            self.assertAlmostEqual(error, errors.min(), delta=1e-15)
+            for value in result["stages"][0]["params"].values():
+                self.assertIn(value, table)
+            self.assertEqual(
+                result["stages"][0].get("damping"), stages[0].get("damping")
+            )
+
+    def test_better_than_rounding(self):
+        stages = Butterworth_LowPass().stages(8, 1000, res_values=[1000, 4700] * 4)
+        rounded = snap_stages(stages, "lowpass", 1000, "E24")
+        result = optimize_stages(stages, "lowpass", 1000, "E24")
+        self.assertLess(np.abs(result["q_error"]).max(), 0.005)
+        self.assertLess(
+            np.abs(result["q_error"]).max(), np.abs(rounded["q_error"]).max()
+        )
+        self.assertLess(abs(result["cutoff_error"]), abs(rounded["cutoff_error"]))
+        # Chaque composant reste à un facteur spread de sa valeur calculée
+        for stage, ideal in zip(result["stages"], stages):
+            for name, value in stage["params"].items():
+                ratio = value / ideal["params"][name]
+                self.assertTrue(1 / 3 <= ratio <= 3)
+
+    def test_first_order_and_errors(self):
+        _, stages = lowpass().components(
+            3, 1000, r_vals=[1000, 0, 1000, 1000], output="sos"
+        )
+        result = optimize_stages(stages, "lowpass", 1000, "E96")
+        self.assertEqual(result["q_error"][0], 0)
+        self.assertLess(abs(result["omega0_error"][0]), 0.01)
+        with self.assertRaises(ValueError):
+            optimize_stages(stages, "lowpass", 1000, spread=1)
+        batch = Butterworth_HighPass().stages_batch(
+            2, [500, 1000], condo_values=[1e-7, 1e-8]
+        )
+        with self.assertRaises(ValueError):
+            optimize_stages(batch, "highpass", [500, 1000])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Budget de démarrage d'un processus qui importe toute la librairie
+# (numpy compris) sans tracer ni utiliser scipy.
+IMPORT_BUDGET_S = 0.5
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import filters
+import filters.passives.band_pass, filters.passives.band_stop
+import filters.passives.high_pass, filters.passives.low_pass
+import filters.snk.bessel, filters.snk.butterworth, filters.snk.tchebychev
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in ("scipy", "matplotlib") if m in sys.modules)
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    def run_import(self):
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT], capture_output=True, check=True, text=True
+        ).stdout
+        return json.loads(output)
+
+    def test_heavy_dependencies_are_lazy(self):
+        self.assertEqual(self.run_import()["heavy"], [])
+
+    def test_import_budget(self):
+        # Meilleur de 3 essais pour ne pas dépendre d'un démarrage à froid
+        elapsed = min(self.run_import()["elapsed"] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET_S)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import threading
+import unittest
+
+from filters.instrumentation import Recorder, instrument, phase, timed
+from filters.snk.bessel import lowpass
+from filters.snk.butterworth import Butterworth_HighPass
+from filters.snk.tchebychev import TchebychevFilter
+
+
+class TestRecorder(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        recorder = Recorder()
+        with phase("outside"):
+            pass
+        self.assertEqual(recorder.as_dict(), {})
+
+    def test_nested_phases_and_statistics(self):
+        @timed("work")
+        def work():
+            with phase("inner"):
+                pass
+
+        with instrument() as recorder:
+            work()
+            work()
+        summary = recorder.as_dict()
+        self.assertEqual(list(summary), ["work", "work/inner"])
+        self.assertEqual(summary["work"]["calls"], 2)
+        self.assertLessEqual(summary["work/inner"]["min_s"], summary["work"]["max_s"])
+        self.assertAlmostEqual(
+            summary["work"]["mean_s"], summary["work"]["total_s"] / 2
+        )
+        self.assertEqual(json.loads(recorder.to_json()), summary)
+        # Hors du bloc, plus rien n'est enregistré
+        work()
+        self.assertEqual(recorder.as_dict()["work"]["calls"], 2)
+
+    def test_errors_are_timed_and_propagated(self):
+        with instrument() as recorder, self.assertRaises(ValueError), phase("failing"):
+            raise ValueError
+        self.assertEqual(recorder.as_dict()["failing"]["calls"], 1)
+
+    def test_shared_recorder_across_threads(self):
+        recorder = Recorder()
+
+        def request():
+            with instrument(recorder):
+                for _ in range(100):
+                    with phase("request"):
+                        pass
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(list(recorder.as_dict()), ["request"])
+        self.assertEqual(recorder.as_dict()["request"]["calls"], 400)
+        recorder.reset()
+        self.assertEqual(recorder.as_dict(), {})
+
+
+class TestDesignerPhases(unittest.TestCase):
+    def test_bessel_phases_per_stage(self):
+        with instrument() as recorder:
+            lowpass().components(5, 1000, r_vals=[1000] * 6)
+        summary = recorder.as_dict()
+        prefix = "bessel.lowpass.components"
+        for name in ("validation", "stage[1]", "stage[3]", "combine/polymul"):
+            self.assertIn(f"{prefix}/{name}", summary)
+        self.assertEqual(summary[f"{prefix}/stage[2]/transfer_function"]["calls"], 1)
+        self.assertEqual(summary[f"{prefix}/combine/transfer_function"]["calls"], 1)
+
+    def test_tchebychev_sos_output_skips_combination(self):
+        with instrument() as recorder:
+            TchebychevFilter().design_filter(
+                4, 1000, "highpass", c_vals=[1e-8] * 4, output="sos"
+            )
+        summary = recorder.as_dict()
+        self.assertIn("tchebychev.design_filter/stage[2]", summary)
+        self.assertNotIn("tchebychev.design_filter/combine", summary)
+
+    def test_butterworth_phases(self):
+        with instrument() as recorder:
+            Butterworth_HighPass().stages(3, 1000, condo_values=[1e-8] * 3)
+        summary = recorder.as_dict()
+        for name in ("validation", "kernel", "sections"):
+            self.assertIn(f"butterworth.highpass.stages/{name}", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+
+from filters.montecarlo import monte_carlo, perturb
+from filters.response import frequency_response
+from filters.snk.bessel import lowpass
+from filters.snk.butterworth import Butterworth_LowPass
+from filters.snk.sos import section_from_params
+from filters.snk.tchebychev import TchebychevFilter
+
+
+class TestPerturb(unittest.TestCase):
+    def test_uniform_bounds(self):
+        samples = perturb([1000.0, 1e-8], [0.01, 0.05], 10000, seed=0)
+        self.assertEqual(samples.shape, (10000, 2))
+        ratio = samples / [1000.0, 1e-8] - 1
+        self.assertTrue(np.all(np.abs(ratio) <= [0.01 + 1e-12, 0.05 + 1e-12]))
+        self.assertGreater(np.abs(ratio[:, 1]).max(), 0.049)
+
+    def test_normal_three_sigma(self):
+        samples = perturb([1.0], 0.03, 100000, distribution="normal", seed=0)
+        self.assertAlmostEqual(np.std(samples), 0.01, places=3)
+
+    def test_seed_and_invalid_distribution(self):
+        np.testing.assert_array_equal(
+            perturb([1.0, 2.0], 0.1, 5, seed=3), perturb([1.0, 2.0], 0.1, 5, seed=3)
+        )
+        with self.assertRaises(ValueError):
+            perturb([1.0], 0.1, 5, distribution="triangle")
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        _, self.stages = lowpass().components(
+            4, 1000, r_vals=[1000, 1000, 1000, 1000], output="sos"
+        )
+
+    def test_zero_tolerance(self):
+        result = monte_carlo(self.stages, "lowpass", 1000, 20, tolerance=0.0, seed=0)
+        np.testing.assert_allclose(result["cutoff"], 1000)
+        nominal, _ = frequency_response(self.stages, result["freqs"])
+        for envelope in result["gain_envelope"].values():
+            np.testing.assert_allclose(envelope, nominal)
+
+    def test_tchebychev_lowpass(self):
+        # Étages passe-bas de tchebychev : a1 = R1 (C1 + C2) (montage "sum_c")
+        _, stages = TchebychevFilter().design_filter(
+            4, 1000, "lowpass", c_vals=[1e-8, 4.7e-9] * 2, output="sos"
+        )
+        freqs = [100.0, 1000.0, 3000.0]
+        nominal, _ = frequency_response(stages, freqs)
+        result = monte_carlo(
+            stages, "lowpass", 1000, 20, tolerance=0.0, freqs=freqs, seed=0
+        )
+        np.testing.assert_allclose(result["cutoff"], 1000)
+        np.testing.assert_allclose(result["gain_envelope"][50], nominal, atol=1e-9)
+        # Ordre pair à gain statique unitaire : 0 dB à la fin de l'ondulation
+        self.assertAlmostEqual(nominal[1], 0.0, places=6)
+
+        result = monte_carlo(
+            stages, "lowpass", 1000, 2000, tolerance=0.01, freqs=freqs, seed=0
+        )
+        self.assertAlmostEqual(result["gain_envelope"][50][1], 0.0, delta=0.5)
+        self.assertAlmostEqual(result["cutoff_percentiles"][50], 1000, delta=10)
+
+    def test_matches_per_sample_loop(self):
+        tolerance = {"R": 0.01, "C": 0.05}
+        result = monte_carlo(
+            self.stages, "lowpass", 1000, 50, tolerance=tolerance, seed=42
+        )
+        self.assertEqual(result["omega0"].shape, (50, 2))
+        self.assertEqual(result["magnitude_db"].shape, (50, 200))
+
+        # Mêmes tirages, recalculés un par un
+        names = [(i, n) for i, stage in enumerate(self.stages) for n in stage["params"]]
+        nominal = [self.stages[i]["params"][n] for i, n in names]
+        samples = perturb(nominal, [tolerance[n[0]] for _, n in names], 50, seed=42)
+        for k in (0, 25, 49):
+            params = [{}, {}]
+            for column, (i, name) in enumerate(names):
+                params[i][name] = samples[k, column]
+            sos = np.stack([section_from_params("lowpass", p) for p in params])
+            mag, _ = frequency_response(sos, result["freqs"])
+            np.testing.assert_allclose(result["magnitude_db"][k], mag)
+            p = params[0]
+            omega0 = 1 / np.sqrt(p["R1"] * p["R2"] * p["C1"] * p["C2"])
+            self.assertAlmostEqual(result["omega0"][k, 0], omega0)
+
+    def test_envelopes(self):
+        stages = Butterworth_LowPass().stages(3, 1000, res_values=[1000, 1000, 10000])
+        result = monte_carlo(
+            stages,
+            "lowpass",
+            1000,
+            5000,
+            tolerance=0.05,
+            distribution="normal",
+            percentiles=(5, 50, 95),
+            seed=1,
+        )
+        cutoffs = result["cutoff_percentiles"]
+        self.assertLess(cutoffs[5], 1000)
+        self.assertGreater(cutoffs[95], 1000)
+        self.assertAlmostEqual(cutoffs[50], 1000, delta=10)
+        self.assertTrue(
+            np.all(result["gain_envelope"][5] <= result["gain_envelope"][95])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
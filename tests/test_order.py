@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from filters.response import magnitude_response
+from filters.snk.design import design_stages
+from filters.snk.order import minimum_order, minimum_orders
+
+
+class TestMinimumOrder(unittest.TestCase):
+    def test_closed_forms(self):
+        # 1 dB à 1 kHz, 40 dB à 3 kHz
+        self.assertEqual(
+            minimum_order("butterworth", "lowpass", 1000, 1, 3000, 40)[0], 5
+        )
+        self.assertEqual(
+            minimum_order("tchebychev", "lowpass", 1000, 1, 3000, 40)[0], 4
+        )
+        estimate = minimum_order("tchebychev", "highpass", 3000, 0.5, 1000, 40)
+        self.assertEqual(estimate.order, 4)
+        self.assertEqual(estimate.cutoff_freq, 3000)
+
+    def test_designs_meet_specification(self):
+        cases = [
+            ("butterworth", "lowpass", 1000, 3000, {"r_vals": [1000.0] * 5}),
+            ("butterworth", "highpass", 3000, 1000, {"c_vals": [1e-8] * 5}),
+            ("tchebychev", "lowpass", 1000, 3000, {"c_vals": [1e-8] * 4}),
+            ("bessel", "lowpass", 1000, 6000, {"r_vals": [1000.0] * 14}),
+            ("bessel", "highpass", 6000, 1000, {"c_vals": [1e-8] * 14}),
+        ]
+        for family, filter_type, passband, stopband, values in cases:
+            order, cutoff = minimum_order(
+                family, filter_type, passband, 1.0, stopband, 40
+            )
+            options = {"ripple_db": 1.0} if family == "tchebychev" else {}
+            stages = design_stages(
+                family, filter_type, order, cutoff, **values, **options
+            )
+            gain = magnitude_response(stages, [passband, stopband])
+            self.assertGreaterEqual(gain[0], -1.0 - 1e-9)
+            self.assertLessEqual(gain[1], -40.0)
+        # Bessel d'ordre 6 : 38 dB seulement à 6 kHz
+        self.assertEqual(minimum_order("bessel", "lowpass", 1000, 1, 6000, 40)[0], 7)
+
+    def test_batch(self):
+        passband = np.array([1000.0, 1000.0, 200.0])
+        stopband = passband * np.array([6.0, 10.0, 20.0])
+        attenuations = np.array([[30.0], [40.0]])
+        orders = minimum_orders("lowpass", passband, 1.0, stopband, attenuations)
+        for family, (order, cutoff) in orders.items():
+            self.assertEqual(order.shape, (2, 3))
+            self.assertEqual(cutoff.shape, (2, 3))
+            for i, j in np.ndindex(order.shape):
+                single = minimum_order(
+                    family, "lowpass", passband[j], 1.0, stopband[j], attenuations[i, 0]
+                )
+                self.assertEqual(order[i, j], single.order)
+                self.assertAlmostEqual(cutoff[i, j], single.cutoff_freq)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, "Bessel"):
+            minimum_order("bessel", "lowpass", 1000, 1, 2000, 60)
+        with self.assertRaises(ValueError):
+            minimum_order("butterworth", "lowpass", 1000, 1, 500, 40)
+        with self.assertRaises(ValueError):
+            minimum_order("butterworth", "highpass", 1000, 40, 500, 1)
+        with self.assertRaises(ValueError):
+            minimum_order("elliptic", "lowpass", 1000, 1, 2000, 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
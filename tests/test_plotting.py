@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+from filters.passives.band_pass import BandPassFilter
+from filters.passives.band_stop import BandStopFilter
+from filters.passives.high_pass import HighPassFilter
+from filters.passives.low_pass import LowPassFilter
+from filters.snk.bessel import lowpass
+from filters.snk.butterworth import Butterworth_HighPass
+from filters.snk.tchebychev import TchebychevFilter
+
+
+class TestHeadlessResponse(unittest.TestCase):
+    def test_passive_responses(self):
+        freq, gain_db, phase = LowPassFilter.bode_response(
+            1000, capacitance=1 / (2 * np.pi * 1000 * 1000)
+        )
+        self.assertEqual(freq.shape, (500,))
+        self.assertEqual(gain_db.shape, freq.shape)
+        self.assertEqual(phase.shape, freq.shape)
+        # -3 dB et -45° à la coupure de 1 kHz
+        _, gain_fc, phase_fc = LowPassFilter.bode_response(
+            1000, capacitance=1 / (2 * np.pi * 1000 * 1000), frequencies=[1000]
+        )
+        self.assertAlmostEqual(gain_fc[0], -3.0103, places=3)
+        self.assertAlmostEqual(phase_fc[0], -45, places=6)
+
+        _, gain_fc, phase_fc = HighPassFilter.bode_response(
+            1000, capacitance=1 / (2 * np.pi * 1000 * 1000), frequencies=[1000]
+        )
+        self.assertAlmostEqual(gain_fc[0], -3.0103, places=3)
+        self.assertAlmostEqual(phase_fc[0], 45, places=6)
+
+        _, gain_f0, _ = BandPassFilter.bode_response(1000, 2, 100, frequencies=[1000])
+        self.assertAlmostEqual(gain_f0[0], 0, places=6)
+
+        values = BandStopFilter.bandstop_rlc(1000, 2, 100)
+        freq, gain_db, _ = BandStopFilter.bode_response(
+            values["R"], values["L"], values["C"]
+        )
+        self.assertEqual(gain_db.shape, freq.shape)
+
+    def test_snk_responses(self):
+        freq, mag, _ = Butterworth_HighPass().response(
+            4, 1000, res_values=[1000, 10000, 1000, 10000]
+        )
+        self.assertEqual(mag.shape, freq.shape)
+        self.assertAlmostEqual(np.interp(3, np.log10(freq), mag), -3.0103, delta=0.05)
+
+        freqs = np.array([10.0, 1000.0])
+        freq, mag, _ = lowpass().response(
+            3, 1000, r_vals=[1000, 0, 1000, 1000], freqs=freqs
+        )
+        np.testing.assert_array_equal(freq, freqs)
+        self.assertAlmostEqual(mag[1], -3.0103, places=3)
+
+        freq, mag, _ = TchebychevFilter().response(
+            3, 1000, c_vals=[10e-9, 10e-9, 4.7e-9], freqs=[1000.0]
+        )
+        self.assertAlmostEqual(mag[0], -1.0, places=6)
+
+
+class TestRenderToFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def assertWritten(self, path, expected):
+        self.assertEqual(path, expected)
+        self.assertGreater(os.path.getsize(path), 0)
+
+    def test_render_without_display(self):
+        self.assertWritten(
+            LowPassFilter.bode_plot(
+                1000, 1000, capacitance=1.59e-7, path=self.path("lp.png")
+            ),
+            self.path("lp.png"),
+        )
+        self.assertWritten(
+            BandPassFilter.bode_plot(1000, 2, 100, path=self.path("bp.svg")),
+            self.path("bp.svg"),
+        )
+        self.assertWritten(
+            Butterworth_HighPass().graphs(
+                2, 1000, res_values=[1000, 5000], path=self.path("bw.png")
+            ),
+            self.path("bw.png"),
+        )
+        self.assertWritten(
+            TchebychevFilter().graphs(
+                4,
+                2500,
+                "highpass",
+                c_vals=[10e-9, 10e-9, 10e-9, 5e-9],
+                path=self.path("tc.png"),
+            ),
+            self.path("tc.png"),
+        )
+        # Aucune figure pyplot n'est créée (ni gardée en mémoire)
+        if "matplotlib.pyplot" in sys.modules:
+            self.assertEqual(sys.modules["matplotlib.pyplot"].get_fignums(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
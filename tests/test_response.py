@@ -0,0 +1,111 @@
+import unittest
+
+import numpy as np
+from scipy.signal import TransferFunction, bode
+
+from filters.response import frequency_response, group_delay
+from filters.snk.bessel import highpass, lowpass
+from filters.snk.butterworth import Butterworth_LowPass
+from filters.snk.sos import sos_to_tf
+from filters.snk.tchebychev import TchebychevFilter
+
+
+class TestFrequencyResponse(unittest.TestCase):
+    def setUp(self):
+        self.freqs = np.logspace(1, 5, 300)
+
+    def test_matches_scipy_bode(self):
+        sos, stages = highpass().components(
+            order=5,
+            cutoff_freq=1000,
+            c_vals=[1e-7, 0, 1e-7, 1e-7, 1e-7, 1e-7],
+            output="sos",
+        )
+        mag, phase = frequency_response(stages, self.freqs)
+        _, mag_ref, phase_ref = bode(
+            TransferFunction(*sos_to_tf(sos)), w=2 * np.pi * self.freqs
+        )
+        np.testing.assert_allclose(mag, mag_ref, atol=1e-6)
+        # Phase égale à un multiple de 360° près
+        np.testing.assert_allclose(
+            np.mod(phase - phase_ref + 180, 360) - 180, 0, atol=1e-6
+        )
+        # Passe-haut d'ordre 5 : +450° en basse fréquence, 0° en haute fréquence
+        self.assertAlmostEqual(phase[0], 450, delta=5)
+        self.assertAlmostEqual(phase[-1], 0, delta=5)
+
+    def test_unwrapped_phase_across_cascade(self):
+        sos = Butterworth_LowPass().sos(8, 1000, res_values=[1000, 5000] * 4)
+        _, phase = frequency_response(sos, self.freqs)
+        # Passe-bas d'ordre 8 : la phase décroît de 0° à -720° sans saut
+        self.assertAlmostEqual(phase[0], 0, delta=5)
+        self.assertAlmostEqual(phase[-1], -720, delta=5)
+        self.assertTrue(np.all(np.diff(phase) <= 1e-9))
+
+    def test_batch_broadcasting(self):
+        cutoffs = np.array([100.0, 1000.0, 10000.0])
+        sos = Butterworth_LowPass().sos_batch(
+            4, cutoffs, res_values=[1000, 5000, 12000, 6000]
+        )
+        mag, phase = frequency_response(sos, self.freqs)
+        self.assertEqual(mag.shape, (3, 300))
+        self.assertEqual(phase.shape, (3, 300))
+
+        # Chaque conception vaut -3 dB à sa propre coupure
+        mag_fc, _ = frequency_response(sos, cutoffs[:, np.newaxis])
+        np.testing.assert_allclose(mag_fc[:, 0], -3.0103, atol=1e-3)
+
+        for i in range(3):
+            mag_i, phase_i = frequency_response(sos[i], self.freqs)
+            np.testing.assert_allclose(mag[i], mag_i)
+            np.testing.assert_allclose(phase[i], phase_i)
+
+    def test_invalid_sections(self):
+        with self.assertRaises(ValueError):
+            frequency_response(np.ones((2, 5)), self.freqs)
+
+
+class TestGroupDelay(unittest.TestCase):
+    def test_bessel_delay_normalization(self):
+        # Normalisation "delay" : retard 1 / omega_c en basse fréquence
+        _, stages = lowpass("delay").components(
+            6, 1000, r_vals=[1000] * 6, output="sos"
+        )
+        delay = group_delay(stages, [0.0, 100.0, 500.0])
+        np.testing.assert_allclose(delay, 1 / (2 * np.pi * 1000), rtol=1e-6)
+
+    def test_matches_phase_derivative(self):
+        freqs = np.logspace(1, 4, 4000)
+        designs = [
+            highpass().components(5, 1000, c_vals=[1e-8] * 6, output="sos")[0],
+            Butterworth_LowPass().sos(4, 1000, res_values=[1000, 10000] * 2),
+            TchebychevFilter().design_filter(
+                5, 1000, "highpass", c_vals=[1e-8] * 5, output="sos"
+            )[0],
+            # Section quelconque (s + 2) / (s^2 + 6000 s + 4e8)
+            np.array([0.0, 1.0, 2.0, 1.0, 6000.0, 4e8]),
+        ]
+        for sos in designs:
+            delay = group_delay(sos, freqs)
+            _, phase = frequency_response(sos, freqs)
+            numeric = -np.gradient(np.radians(phase), 2 * np.pi * freqs)
+            np.testing.assert_allclose(
+                delay[1:-1], numeric[1:-1], atol=1e-3 * np.abs(delay).max()
+            )
+
+    def test_batch_broadcasting(self):
+        cutoffs = np.array([500.0, 1000.0, 2000.0])
+        sos = Butterworth_LowPass().sos_batch(3, cutoffs, res_values=[1000] * 3)
+        freqs = np.logspace(1, 4, 50)
+        delay = group_delay(sos, freqs)
+        self.assertEqual(delay.shape, (3, 50))
+        for i, cutoff in enumerate(cutoffs):
+            single = Butterworth_LowPass().sos(3, cutoff, res_values=[1000] * 3)
+            np.testing.assert_allclose(delay[i], group_delay(single, freqs))
+        # Grille propre à chaque conception : même retard normalisé à la coupure
+        at_cutoff = group_delay(sos, cutoffs[:, np.newaxis])[:, 0]
+        np.testing.assert_allclose(at_cutoff * 2 * np.pi * cutoffs, 2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+
+import numpy as np
+
+from filters.response import magnitude_response
+from filters.sensitivity import component_sensitivities, magnitude_sensitivities
+from filters.snk.bessel import highpass, lowpass
+from filters.snk.butterworth import Butterworth_LowPass
+from filters.snk.sos import section_parameters, stage_section
+from filters.snk.tchebychev import TchebychevFilter
+
+
+def _perturbed(stages, index, name, step):
+    params = [dict(stage["params"]) for stage in stages]
+    params[index][name] *= 1 + step
+    # Le montage de chaque étage (stage["damping"]) est conservé
+    return [{**stage, "params": p} for stage, p in zip(stages, params)]
+
+
+class TestComponentSensitivities(unittest.TestCase):
+    def test_closed_forms(self):
+        (stage,) = lowpass().sallen_key_lowpass(
+            2, 1000, 1000, 1000, None, None, 1.0, 0.577
+        )
+        result = component_sensitivities([stage], "lowpass")
+        np.testing.assert_allclose(result["omega0"], [[-0.5] * 4])
+        # R1 = R2 : Q ne dépend pas des résistances
+        np.testing.assert_allclose(result["q"], [[0, 0, 0.5, -0.5]], atol=1e-15)
+
+        _, params = TchebychevFilter().second_order_filter_direct(
+            "highpass", 2500, 2e-8, 1e-8, 1.0, 0.9
+        )
+        result = component_sensitivities([{"params": params}], "highpass")
+        np.testing.assert_allclose(result["q"], [[-0.5, 0.5, -1 / 6, 1 / 6]])
+
+        # Passe-bas de tchebychev : a1 = R1 (C1 + C2) (montage "sum_c")
+        _, (stage,) = TchebychevFilter().design_filter(
+            2, 2500, "lowpass", c_vals=[2e-8, 1e-8], output="sos"
+        )
+        result = component_sensitivities([stage], "lowpass")
+        np.testing.assert_allclose(result["q"], [[-0.5, 0.5, -1 / 6, 1 / 6]])
+
+    def test_matches_finite_differences(self):
+        step = 1e-6
+        designs = [
+            (
+                "lowpass",
+                lowpass().components(
+                    5, 1000, r_vals=[1000, 0, 4700, 2200, 1000, 3300], output="sos"
+                ),
+            ),
+            (
+                "highpass",
+                highpass().components(
+                    5, 1000, c_vals=[1e-8, 0, 2e-8, 1e-8, 4e-8, 1e-8], output="sos"
+                ),
+            ),
+            # Passe-bas de tchebychev : montage "sum_c"
+            (
+                "lowpass",
+                TchebychevFilter().design_filter(
+                    5,
+                    1000,
+                    "lowpass",
+                    c_vals=[1e-8, 1e-8, 2.2e-9, 1e-8, 1e-9],
+                    output="sos",
+                ),
+            ),
+        ]
+        for filter_type, (_, stages) in designs:
+            result = component_sensitivities(stages, filter_type)
+            sos = np.stack([stage["sos"] for stage in stages])
+            omega0, q = section_parameters(sos)
+            for i, stage in enumerate(stages):
+                names = ["R", None, "C", None] if i == 0 else ["R1", "R2", "C1", "C2"]
+                for j, name in enumerate(names):
+                    if name is None:
+                        self.assertEqual(result["omega0"][i, j], 0)
+                        continue
+                    changed = stage_section(
+                        filter_type, _perturbed(stages, i, name, step)[i]
+                    )
+                    new_omega0, new_q = section_parameters(changed)
+                    self.assertAlmostEqual(
+                        np.log(new_omega0 / omega0[i]) / np.log1p(step),
+                        result["omega0"][i, j],
+                        places=5,
+                    )
+                    if q[i]:
+                        self.assertAlmostEqual(
+                            np.log(new_q / q[i]) / np.log1p(step),
+                            result["q"][i, j],
+                            places=5,
+                        )
+
+    def test_batch(self):
+        cutoffs = np.linspace(500, 5000, 20)
+        stages = Butterworth_LowPass().stages_batch(
+            3, cutoffs, res_values=[1000, 1000, 4700]
+        )
+        result = component_sensitivities(stages, "lowpass")
+        self.assertEqual(result["q"].shape, (20, 2, 4))
+        np.testing.assert_allclose(result["omega0"][:, 0], [[-1, 0, -1, 0]] * 20)
+
+
+class TestMagnitudeSensitivities(unittest.TestCase):
+    def test_matches_finite_differences(self):
+        step = 1e-6
+        freqs = np.array([100.0, 800.0, 1000.0, 3000.0])
+        for filter_type, stages in (
+            (
+                "lowpass",
+                Butterworth_LowPass().stages(
+                    5, 1000, res_values=[1000, 2200, 1000, 2200, 1000]
+                ),
+            ),
+            (
+                "highpass",
+                highpass().components(
+                    4, 1000, c_vals=[1e-8, 2e-8, 1e-8, 1e-8], output="sos"
+                )[1],
+            ),
+            (
+                "lowpass",
+                TchebychevFilter().design_filter(
+                    4, 1000, "lowpass", c_vals=[1e-8, 4.7e-9] * 2, output="sos"
+                )[1],
+            ),
+        ):
+            result = magnitude_sensitivities(stages, filter_type, freqs)
+            nominal = magnitude_response(stages, freqs)
+            for i, stage in enumerate(stages):
+                names = list(stage["params"])
+                columns = [0, 2] if len(names) == 2 else [0, 1, 2, 3]
+                for name, j in zip(names, columns):
+                    changed = _perturbed(stages, i, name, step)
+                    sos = np.stack([stage_section(filter_type, s) for s in changed])
+                    expected = (
+                        (magnitude_response(sos, freqs) - nominal)
+                        * np.log(10)
+                        / 20
+                        / np.log1p(step)
+                    )
+                    np.testing.assert_allclose(
+                        result["magnitude"][i, j], expected, atol=1e-5
+                    )
+            np.testing.assert_allclose(
+                result["total"],
+                np.sqrt((result["magnitude"] ** 2).sum(axis=(0, 1))),
+            )
+
+    def test_batch_shapes(self):
+        cutoffs = np.array([500.0, 1000.0, 2000.0])
+        stages = Butterworth_LowPass().stages_batch(
+            4, cutoffs, res_values=[1000, 1000, 1000, 1000]
+        )
+        result = magnitude_sensitivities(stages, "lowpass", [100.0, 1000.0])
+        self.assertEqual(result["magnitude"].shape, (3, 2, 4, 2))
+        self.assertEqual(result["total"].shape, (3, 2))
+        # Loin sous la coupure, le gain ne dépend presque pas des composants
+        self.assertLess(result["total"][2, 0], result["total"][0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
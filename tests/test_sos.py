@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+from scipy.signal import freqs
+
+from filters.snk.bessel import lowpass
+from filters.snk.sos import (
+    first_order_section,
+    sallen_key_section,
+    section_from_params,
+    section_from_tf,
+    section_parameters,
+    sos_freqresp,
+    sos_to_tf,
+    stage_section,
+)
+from filters.snk.tchebychev import TchebychevFilter
+
+
+class TestSos(unittest.TestCase):
+    def test_first_order_section(self):
+        # Passe-bas : 1 / (1 + sRC), passe-haut : sRC / (1 + sRC)
+        np.testing.assert_allclose(
+            first_order_section("lowpass", 1000, 1e-6), [0, 0, 1, 0, 1e-3, 1]
+        )
+        np.testing.assert_allclose(
+            first_order_section("highpass", 1000, 1e-6), [0, 1e-3, 0, 0, 1e-3, 1]
+        )
+
+    def test_sallen_key_section_broadcast(self):
+        R1 = np.array([1000.0, 2000.0, 3000.0])
+        sections = sallen_key_section("highpass", R1, 5000, 1e-8, 2e-8)
+        self.assertEqual(sections.shape, (3, 6))
+        # a1 = R1 (C1 + C2) pour le passe-haut
+        np.testing.assert_allclose(sections[:, 4], R1 * 3e-8)
+        np.testing.assert_allclose(sections[:, 0], sections[:, 3])
+
+        with self.assertRaises(ValueError):
+            sallen_key_section("bandpass", 1, 1, 1, 1)
+
+    def test_damping(self):
+        # Montage "sum_c" : a1 = R1 (C1 + C2), y compris en passe-bas
+        section = sallen_key_section("lowpass", 1000, 4000, 1e-8, 2e-8, "sum_c")
+        np.testing.assert_allclose(section, [0, 0, 1, 8e-10, 3e-5, 1])
+        with self.assertRaises(ValueError):
+            sallen_key_section("lowpass", 1, 1, 1, 1, damping="sum_l")
+
+    def test_stage_section_keeps_designer_damping(self):
+        # Les étages passe-bas de tchebychev suivent R1 (C1 + C2)
+        for filter_type in ("lowpass", "highpass"):
+            sos, stages = TchebychevFilter().design_filter(
+                4, 1000, filter_type, c_vals=[1e-8, 4.7e-9] * 2, output="sos"
+            )
+            for stage in stages:
+                np.testing.assert_allclose(
+                    stage_section(filter_type, stage), stage["sos"], rtol=1e-12
+                )
+        _, q = section_parameters(sos)
+        np.testing.assert_allclose(q, [0.785, 3.559], atol=1e-3)
+
+    def test_section_parameters(self):
+        sections = np.stack(
+            [
+                section_from_params("lowpass", {"R": 1000, "C": 1e-6}),
+                section_from_params(
+                    "highpass", {"R1": 1000, "R2": 4000, "C1": 1e-8, "C2": 1e-8}
+                ),
+            ]
+        )
+        omega0, q = section_parameters(sections)
+        # omega0 = 1 / sqrt(R1R2C1C2), Q = sqrt(R1R2C1C2) / (R1 (C1 + C2))
+        np.testing.assert_allclose(omega0, [1000, 1 / (2000 * 1e-8)])
+        np.testing.assert_allclose(q, [0, 2000 * 1e-8 / (1000 * 2e-8)])
+
+    def test_section_from_tf(self):
+        np.testing.assert_allclose(
+            section_from_tf([1.0], [2.0, 1.0]), [0, 0, 1, 0, 2, 1]
+        )
+        with self.assertRaises(ValueError):
+            section_from_tf([1.0], [1.0, 1.0, 1.0, 1.0])
+
+    def test_freqresp_matches_expanded_tf(self):
+        sos, _ = TchebychevFilter().design_filter(
+            order=5, cutoff_freq=1000, c_vals=[1e-8] * 5, output="sos"
+        )
+        w = np.logspace(2, 5, 200)
+        num, den = sos_to_tf(sos)
+        _, h_tf = freqs(num, den, worN=w)
+        np.testing.assert_allclose(sos_freqresp(sos, w), h_tf, rtol=1e-9)
+
+    def test_high_order_stability(self):
+        # Ordre 30 : la cascade reste exacte à -3 dB à la coupure
+        sos, _ = lowpass().components(
+            order=30, cutoff_freq=1000, c_vals=[1e-6, 1e-9] * 15, output="sos"
+        )
+        self.assertEqual(sos.shape, (15, 6))
+        h = sos_freqresp(sos, [2 * np.pi * 1000])
+        self.assertAlmostEqual(20 * np.log10(abs(h[0])), -3.0103, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
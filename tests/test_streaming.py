@@ -0,0 +1,212 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+from scipy.signal import bilinear, sosfilt
+
+from filters.response import frequency_response
+from filters.snk.butterworth import Butterworth_LowPass
+from filters.streaming import (
+    StreamingFilter,
+    _inplace_kernel,
+    _kernel_matches,
+    bilinear_sos,
+    filter_file,
+)
+
+
+class TestBilinear(unittest.TestCase):
+    def test_matches_scipy_without_prewarp(self):
+        analog = np.array([[0, 0, 1, 1e-8, 1e-4, 1]])
+        b, a = bilinear([1], [1e-8, 1e-4, 1], fs=48000)
+        digital = bilinear_sos(analog, 48000)
+        np.testing.assert_allclose(digital[0, :3], b)
+        np.testing.assert_allclose(digital[0, 3:], a)
+
+    def test_prewarp_matches_analog_at_cutoff(self):
+        sos = Butterworth_LowPass().sos(5, 5000, res_values=[1000] + [1000, 10000] * 2)
+        filt = StreamingFilter(sos, 5000, 48000)
+        analog_mag, analog_phase = frequency_response(sos, [5000.0])
+        mag, phase = filt.frequency_response([5000.0])
+        self.assertAlmostEqual(mag[0], analog_mag[0], places=9)
+        self.assertAlmostEqual(mag[0], -3.0103, places=3)
+        self.assertAlmostEqual(phase[0] % 360, analog_phase[0] % 360, places=6)
+
+    def test_invalid_prewarp(self):
+        with self.assertRaises(ValueError):
+            bilinear_sos(np.array([0, 0, 1, 0, 1e-3, 1]), 1000, 600)
+
+
+class TestStreamingFilter(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_blocks_match_single_pass(self):
+        filt = StreamingFilter.from_design(
+            "bessel", "highpass", 6, 2000, 44100, c_vals=[1e-8] * 6
+        )
+        signal = self.rng.standard_normal(10000)
+        expected = sosfilt(filt.sos, signal)
+
+        sizes = [1, 7, 500, 0, 1024, 3]
+        cuts = np.cumsum(sizes)
+        blocks = np.split(signal, cuts)
+        output = np.concatenate([filt.process(block) for block in blocks])
+        np.testing.assert_allclose(output, expected, rtol=1e-12, atol=1e-12)
+
+        # Après reset, même sortie que la première fois
+        filt.reset()
+        np.testing.assert_allclose(filt.process(signal), expected, atol=1e-12)
+
+    def test_multichannel(self):
+        filt = StreamingFilter.from_design(
+            "tchebychev",
+            "lowpass",
+            3,
+            1000,
+            16000,
+            c_vals=[10e-9, 10e-9, 4.7e-9],
+            channels=2,
+        )
+        signal = self.rng.standard_normal((4000, 2))
+        output = np.concatenate([filt.process(b) for b in np.split(signal, [1500])])
+        for channel in range(2):
+            np.testing.assert_allclose(
+                output[:, channel], sosfilt(filt.sos, signal[:, channel]), atol=1e-12
+            )
+
+    def test_out_without_allocations(self):
+        filt = StreamingFilter.from_design(
+            "butterworth", "lowpass", 6, 1000, 48000, r_vals=[1000, 10000] * 3
+        )
+        signal = self.rng.standard_normal((3, 4096))
+        expected = sosfilt(filt.sos, signal.ravel()).reshape(3, 4096)
+        out = np.empty(4096)
+        filt.process(signal[0], out=out)
+        np.testing.assert_allclose(out, expected[0], atol=1e-12)
+
+        # Blocs suivants (même taille) : aucune allocation de tableau
+        for block, reference in zip(signal[1:], expected[1:]):
+            tracemalloc.start()
+            try:
+                result = filt.process(block, out=out)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            self.assertIs(result, out)
+            self.assertLess(peak, 4096)
+            np.testing.assert_allclose(out, reference, atol=1e-12)
+        with self.assertRaises(ValueError):
+            filt.process(signal[0], out=np.empty(10))
+
+    def test_fallback_without_inplace_kernel(self):
+        signal = self.rng.standard_normal((3000, 2))
+        filters = []
+        for kernel in (True, False):
+            filt = StreamingFilter.from_design(
+                "bessel", "lowpass", 5, 1000, 16000, r_vals=[1000] * 10, channels=2
+            )
+            self.assertEqual(filt._kernel is not None, _inplace_kernel() is not None)
+            if not kernel:
+                filt._kernel = None
+            output = np.empty_like(signal)
+            for start, stop in ((0, 1000), (1000, 1001), (1001, len(signal))):
+                filt.process(signal[start:stop], out=output[start:stop])
+            filters.append((output, filt._state.copy()))
+        np.testing.assert_allclose(filters[0][0], filters[1][0], atol=1e-12)
+        np.testing.assert_allclose(filters[0][1], filters[1][1], atol=1e-12)
+
+    def test_kernel_check(self):
+        # Un noyau de signature ou de résultat différents est écarté
+        self.assertFalse(_kernel_matches(lambda sos, x: None))
+        self.assertFalse(_kernel_matches(lambda sos, x, zi: None))
+
+        def public(sos, x, zi):
+            x[...], final = sosfilt(sos, x, axis=-1, zi=zi.transpose(1, 0, 2))
+            zi[...] = final.transpose(1, 0, 2)
+
+        self.assertTrue(_kernel_matches(public))
+
+    def test_dc_gain(self):
+        filt = StreamingFilter.from_design(
+            "butterworth", "lowpass", 4, 100, 8000, r_vals=[1000, 10000] * 2
+        )
+        output = filt.process(np.ones(20000, dtype=np.int16))
+        self.assertAlmostEqual(output[-1], 1.0, places=6)
+
+
+class TestFilterFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.sos = Butterworth_LowPass().sos(
+            4, 3000, res_values=[1000, 10000, 1000, 10000]
+        )
+        self.rng = np.random.default_rng(1)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_float32_multichannel_matches_single_pass(self):
+        signal = self.rng.standard_normal((5000, 3)).astype(np.float32)
+        signal.tofile(self.path("in.raw"))
+        report = filter_file(
+            self.sos,
+            3000,
+            48000,
+            self.path("in.raw"),
+            self.path("out.raw"),
+            channels=3,
+            output_dtype="float64",
+            chunk_frames=777,
+        )
+        expected = sosfilt(StreamingFilter(self.sos, 3000, 48000).sos, signal, axis=0)
+        output = np.fromfile(self.path("out.raw"), dtype=np.float64).reshape(-1, 3)
+        np.testing.assert_allclose(output, expected, atol=1e-12)
+        self.assertEqual(report["frames"], 5000)
+        self.assertGreater(report["samples_per_second"], 0)
+
+    def test_int16_rounds_and_saturates(self):
+        signal = np.full(2000, 32767, dtype=np.int16)
+        signal[::2] = -32768
+        signal[:1000] = 32767
+        signal.tofile(self.path("in.raw"))
+        filter_file(
+            self.sos,
+            3000,
+            48000,
+            self.path("in.raw"),
+            self.path("out.raw"),
+            dtype="int16",
+            chunk_frames=256,
+        )
+        expected = sosfilt(StreamingFilter(self.sos, 3000, 48000).sos, signal)
+        expected = np.clip(np.rint(expected), -32768, 32767)
+        output = np.fromfile(self.path("out.raw"), dtype=np.int16)
+        np.testing.assert_array_equal(output, expected)
+        self.assertEqual(output.max(), 32767)
+
+    def test_header_offset_and_invalid_size(self):
+        with open(self.path("in.raw"), "wb") as f:
+            f.write(b"HEAD")
+            np.arange(10, dtype=np.float32).tofile(f)
+        report = filter_file(
+            self.sos, 3000, 48000, self.path("in.raw"), self.path("out.raw"), offset=4
+        )
+        self.assertEqual(report["frames"], 10)
+        with self.assertRaises(ValueError):
+            filter_file(
+                self.sos,
+                3000,
+                48000,
+                self.path("in.raw"),
+                self.path("out.raw"),
+                channels=3,
+                offset=4,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from filters.snk.tchebychev import (
     TchebychevFilter,
 )  # <-- adaptez l'import selon votre structure
@@ -21,7 +22,7 @@ class TestTchebychev(unittest.TestCase):
         capacitors = [10e-9]  # Un seul condensateur pour la cellule d'ordre 1
 
         # 1) Vérification des pôles attendus dans la table interne
-        #    Pour order=1, le code renvoie [(1.9652, 0.0)] dans TCHEBYCHEV_TABLE
+        #    Pour order=1, le code renvoie [(1.9652, 0.0)] (ripple 1 dB)
         poles = self.filter_designer.tchebychev_poles(order)
         expected_poles = [(1.9652, 0.0)]
         self.assertEqual(len(poles), len(expected_poles))
@@ -58,7 +59,7 @@ class TestTchebychev(unittest.TestCase):
         capacitors = [10e-9, 10e-9]
 
         # Vérification des pôles attendus
-        # Dans la table: 2: [(1.0500, 0.9565)]
+        # Pôles analytiques : 2: [(1.0500, 0.9565)]
         poles = self.filter_designer.tchebychev_poles(order)
         expected_poles = [(1.0500, 0.9565)]
         self.assertEqual(len(poles), len(expected_poles))
@@ -79,8 +80,8 @@ class TestTchebychev(unittest.TestCase):
         R2_calc = stage2_params["R2"]
 
         expected_resistances = {
-            "R1": 3169.4,  # Valeurs de référence
-            "R2": 11598.6,
+            "R1": 3169.3,  # Valeurs de référence
+            "R2": 11598.8,
         }
         self.assertAlmostEqual(
             R1_calc,
@@ -102,9 +103,9 @@ class TestTchebychev(unittest.TestCase):
         order = 3
         capacitors = [10e-9, 10e-9, 5e-9]
 
-        # La table mentionne : 3: [(1.4942, 0.0), (0.9971, 2.0177)]
+        # Pôles analytiques (ripple 1 dB) : 3: [(0.4942, 0.0), (0.9971, 2.0177)]
         poles = self.filter_designer.tchebychev_poles(order)
-        expected_poles = [(1.4942, 0.0), (0.9971, 2.0177)]
+        expected_poles = [(0.4942, 0.0), (0.9971, 2.0177)]
         self.assertEqual(len(poles), len(expected_poles))
         for (om, q), (om_exp, q_exp) in zip(poles, expected_poles):
             self.assertAlmostEqual(om, om_exp, places=4)
@@ -127,9 +128,9 @@ class TestTchebychev(unittest.TestCase):
         R4 = stages_lp[1]["params"]["R2"]  # On l'appelle R4
 
         expected_resistances = {
-            "R1": 4260.6,
+            "R1": 12882.6,
             "R3": 2109.6,
-            "R4": 38647.3,
+            "R4": 38647.8,
         }
         self.assertAlmostEqual(
             R1,
@@ -157,7 +158,7 @@ class TestTchebychev(unittest.TestCase):
         order = 4
         capacitors = [10e-9, 10e-9, 10e-9, 5e-9]
 
-        # Dans la table: 4: [(0.5286, 0.7845), (0.9932, 3.5590)]
+        # Pôles analytiques : 4: [(0.5286, 0.7845), (0.9932, 3.5590)]
         # L'utilisateur semble vouloir un *passe-haut* => on utilise filter_type="highpass"
         poles = self.filter_designer.tchebychev_poles(order)
         expected_poles = [(0.5286, 0.7845), (0.9932, 3.5590)]
@@ -181,10 +182,10 @@ class TestTchebychev(unittest.TestCase):
         R4 = stages_hp[1]["params"]["R2"]
 
         expected_resistances = {
-            "R1": 2144.8,
-            "R2": 5280.0,
+            "R1": 2144.6,
+            "R2": 5280.1,
             "R3": 1184.4,
-            "R4": 67509.7,
+            "R4": 67512.5,
         }
         for name, val in zip(["R1", "R2", "R3", "R4"], [R1, R2, R3, R4]):
             self.assertAlmostEqual(
@@ -227,11 +228,11 @@ class TestTchebychev(unittest.TestCase):
         R6 = stages_lp[2]["params"]["R2"]
 
         expected_resistances = {
-            "R1": 21990.3,
+            "R1": 21990.8,
             "R3": 3473.1,
-            "R4": 27182.7,
-            "R5": 768.4,
-            "R6": 106749.2,
+            "R4": 27182.2,
+            "R5": 768.3,
+            "R6": 106745.7,
         }
 
         for name, val in zip(["R1", "R3", "R4", "R5", "R6"], [R1, R3, R4, R5, R6]):
@@ -242,6 +243,56 @@ class TestTchebychev(unittest.TestCase):
                 msg=f"{name} calculé={val} vs attendu={expected_resistances[name]}",
             )
 
+    # ----------------------------------------------------------------
+    # Pôles analytiques pour d'autres ondulations et ordres
+    # ----------------------------------------------------------------
+    def test_tchebychev_poles_ripple(self):
+        # Tableau normalisé pour r = 0.5 dB (docs/table.csv)
+        expected = {
+            1: [(2.8628, 0.0)],
+            4: [(0.5970, 0.7051), (1.0313, 2.9406)],
+            7: [(0.2562, 0.0), (0.5039, 1.0916), (0.8227, 2.5755), (1.0080, 8.8418)],
+        }
+        for order, expected_poles in expected.items():
+            poles = self.filter_designer.tchebychev_poles(order, ripple_db=0.5)
+            self.assertEqual(len(poles), len(expected_poles))
+            for (om, q), (om_exp, q_exp) in zip(poles, expected_poles):
+                self.assertAlmostEqual(om, om_exp, places=3)
+                self.assertAlmostEqual(q, q_exp, places=3)
+
+        # Ordre élevé, servi depuis le cache au second appel
+        poles = self.filter_designer.tchebychev_poles(12, ripple_db=0.1)
+        self.assertEqual(len(poles), 6)
+        self.assertIs(self.filter_designer.tchebychev_poles(12, ripple_db=0.1), poles)
+
+        with self.assertRaises(ValueError):
+            self.filter_designer.tchebychev_poles(0)
+        with self.assertRaises(ValueError):
+            self.filter_designer.tchebychev_poles(3, ripple_db=0)
+
+    def test_tchebychev_design_ripple(self):
+        capacitors = [10e-9, 10e-9]
+        _, stages_1db = self.filter_designer.design_filter(
+            order=2, cutoff_freq=self.f, c_vals=capacitors
+        )
+        _, stages_05db = self.filter_designer.design_filter(
+            order=2, cutoff_freq=self.f, c_vals=capacitors, ripple_db=0.5
+        )
+        # R1 = 1 / [Q * w_LP * (C1 + C2)] avec les pôles du ripple demandé
+        for stages, ripple_db in [(stages_1db, 1.0), (stages_05db, 0.5)]:
+            ((omega0_norm, q0),) = self.filter_designer.tchebychev_poles(
+                2, ripple_db=ripple_db
+            )
+            expected_R1 = 1 / (q0 * 2 * np.pi * self.f * omega0_norm * 20e-9)
+            self.assertAlmostEqual(
+                stages[0]["params"]["R1"], expected_R1, delta=self.tolerance
+            )
+        self.assertNotAlmostEqual(
+            stages_05db[0]["params"]["R1"],
+            stages_1db[0]["params"]["R1"],
+            delta=self.tolerance,
+        )
+
 
 # -------------------------------------------------------------------
 # Lance tous les tests
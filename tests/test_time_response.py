@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+from scipy.signal import TransferFunction, impulse, step
+
+from filters.response import _as_sos
+from filters.snk.butterworth import Butterworth_LowPass
+from filters.snk.design import design_stages
+from filters.snk.sos import sos_to_tf
+from filters.time_response import (
+    impulse_response,
+    partial_fractions,
+    step_metrics,
+    step_response,
+)
+
+
+class TestTimeResponse(unittest.TestCase):
+    cases = (
+        ("bessel", "lowpass", 5, {"r_vals": [1000.0] * 10}),
+        ("tchebychev", "lowpass", 5, {"c_vals": [1e-8] * 5}),
+        ("butterworth", "highpass", 4, {"c_vals": [1e-8] * 4}),
+        ("bessel", "highpass", 3, {"c_vals": [1e-8] * 6}),
+    )
+
+    def test_matches_scipy(self):
+        t = np.linspace(0, 0.01, 1001)
+        for family, filter_type, order, values in self.cases:
+            stages = design_stages(family, filter_type, order, 1000, **values)
+            system = TransferFunction(*sos_to_tf(_as_sos(stages)))
+            np.testing.assert_allclose(
+                step_response(stages, t), step(system, T=t)[1], atol=1e-12
+            )
+            # scipy omet aussi l'impulsion de Dirac du passe-haut
+            expected = impulse(system, T=t)[1]
+            np.testing.assert_allclose(
+                impulse_response(stages, t)[1:],
+                expected[1:],
+                atol=1e-10 * np.abs(expected).max(),
+            )
+
+    def test_partial_fractions(self):
+        stages = design_stages("butterworth", "highpass", 3, 1000, c_vals=[1e-8] * 3)
+        fractions = partial_fractions(stages)
+        self.assertEqual(fractions.poles.shape, (3,))
+        np.testing.assert_allclose(np.abs(fractions.poles), 2 * np.pi * 1000)
+        self.assertAlmostEqual(fractions.direct, 1.0)
+        self.assertEqual(fractions.dc_gain, 0.0)
+        self.assertLess(step_response(stages, [-1e-3])[0], 1e-300)
+
+    def test_step_metrics(self):
+        stages = design_stages("butterworth", "lowpass", 2, 1000, r_vals=[1000.0] * 2)
+        metrics = step_metrics(stages)
+        # Second ordre, Q = 1/sqrt(2) : dépassement exp(-pi) = 4.32 %
+        self.assertAlmostEqual(metrics["overshoot"], np.exp(-np.pi), places=4)
+        wd = 2 * np.pi * 1000 / np.sqrt(2)
+        self.assertAlmostEqual(metrics["peak_time"] * wd / np.pi, 1, places=2)
+        self.assertIsInstance(metrics["rise_time"], float)
+
+        # Réponse dense pour vérifier l'établissement à 2 %
+        t = np.linspace(0, 0.01, 200001)
+        y = step_response(stages, t)
+        last = np.nonzero(np.abs(y - 1) > 0.02)[0][-1]
+        self.assertAlmostEqual(metrics["settling_time"], t[last + 1], delta=5e-6)
+
+        highpass = design_stages("butterworth", "highpass", 2, 1000, c_vals=[1e-8] * 2)
+        self.assertTrue(np.isnan(step_metrics(highpass)["overshoot"]))
+
+        # Grille trop courte : la réponse n'est pas encore établie
+        short = step_metrics(stages, t=np.linspace(0, 1e-4, 101))
+        self.assertTrue(np.isnan(short["settling_time"]))
+        self.assertTrue(np.isnan(short["rise_time"]))
+
+    def test_batch(self):
+        cutoffs = np.array([500.0, 1000.0, 2000.0])
+        sos = Butterworth_LowPass().sos_batch(6, cutoffs, res_values=[1000.0] * 6)
+        fractions = partial_fractions(sos)
+        self.assertEqual(fractions.poles.shape, (3, 6))
+        # Grille propre à chaque conception, proportionnelle à 1 / fc
+        t = np.linspace(0, 5e-3, 300) * (1000 / cutoffs[:, np.newaxis])
+        y = step_response(fractions, t)
+        for i in range(3):
+            np.testing.assert_allclose(y[i], step_response(sos[i], t[i]), atol=1e-12)
+            np.testing.assert_allclose(y[i], y[1], atol=1e-9)
+
+        metrics = step_metrics(fractions)
+        self.assertEqual(metrics["rise_time"].shape, (3,))
+        np.testing.assert_allclose(
+            metrics["rise_time"] * cutoffs, metrics["rise_time"][1] * 1000, rtol=1e-6
+        )
+        np.testing.assert_allclose(metrics["overshoot"], metrics["overshoot"][1])
+
+    def test_repeated_poles(self):
+        stages = design_stages("butterworth", "lowpass", 2, 1000, r_vals=[1000.0] * 2)
+        sos = _as_sos(stages)
+        with self.assertRaisesRegex(ValueError, "simples"):
+            partial_fractions(np.concatenate([sos, sos]))
+
+
+if __name__ == "__main__":
+    unittest.main()
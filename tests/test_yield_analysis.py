@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+
+from filters.montecarlo import monte_carlo
+from filters.response import magnitude_response
+from filters.snk.bessel import lowpass
+from filters.snk.design import design_stages
+from filters.yield_analysis import yield_analysis
+
+DESIGNS = [
+    {
+        "family": "bessel",
+        "filter_type": "lowpass",
+        "order": 4,
+        "cutoff_frequency": 1000,
+        "r_vals": [1000, 1000, 1000, 1000],
+    },
+    {
+        "family": "butterworth",
+        "filter_type": "highpass",
+        "order": 3,
+        "cutoff_frequency": 2000,
+        "c_vals": [1e-7, 1e-8, 1e-8],
+    },
+    {
+        "family": "tchebychev",
+        "filter_type": "highpass",
+        "order": 4,
+        "cutoff_frequency": 2500,
+        "c_vals": [10e-9, 10e-9, 10e-9, 5e-9],
+        "ripple_db": 0.5,
+    },
+    {
+        "family": "tchebychev",
+        "filter_type": "lowpass",
+        "order": 4,
+        "cutoff_frequency": 1000,
+        "c_vals": [10e-9, 4.7e-9, 10e-9, 4.7e-9],
+    },
+]
+
+
+class TestDesignStages(unittest.TestCase):
+    def test_matches_designers(self):
+        r_vals = [1000, 1000, 1000, 1000]
+        _, expected = lowpass().components(4, 1000, list(r_vals), output="sos")
+        stages = design_stages("bessel", "lowpass", 4, 1000, r_vals=r_vals)
+        self.assertEqual(r_vals, [1000, 1000, 1000, 1000])
+        for stage, reference in zip(stages, expected):
+            self.assertEqual(stage["params"], reference["params"])
+
+    def test_invalid_family(self):
+        with self.assertRaises(ValueError):
+            design_stages("elliptic", "lowpass", 2, 1000, r_vals=[1, 1])
+
+
+class TestYieldAnalysis(unittest.TestCase):
+    def run_yield(self, workers):
+        return yield_analysis(
+            DESIGNS, 2500, tolerance=0.02, workers=workers, shard_size=1000, seed=7
+        )
+
+    def test_bit_identical_for_any_worker_count(self):
+        reference = self.run_yield(workers=1)
+        for workers in (2, 3):
+            results = self.run_yield(workers)
+            for result, expected in zip(results, reference):
+                np.testing.assert_array_equal(result["cutoff"], expected["cutoff"])
+                self.assertEqual(result["yield"], expected["yield"])
+                for p, envelope in expected["gain_envelope"].items():
+                    np.testing.assert_array_equal(result["gain_envelope"][p], envelope)
+                self.assertEqual(
+                    result["cutoff_percentiles"], expected["cutoff_percentiles"]
+                )
+
+    def test_single_design_and_statistics(self):
+        result = yield_analysis(DESIGNS[0], 3000, tolerance=0.05, workers=1, seed=1)
+        self.assertEqual(result["cutoff"].shape, (3000,))
+        self.assertGreater(result["yield"], 0.5)
+        self.assertLess(result["yield"], 1.0)
+        # Le rendement croît avec l'écart de coupure accepté
+        loose = yield_analysis(
+            DESIGNS[0], 3000, tolerance=0.05, cutoff_tolerance=0.2, workers=1, seed=1
+        )
+        self.assertEqual(loose["yield"], 1.0)
+        # Statistiques proches d'une analyse monte_carlo non répartie
+        reference = monte_carlo(
+            result["stages"], "lowpass", 1000, 3000, tolerance=0.05, seed=2
+        )
+        self.assertAlmostEqual(
+            result["cutoff_percentiles"][50],
+            reference["cutoff_percentiles"][50],
+            delta=5,
+        )
+
+    def test_invalid_sizes(self):
+        for n_samples, shard_size in ((0, 1000), (-5, 1000), (100, 0)):
+            with self.assertRaises(ValueError):
+                yield_analysis(DESIGNS[0], n_samples, shard_size=shard_size, workers=2)
+
+    def test_tchebychev_lowpass(self):
+        # Passe-bas de tchebychev (montage "sum_c") : sans tolérance, chaque
+        # tirage est la conception elle-même
+        result = yield_analysis(DESIGNS[3], 200, tolerance=0.0, workers=1)
+        self.assertEqual(result["stages"][0]["damping"], "sum_c")
+        np.testing.assert_allclose(result["cutoff"], 1000)
+        self.assertEqual(result["yield"], 1.0)
+        nominal = magnitude_response(design_stages(**DESIGNS[3]), result["freqs"])
+        np.testing.assert_allclose(result["gain_envelope"][50], nominal, atol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()